@@ -2,6 +2,11 @@
     def __init__(self, rule_id: str, message: str):
         super().__init__(f'{rule_id}: {message}')
         self.rule_id = rule_id
+        self.message = message
+
+    def __reduce__(self):
+        # Rebuild from (rule_id, message) so the error survives pickling (process pools)
+        return (type(self), (self.rule_id, self.message))
 
 
 # Phase 1 minimal rule IDs
@@ -11,3 +16,4 @@ RESOLVE_CYCLE = 'RESOLVE_CYCLE'
 RESOLVE_CONFLICT = 'RESOLVE_CONFLICT'
 RESOLVE_PATH_TRAVERSAL = 'RESOLVE_PATH_TRAVERSAL'
 RESOLVE_SOURCE_UNSUPPORTED = 'RESOLVE_SOURCE_UNSUPPORTED'
+RESOLVE_LOCK_INVALID = 'RESOLVE_LOCK_INVALID'
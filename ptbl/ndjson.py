@@ -0,0 +1,208 @@
+"""NDJSON (one JSON object per line) output for resolver and validator results.
+
+Every stream has the same shape:
+  {"type": "header", "format": "<format id>", ...}
+  {"type": "<record type>", "data": {...}}       zero or more
+  {"type": "end", "count": <records written>}
+
+A missing or mismatched end record means the stream was truncated.
+Resolution failures are written as {"type": "error", "rule_id": ..., "message": ...}
+just before the end record; a workspace that fails to load (missing or malformed
+files) gets rule_id LOAD_ERROR.
+
+Readers process one line at a time, so a consumer's memory stays constant no
+matter how large the stream is. Writers are not incremental: a resolve stream's
+items are written only once the whole workspace has been resolved.
+
+  python -m ptbl.ndjson resolve <root> --mode dev > resolved.ndjson
+
+Set PTBL_TRACE=<file> to also write a timing trace of the run (ptbl.workspace.trace).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+import yaml
+
+from ptbl.errors import ResolverError
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import iter_resolve_workspace, resolved_item_to_dict
+from ptbl.workspace.trace import tracing_from_env
+
+RESOLVE_FORMAT = "ptbl-resolve-ndjson/1"
+# rule_id of the error record for a workspace that could not be loaded
+LOAD_ERROR = "LOAD_ERROR"
+VALIDATE_FORMAT = "ptbl-validate-ndjson/1"
+
+# Validation result fields streamed as one record per element; the rest go in the header.
+VALIDATE_STREAMED_FIELDS = {"diagnostics": "diagnostic", "fix_actions": "fix_action"}
+
+
+def dumps_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def write_ndjson(fp: TextIO, records: Iterable[Dict[str, Any]]) -> int:
+    """Write records one line each; returns the number of lines written."""
+    n = 0
+    for record in records:
+        fp.write(dumps_line(record))
+        n += 1
+    return n
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse NDJSON lines (a text file object works), skipping blank lines."""
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"NDJSON line {lineno}: invalid JSON: {e}") from e
+        if not isinstance(record, dict) or not isinstance(record.get("type"), str):
+            raise ValueError(f"NDJSON line {lineno}: expected an object with a string 'type'")
+        yield record
+
+
+def iter_payload(records: Iterable[Dict[str, Any]], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Check header/end framing of a stream and yield the records in between.
+
+    Raises ResolverError for an error record and ValueError for a malformed or
+    truncated stream.
+    """
+    it = iter(records)
+    header = next(it, None)
+    if header is None or header.get("type") != "header" or header.get("format") != fmt:
+        raise ValueError(f"NDJSON stream does not start with a {fmt} header")
+    yield header
+    count = 0
+    for record in it:
+        kind = record["type"]
+        if kind == "end":
+            if record.get("count") != count:
+                raise ValueError(f"NDJSON stream end count {record.get('count')} != {count} records read")
+            if next(it, None) is not None:
+                raise ValueError("NDJSON stream has records after its end record")
+            return
+        if kind == "error":
+            raise ResolverError(str(record.get("rule_id", "")), str(record.get("message", "")))
+        if kind == "header":
+            raise ValueError("NDJSON stream has a second header")
+        count += 1
+        yield record
+    raise ValueError("NDJSON stream is truncated (no end record)")
+
+
+# ---------------------------------------------------------------------------
+# Resolver results
+
+def resolve_records(root: Path, mode: str) -> Iterator[Dict[str, Any]]:
+    """Resolve the workspace at root, then yield the result as NDJSON records."""
+    yield {"type": "header", "format": RESOLVE_FORMAT, "mode": mode}
+    count = 0
+    try:
+        # Loaded after the header, so load failures must end the stream properly too
+        workspace = load_workspace(root)
+        for item in iter_resolve_workspace(workspace, mode):
+            yield {"type": "item", "data": resolved_item_to_dict(item)}
+            count += 1
+    except ResolverError as e:
+        yield {"type": "error", "rule_id": e.rule_id, "message": e.message}
+    except (ValueError, OSError, yaml.YAMLError) as e:
+        yield {"type": "error", "rule_id": LOAD_ERROR, "message": str(e)}
+    yield {"type": "end", "count": count}
+
+
+def iter_resolved_dicts(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Resolved items (resolved_item_to_dict form) from a resolve NDJSON stream."""
+    for record in iter_payload(iter_ndjson(lines), RESOLVE_FORMAT):
+        if record["type"] == "item":
+            yield record["data"]
+
+
+# ---------------------------------------------------------------------------
+# Validator results
+
+def validation_result_records(result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split a validation result: scalar fields in the header, one record per diagnostic/fix action."""
+    header: Dict[str, Any] = {"type": "header", "format": VALIDATE_FORMAT}
+    header["result"] = {k: v for k, v in result.items() if k not in VALIDATE_STREAMED_FIELDS}
+    header["fields"] = list(result)
+    yield header
+    count = 0
+    for field_name, record_type in VALIDATE_STREAMED_FIELDS.items():
+        values = result.get(field_name)
+        if not isinstance(values, list):
+            continue
+        for v in values:
+            yield {"type": record_type, "data": v}
+            count += 1
+    yield {"type": "end", "count": count}
+
+
+def validation_result_from_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reassemble the result written by validation_result_records (original key order)."""
+    it = iter_payload(records, VALIDATE_FORMAT)
+    header = next(it)
+    streamed: Dict[str, List[Any]] = {}
+    field_for = {record_type: name for name, record_type in VALIDATE_STREAMED_FIELDS.items()}
+    for record in it:
+        name = field_for.get(record["type"])
+        if name is None:
+            raise ValueError(f"Unexpected NDJSON record type in validation stream: {record['type']}")
+        streamed.setdefault(name, []).append(record.get("data"))
+
+    scalar = header.get("result") or {}
+    out: Dict[str, Any] = {}
+    for name in header.get("fields") or list(scalar):
+        if name in VALIDATE_STREAMED_FIELDS:
+            out[name] = streamed.pop(name, [])
+        elif name in scalar:
+            out[name] = scalar[name]
+    out.update(streamed)
+    return out
+
+
+def is_validate_ndjson(text: str) -> bool:
+    """
+    True if text starts with a validation NDJSON header line. The line is parsed,
+    so key order and whitespace do not matter; a single-line text (one JSON
+    document) is never a stream, which has at least a header and an end record.
+    """
+    end = text.find("\n")
+    if end < 0 or not text[end + 1:].strip():
+        return False
+    first = text[:end]
+    if not first.lstrip().startswith("{"):
+        return False
+    try:
+        header = json.loads(first)
+    except ValueError:
+        return False
+    return isinstance(header, dict) and header.get("type") == "header" and header.get("format") == VALIDATE_FORMAT
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m ptbl.ndjson", description="Write results as NDJSON")
+    sub = p.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("resolve", help="Resolve a workspace and write one line per resolved item")
+    r.add_argument("root", type=Path)
+    r.add_argument("--mode", choices=["dev", "repro"], default="dev")
+    args = p.parse_args(argv)
+
+    ok = True
+    with tracing_from_env():
+        for record in resolve_records(args.root, args.mode):
+            ok = ok and record["type"] != "error"
+            sys.stdout.write(dumps_line(record))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
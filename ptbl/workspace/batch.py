@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ptbl.workspace.cache import CacheStats
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import ResolvedItem, resolve_workspace
+
+
+class SharedParsePool:
+    """
+    In-memory parse cache keyed by file content (sha256), for many workspaces at once.
+
+    Pass it to load_workspace(cache=...) in place of a ParseCache: a file whose
+    bytes were already parsed for any workspace (a copy, or the target of a
+    symlink) is not parsed again. Parsed documents are shared between the
+    workspaces loaded through one pool, so treat Workspace.app, .lock and
+    .integrations as read-only. Safe to share between threads. Nothing is ever
+    evicted; the documents are freed with the pool.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def lookup(self, path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """(data, content digest); data is None on a miss, digest None if the file cannot be read."""
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None, None  # let the loader raise its usual error
+        with self._lock:
+            data = self._docs.get(digest)
+            if data is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return data, digest
+
+    def store(self, path: Path, digest: Optional[str], data: Dict[str, Any], sha256: str) -> bool:
+        """
+        Keep data under sha256, the digest of the bytes it was parsed from. The
+        lookup digest is not reused: the file may have changed between the two reads.
+        """
+        if digest is None:
+            return False
+        with self._lock:
+            self._docs.setdefault(sha256, data)
+            self.stats.stores += 1
+        return True
+
+
+@dataclass(frozen=True)
+class RootResult:
+    """Outcome for one root: the resolved items, or the error load/resolve raised."""
+
+    root: Path
+    items: Optional[List[ResolvedItem]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> List[ResolvedItem]:
+        """The items, or re-raise the error, as a single resolve_workspace() call would."""
+        if self.error is not None:
+            raise self.error
+        assert self.items is not None
+        return self.items
+
+
+def _resolve_root(root: Path, mode: str, yaml_loader: Optional[str], pool: SharedParsePool) -> RootResult:
+    try:
+        ws = load_workspace(root, yaml_loader=yaml_loader, cache=pool)  # type: ignore[arg-type]
+        return RootResult(root, items=resolve_workspace(ws, mode))
+    except Exception as e:
+        return RootResult(root, error=e)
+
+
+# One pool per worker process; created by the pool initializer
+_process_pool: Optional[SharedParsePool] = None
+
+
+def _init_process_pool() -> None:
+    global _process_pool
+    _process_pool = SharedParsePool()
+
+
+def _resolve_root_in_process(root: Path, mode: str, yaml_loader: Optional[str]) -> RootResult:
+    assert _process_pool is not None
+    return _resolve_root(root, mode, yaml_loader, _process_pool)
+
+
+def resolve_many(
+    roots: Sequence[str | Path],
+    mode: str,
+    *,
+    workers: int = 1,
+    executor: str = "thread",
+    yaml_loader: Optional[str] = None,
+    pool: Optional[SharedParsePool] = None,
+) -> List[RootResult]:
+    """
+    load_workspace() + resolve_workspace() for every root, in input order.
+
+    Module, app, lock and integration files are parsed once per distinct content
+    across all roots (see SharedParsePool), then each root is loaded and resolved
+    as usual, so every result (items or error) is the one the single-root calls
+    give. Errors are captured per root instead of stopping the batch.
+
+    workers > 1 resolves roots concurrently. executor="thread" shares one pool
+    between all roots; executor="process" gives each worker process its own pool
+    and hands it contiguous runs of roots, which tend to share files. `pool`
+    (thread executor only) lets several batches reuse parsed files.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError("executor must be thread or process")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("workers must be a positive integer")
+    if pool is not None and executor == "process":
+        raise ValueError("a shared pool cannot be used with executor=process")
+
+    paths = [Path(r) for r in roots]
+    if executor == "process" and workers > 1 and len(paths) > 1:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_process_pool) as ex:
+            return list(ex.map(partial(_resolve_root_in_process, mode=mode, yaml_loader=yaml_loader), paths,
+                               chunksize=chunksize))
+
+    shared = pool if pool is not None else SharedParsePool()
+    run = partial(_resolve_root, mode=mode, yaml_loader=yaml_loader, pool=shared)
+    if workers <= 1 or len(paths) < 2:
+        return [run(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(run, paths))
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ptbl.workspace.fs import scan_dir_stat
+
+# Bump when the on-disk entry layout changes.
+CACHE_FORMAT_VERSION = 1
+
+CACHE_DIR_ENV = "PTBL_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path("tests") / "_out" / "parse_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# A file modified this close to the moment its entry was written may change again
+# without its mtime moving (coarse filesystem timestamps), so the stat match
+# alone is not trusted and the content hash is checked instead.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def loader_cache_version() -> str:
+    """Cache key version: entry format + the loader source that produced the entries."""
+    from ptbl.workspace import loader
+
+    h = hashlib.sha256(f"format={CACHE_FORMAT_VERSION}\0".encode("utf-8"))
+    h.update(Path(loader.__file__).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _is_json_native(obj: Any) -> bool:
+    """True if obj survives a JSON round trip unchanged (no dates, non-str keys, tuples...)."""
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return True
+    if isinstance(obj, list):
+        return all(_is_json_native(x) for x in obj)
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _is_json_native(v) for k, v in obj.items())
+    return False
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    hash_hits: int = 0  # hits that needed the sha256 fallback (stat changed, content did not)
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hash_hits": self.hash_hits,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+class ParseCache:
+    """
+    Persistent cache of parsed workspace YAML documents.
+
+    One JSON entry per source file, keyed by the file path. An entry is reused when
+    the file's (mtime_ns, size) still match; when only the mtime differs, a sha256
+    of the content decides. Entries live under a directory named after
+    loader_cache_version(), so a loader change never reads stale entries.
+    Total size is bounded; the least recently used entries are evicted by prune().
+    """
+
+    def __init__(self, cache_dir: Optional[str | Path] = None, *, max_bytes: int = DEFAULT_MAX_BYTES):
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.version = loader_cache_version()
+        self.entries_dir = self.cache_dir / f"v{self.version}"
+        self.stats = CacheStats()
+
+    def _entry_path(self, path: Path) -> Path:
+        digest = hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+        return self.entries_dir / f"{digest}.json"
+
+    def lookup(self, path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[os.stat_result]]:
+        """
+        Return (data, stat). data is None on a miss; stat is the pre-parse stat of
+        the file to hand back to store() (None if the file cannot be stat'ed).
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            self.stats.misses += 1
+            return None, None
+
+        entry_path = self._entry_path(path)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return None, st
+
+        if not isinstance(entry, dict) or entry.get("path") != str(path) or entry.get("size") != st.st_size:
+            self.stats.misses += 1
+            return None, st
+
+        stat_match = entry.get("mtime_ns") == st.st_mtime_ns
+        racy = st.st_mtime_ns + _RACY_WINDOW_NS >= int(entry.get("stored_at_ns", 0))
+        if not stat_match or racy:
+            if entry.get("sha256") != _file_sha256(path):
+                self.stats.misses += 1
+                return None, st
+            self.stats.hash_hits += 1
+            # Re-stamp once the content is verified: a new stat, or a racy entry whose
+            # window has passed (as git does for racy index entries). Otherwise every
+            # later lookup would hash the file again.
+            if not stat_match or time.time_ns() > st.st_mtime_ns + _RACY_WINDOW_NS:
+                self._write_entry(path, st, entry["sha256"], entry.get("data"))
+
+        self.stats.hits += 1
+        try:
+            os.utime(entry_path)  # LRU: recency is the entry file's mtime
+        except OSError:
+            pass
+        return entry.get("data"), st
+
+    def store(self, path: Path, st: Optional[os.stat_result], data: Dict[str, Any], sha256: str) -> bool:
+        """
+        Store a parsed document. sha256 is the digest of the exact bytes data was
+        parsed from, so the entry never pairs one version's hash with another's parse;
+        if the file changed since `st`, the stat check fails on the next lookup and
+        the hash then decides. Documents that do not round-trip through JSON are skipped.
+        """
+        if st is None or not _is_json_native(data):
+            return False
+        self._write_entry(path, st, sha256, data)
+        self.stats.stores += 1
+        return True
+
+    def _write_entry(self, path: Path, st: os.stat_result, sha256: str, data: Any) -> None:
+        entry = {
+            "path": str(path),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": sha256,
+            "stored_at_ns": time.time_ns(),
+            "data": data,
+        }
+        entry_path = self._entry_path(path)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, entry_path)
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits in max_bytes. Returns evictions."""
+        if not self.entries_dir.exists():
+            return 0
+        entries = []
+        total = 0
+        for e in scan_dir_stat(self.entries_dir, "*.json"):
+            entries.append((e.mtime_ns, e.path.name, e.path, e.size))
+            total += e.size
+
+        evicted = 0
+        for _mtime, _name, p, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        self.stats.evictions += evicted
+        return evicted
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Pattern
+
+
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    """A scanned file with the stat fields downstream caches key on (stat follows symlinks)."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    ino: int
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str) -> Callable[[str], Optional[re.Match[str]]]:
+    # Same matching as Path.glob for one path component: case-insensitive only where
+    # the OS is (normcase), and '*' also matches a leading dot
+    case_sensitive = os.path.normcase("A") == "A"
+    suffix = pattern[1:]
+    if case_sensitive and pattern.startswith("*") and not any(c in suffix for c in "*?["):
+        return lambda name: name.endswith(suffix)  # type: ignore[return-value]
+    compiled: Pattern[str] = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+    if case_sensitive:
+        return compiled.match
+    return lambda name: compiled.match(os.path.normcase(name))
+
+
+def _entry(e: os.DirEntry, path: Path) -> FileEntry:
+    st = e.stat()
+    return FileEntry(path, st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _sort_key(e: os.DirEntry) -> tuple:
+    # Case-insensitive, then by exact name so names differing only in case still order the same everywhere
+    return (e.name.lower(), e.name)
+
+
+def scan_dir(dir_path: Path, pattern: str = "*") -> List[Path]:
+    """
+    Files directly in dir_path whose name matches pattern, sorted case-insensitively.
+
+    Same result as sorted(p for p in dir_path.glob(pattern) if p.is_file()) by
+    lowercased path, from one os.scandir() pass: the file type comes from the
+    directory entry, so regular files cost no stat (symlinks are followed, as
+    is_file() does). A missing or unreadable directory gives [].
+    """
+    match = _compile(pattern)
+    try:
+        with os.scandir(dir_path) as it:
+            entries = [e for e in it if match(e.name) and e.is_file()]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+    entries.sort(key=_sort_key)
+    return [dir_path / e.name for e in entries]
+
+
+def scan_dir_stat(dir_path: Path, pattern: str = "*") -> List[FileEntry]:
+    """scan_dir() with each file's size, mtime and inode, from the directory entry's cached stat."""
+    match = _compile(pattern)
+    try:
+        with os.scandir(dir_path) as it:
+            entries = [e for e in it if match(e.name) and e.is_file()]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+    entries.sort(key=_sort_key)
+    out: List[FileEntry] = []
+    for e in entries:
+        try:
+            out.append(_entry(e, dir_path / e.name))
+        except FileNotFoundError:
+            continue  # removed since the scan
+    return out
+
+
+def _walk(root: Path, rel: str, out: List[tuple]) -> None:
+    # Like Path.rglob: unreadable directories are skipped, symlinked directories are
+    # not descended into, and files reached through a symlink are listed
+    try:
+        it = os.scandir(root / rel if rel else root)
+    except PermissionError:
+        return
+    with it:
+        for e in it:
+            rel_name = f"{rel}/{e.name}" if rel else e.name
+            if e.is_dir(follow_symlinks=False):
+                _walk(root, rel_name, out)
+            elif e.is_file():
+                out.append((rel_name, e))
+
+
+def scan_tree(root: Path) -> List[Path]:
+    """
+    All files under root, sorted by relative POSIX path (case-sensitive; the order
+    the parity harness hashes trees in). Same files as Path.rglob("*") + is_file().
+    Raises FileNotFoundError when root does not exist.
+    """
+    found: List[tuple] = []
+    _walk(root, "", found)
+    found.sort(key=lambda t: t[0])
+    return [root / rel for rel, _e in found]
+
+
+def scan_tree_stat(root: Path) -> List[FileEntry]:
+    """scan_tree() with each file's size, mtime and inode."""
+    found: List[tuple] = []
+    _walk(root, "", found)
+    found.sort(key=lambda t: t[0])
+    return [_entry(e, root / rel) for rel, e in found]
@@ -0,0 +1,211 @@
+"""Dependency graph of a resolved workspace: queries and JSON / DOT export.
+
+Usage:
+  python -m ptbl.workspace.graph <root> [--mode dev] [--format json|dot]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from array import array
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from ptbl.workspace.resolver import ResolvedItem
+
+GRAPH_FORMAT_VERSION = 1
+
+
+def _csr(n: int, pairs: List[Tuple[int, int]]) -> Tuple[array, array]:
+    """(offsets, targets) for sorted, deduplicated (source, target) pairs."""
+    counts = [0] * (n + 1)
+    for s, _t in pairs:
+        counts[s + 1] += 1
+    return array("I", accumulate(counts)), array("I", [t for _s, t in pairs])
+
+
+class DependencyGraph:
+    """
+    Import graph of one resolution, as integer-indexed arrays.
+
+    Node i is items[i] of the resolve_workspace() result it was built from. Edges
+    go from a module to each module and package (registry / git / url item) it
+    imports. Forward and reverse edges are each stored compressed (CSR): the
+    direct neighbours of node i are targets[offsets[i]:offsets[i + 1]], sorted by
+    node index, so direct queries cost O(answer). Transitive queries walk only the
+    reachable part of the graph and are memoized per node.
+
+    Results are lists of item keys in resolve order. Unknown keys raise KeyError.
+    """
+
+    def __init__(
+        self,
+        items: Sequence["ResolvedItem"],
+        fwd: Tuple[array, array],
+        rev: Tuple[array, array],
+        entries: Sequence[int],
+    ):
+        self.items = tuple(items)
+        self.keys = tuple(item.key for item in self.items)
+        self.index: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.fwd_offsets, self.fwd_targets = fwd
+        self.rev_offsets, self.rev_targets = rev
+        self.entries = tuple(entries)
+        self._reach: Dict[Tuple[bool, int], Tuple[int, ...]] = {}
+
+    @classmethod
+    def build(
+        cls, items: Sequence["ResolvedItem"], edges: Iterable[Tuple[str, str]], entries: Iterable[str] = ()
+    ) -> "DependencyGraph":
+        """Graph over items from (importer key, imported key) pairs; duplicate edges collapse."""
+        index = {item.key: i for i, item in enumerate(items)}
+        pairs = sorted({(index[s], index[t]) for s, t in edges})
+        n = len(index)
+        entry_ids = [index[k] for k in dict.fromkeys(entries) if k in index]
+        return cls(items, _csr(n, pairs), _csr(n, sorted((t, s) for s, t in pairs)), entry_ids)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.fwd_targets)
+
+    def node(self, key: str) -> int:
+        try:
+            return self.index[key]
+        except KeyError:
+            raise KeyError(f"not in dependency graph: {key}") from None
+
+    # ---- queries ----------------------------------------------------------------
+
+    def dependencies(self, key: str, *, transitive: bool = False) -> List[str]:
+        """What key imports: directly, or everything it pulls in when transitive."""
+        return self._query(key, reverse=False, transitive=transitive)
+
+    def dependents(self, key: str, *, transitive: bool = False) -> List[str]:
+        """Which modules import key: directly, or every module that pulls it in when transitive."""
+        return self._query(key, reverse=True, transitive=transitive)
+
+    def paths_between(self, src: str, dst: str, *, limit: Optional[int] = None) -> List[List[str]]:
+        """
+        Every import path from src to dst (keys, both ends included), in node order.
+        The search only enters nodes that reach dst, so each step extends some path
+        in the answer. limit caps the number of paths (diamonds multiply them).
+        """
+        s, t = self.node(src), self.node(dst)
+        if s == t:
+            return [[src]]
+        useful = set(self._reachable(t, reverse=True))
+        if s not in useful:
+            return []
+        useful.add(t)
+        offsets, targets = self.fwd_offsets, self.fwd_targets
+
+        paths: List[List[str]] = []
+        path = [s]
+        stack = [iter(targets[offsets[s]:offsets[s + 1]])]
+        while stack:
+            for nxt in stack[-1]:
+                if nxt not in useful:
+                    continue
+                if nxt == t:
+                    paths.append([self.keys[i] for i in path] + [dst])
+                    if limit is not None and len(paths) >= limit:
+                        return paths
+                    continue
+                path.append(nxt)
+                stack.append(iter(targets[offsets[nxt]:offsets[nxt + 1]]))
+                break
+            else:
+                stack.pop()
+                path.pop()
+        return paths
+
+    def _query(self, key: str, *, reverse: bool, transitive: bool) -> List[str]:
+        i = self.node(key)
+        if transitive:
+            found: Sequence[int] = self._reachable(i, reverse=reverse)
+        elif reverse:
+            found = self.rev_targets[self.rev_offsets[i]:self.rev_offsets[i + 1]]
+        else:
+            found = self.fwd_targets[self.fwd_offsets[i]:self.fwd_offsets[i + 1]]
+        return [self.keys[j] for j in found]
+
+    def _reachable(self, i: int, *, reverse: bool) -> Tuple[int, ...]:
+        """Node indices reachable from i (i itself excluded), sorted; memoized."""
+        memo_key = (reverse, i)
+        hit = self._reach.get(memo_key)
+        if hit is not None:
+            return hit
+        offsets, targets = (self.rev_offsets, self.rev_targets) if reverse else (self.fwd_offsets, self.fwd_targets)
+        seen = {i}
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            for k in targets[offsets[j]:offsets[j + 1]]:
+                if k not in seen:
+                    seen.add(k)
+                    stack.append(k)
+        seen.discard(i)
+        result = self._reach[memo_key] = tuple(sorted(seen))
+        return result
+
+    # ---- export -----------------------------------------------------------------
+
+    def to_json(self) -> Dict[str, Any]:
+        """Nodes in resolve order, entry module node ids, and [importer, imported] id pairs."""
+        offsets, targets = self.fwd_offsets, self.fwd_targets
+        return {
+            "version": GRAPH_FORMAT_VERSION,
+            "nodes": [{"key": item.key, "kind": item.kind, "locked": item.locked} for item in self.items],
+            "entries": list(self.entries),
+            "edges": [[s, t] for s in range(len(self.keys)) for t in targets[offsets[s]:offsets[s + 1]]],
+        }
+
+    def to_dot(self) -> str:
+        """Graphviz DOT: modules as boxes (entry modules doubled), packages as ellipses."""
+        entries = set(self.entries)
+        lines = ["digraph ptbl {", "  rankdir=LR;"]
+        for i, item in enumerate(self.items):
+            label = item.key.replace("\\", "\\\\").replace('"', '\\"')
+            shape = "box" if item.kind == "module" else "ellipse"
+            extra = ", peripheries=2" if i in entries else ""
+            lines.append(f'  n{i} [label="{label}", shape={shape}{extra}];')
+        offsets, targets = self.fwd_offsets, self.fwd_targets
+        for s in range(len(self.keys)):
+            for t in targets[offsets[s]:offsets[s + 1]]:
+                lines.append(f"  n{s} -> n{t};")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Imported here: the resolver imports this module
+    from ptbl.workspace.loader import load_workspace
+    from ptbl.workspace.resolver import resolve_with_graph
+    from ptbl.workspace.trace import tracing_from_env
+
+    p = argparse.ArgumentParser(prog="python -m ptbl.workspace.graph")
+    p.add_argument("root", help="Workspace root")
+    p.add_argument("--mode", choices=["dev", "repro"], default="dev")
+    p.add_argument("--format", choices=["json", "dot"], default="json")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tracing_from_env():
+        _items, graph = resolve_with_graph(load_workspace(args.root), args.mode)
+    if args.format == "dot":
+        sys.stdout.write(graph.to_dot())
+    else:
+        print(json.dumps(graph.to_json(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
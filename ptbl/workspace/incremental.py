@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ptbl.workspace.loader import (
+    ModuleSpec,
+    Workspace,
+    _module_from_data,
+    _read_yaml,
+    _sorted_glob,
+    load_workspace,
+    yaml_loader_class,
+)
+from ptbl.workspace.lock import CompiledLock
+from ptbl.workspace.resolver import (
+    ResolvedItem,
+    _CompiledModule,
+    _compile_module,
+    _entry_modules_from_app,
+    _finalize,
+    _compile_lock,
+    _walk,
+)
+
+
+@dataclass(frozen=True)
+class ResolveDelta:
+    items: Tuple[ResolvedItem, ...]    # full sorted result, same as resolve_workspace()
+    added: Tuple[ResolvedItem, ...]    # in items but not in the previous result
+    removed: Tuple[ResolvedItem, ...]  # in the previous result but not in items
+
+
+def _item_identity(item: ResolvedItem) -> Tuple[str, str, bool, str]:
+    return (item.kind, item.key, item.locked, json.dumps(item.meta, sort_keys=True))
+
+
+def diff_items(
+    old: Sequence[ResolvedItem], new: Sequence[ResolvedItem]
+) -> Tuple[Tuple[ResolvedItem, ...], Tuple[ResolvedItem, ...]]:
+    """(added, removed) between two resolve results, each in its result's order."""
+    old_ids = {_item_identity(i) for i in old}
+    new_ids = {_item_identity(i) for i in new}
+    return (
+        tuple(i for i in new if _item_identity(i) not in old_ids),
+        tuple(i for i in old if _item_identity(i) not in new_ids),
+    )
+
+
+class IncrementalResolver:
+    """
+    Keeps a loaded workspace and its per-module compiled resolution steps between calls.
+
+    update(changed_paths) re-parses only the given files, drops the compiled steps of
+    the affected modules (the changed modules plus every module with a local import
+    pointing at a changed file) and re-walks the graph from the entry modules.
+    The walk replays cached steps, so no YAML parsing or path resolution happens for
+    untouched modules. Results and raised errors match load_workspace() +
+    resolve_workspace() on the same tree.
+    """
+
+    def __init__(self, root: str | Path, mode: str, *, yaml_loader: Optional[str] = None):
+        self.mode = mode
+        self._loader_cls = yaml_loader_class(yaml_loader)
+        self.workspace: Workspace = load_workspace(root, yaml_loader=yaml_loader)
+
+        root_path = self.workspace.root
+        self._app_path = root_path / "app.ptbl"
+        self._lock_path = root_path / "lock.ptbl"
+        self._modules_dir = root_path / "modules"
+        self._integrations_dir = root_path / "integrations"
+
+        # Per-file state: the source of truth the Workspace is rebuilt from
+        self._specs: Dict[Path, ModuleSpec] = {s.file_path: s for s in self.workspace.modules.values()}
+        self._resolved_paths: Dict[Path, Path] = {p: p.resolve() for p in self._specs}
+        self._integrations: Dict[Path, Dict[str, Any]] = {
+            p: self.workspace.integrations[p.stem] for p in self.workspace.integration_paths
+        }
+        self._file_errors: Dict[Path, Exception] = {}
+        self._load_error: Optional[Exception] = None
+
+        self._compiled: Dict[str, _CompiledModule] = {}
+        self._importers: Dict[Path, Set[str]] = {}  # resolved target path -> importing module_ids
+
+        self.items: Tuple[ResolvedItem, ...] = ()
+        self.items = tuple(self.resolve())
+
+    # ---- resolution -------------------------------------------------------
+
+    def _compiled_for(self, module_id: str, lock: CompiledLock) -> Optional[_CompiledModule]:
+        compiled = self._compiled.get(module_id)
+        if compiled is not None:
+            return compiled
+
+        spec = self.workspace.modules.get(module_id)
+        if spec is None:
+            return None
+        compiled = _compile_module(self.workspace, spec, self.mode, lock, self.workspace.module_index)
+        self._compiled[module_id] = compiled
+        for p in compiled.local_paths:
+            self._importers.setdefault(p, set()).add(module_id)
+        return compiled
+
+    def resolve(self) -> List[ResolvedItem]:
+        """Full sorted result, reusing compiled steps of unchanged modules."""
+        if self._load_error is not None:
+            # Kept until the files are fixed and raised on every update: drop the frames
+            # of earlier raises so a long-running watcher does not accumulate them
+            raise self._load_error.with_traceback(None)
+        lock = _compile_lock(self.workspace, self.mode)
+        entry_module_ids = _entry_modules_from_app(self.workspace)
+        resolved_items, registry_requested = _walk(
+            entry_module_ids, lambda mid: self._compiled_for(mid, lock)
+        )
+        return _finalize(resolved_items, registry_requested)
+
+    def update(self, changed_paths: Iterable[str | Path]) -> ResolveDelta:
+        """
+        Apply file changes (edited, created or deleted) and re-resolve.
+        Paths other than app.ptbl, lock.ptbl, modules/*.ptbl and integrations/*.ptbl are ignored.
+        If the tree is broken the error is raised and the previous result is kept;
+        it is raised again on every update until the files are fixed.
+        """
+        affected: Set[Path] = set()
+        invalidate_all = False
+
+        for raw in changed_paths:
+            p = Path(raw)
+            if not p.is_absolute():
+                p = self.workspace.root / p
+            p = Path(p.parent.resolve(), p.name)
+
+            if p == self._app_path:
+                self._reload_single(p, required=True)
+            elif p == self._lock_path:
+                self._reload_single(p, required=False)
+                invalidate_all = True
+            elif p.parent == self._modules_dir and p.suffix == ".ptbl":
+                affected |= self._reload_module(p)
+            elif p.parent == self._integrations_dir and p.suffix == ".ptbl":
+                self._reload_integration(p)
+
+        self._rebuild_workspace()
+
+        if invalidate_all:
+            self._compiled.clear()
+            self._importers.clear()
+        else:
+            # Modules whose local imports point at a changed file must be recompiled:
+            # the file may now hold a different module_id, or appear or disappear.
+            for target in affected:
+                for module_id in self._importers.pop(target, set()):
+                    self._compiled.pop(module_id, None)
+
+        previous = self.items
+        items = tuple(self.resolve())
+        self.items = items
+
+        added, removed = diff_items(previous, items)
+        return ResolveDelta(items=items, added=added, removed=removed)
+
+    # ---- file reloads -----------------------------------------------------
+
+    def _reload_single(self, path: Path, *, required: bool) -> None:
+        self._file_errors.pop(path, None)
+        if not path.exists() and not required:
+            self.workspace = replace(self.workspace, lock=None, lock_path=None)
+            return
+        try:
+            data = _read_yaml(path, self._loader_cls)
+        except Exception as e:
+            self._file_errors[path] = e
+            return
+        if path == self._app_path:
+            self.workspace = replace(self.workspace, app=data)
+        else:
+            self.workspace = replace(self.workspace, lock=data, lock_path=path)
+
+    def _reload_module(self, path: Path) -> Set[Path]:
+        """Re-parse one module file. Returns the resolved paths whose importers are affected."""
+        self._file_errors.pop(path, None)
+        affected: Set[Path] = set()
+
+        old = self._specs.pop(path, None)
+        if old is not None:
+            self._compiled.pop(old.module_id, None)
+        old_resolved = self._resolved_paths.pop(path, None)
+        if old_resolved is not None:
+            affected.add(old_resolved)
+
+        if not path.is_file():
+            affected.add(path.resolve())
+            return affected
+
+        self._resolved_paths[path] = path.resolve()
+        affected.add(self._resolved_paths[path])
+        try:
+            spec = _module_from_data(
+                path, _read_yaml(path, self._loader_cls), self.workspace.root, self.workspace.path_cache
+            )
+        except Exception as e:
+            self._file_errors[path] = e
+            return affected
+
+        self._specs[path] = spec
+        self._compiled.pop(spec.module_id, None)
+        return affected
+
+    def _reload_integration(self, path: Path) -> None:
+        self._file_errors.pop(path, None)
+        self._integrations.pop(path, None)
+        if not path.is_file():
+            return
+        try:
+            self._integrations[path] = _read_yaml(path, self._loader_cls)
+        except Exception as e:
+            self._file_errors[path] = e
+
+    # ---- workspace rebuild ------------------------------------------------
+
+    def _rebuild_workspace(self) -> None:
+        """Rebuild the Workspace from per-file state, in load_workspace() order."""
+        module_paths = tuple(_sorted_glob(self._modules_dir, "*.ptbl"))
+        integration_paths = tuple(_sorted_glob(self._integrations_dir, "*.ptbl"))
+
+        # The first error load_workspace() would raise on this tree, if any
+        load_error: Optional[Exception] = None
+        for p in (self._app_path, self._lock_path):
+            if load_error is None and p in self._file_errors:
+                load_error = self._file_errors[p]
+
+        modules: Dict[str, ModuleSpec] = {}
+        for p in module_paths:
+            if p in self._file_errors:
+                load_error = load_error or self._file_errors[p]
+                continue
+            spec = self._specs.get(p)
+            if spec is None:
+                continue
+            if spec.module_id in modules:
+                load_error = load_error or ValueError(f"Duplicate module_id '{spec.module_id}' in {p}")
+                continue
+            modules[spec.module_id] = spec
+
+        for p in integration_paths:
+            if p in self._file_errors:
+                load_error = load_error or self._file_errors[p]
+
+        module_index: Dict[Path, str] = {}
+        for mid, spec in modules.items():
+            module_index.setdefault(self._resolved_paths[spec.file_path], mid)
+
+        self._load_error = load_error
+        self.workspace = replace(
+            self.workspace,
+            module_paths=module_paths,
+            integration_paths=integration_paths,
+            modules=modules,
+            integrations={p.stem: self._integrations[p] for p in integration_paths if p in self._integrations},
+            module_index=module_index,
+        )
@@ -1,15 +1,26 @@
 ﻿from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 import yaml
 
-from ptbl.errors import ResolverError, RESOLVE_PATH_TRAVERSAL
+from ptbl.workspace import trace
+from ptbl.workspace.cache import ParseCache
+from ptbl.workspace.fs import scan_dir
+from ptbl.workspace.paths import LocalPathCache, validate_local_relpath
+from ptbl.workspace.prescan import scan_document
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ImportSpec:
     source: str  # local | git | registry | url
     path: Optional[str] = None      # for local
@@ -18,17 +29,30 @@ class ImportSpec:
     url: Optional[str] = None       # for git/url
     ref: Optional[str] = None       # for git
     commit: Optional[str] = None    # for git (optional)
-    raw: Optional[Dict[str, Any]] = None
-
-
-@dataclass(frozen=True)
+    # Entries of the parsed mapping not captured exactly by the fields above
+    extra: Optional[Tuple[Tuple[str, Any], ...]] = None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The import mapping as written (rebuilt on access; key order may differ)."""
+        d: Dict[str, Any] = {"source": self.source}
+        for k in ("path", "name", "version", "url", "ref", "commit"):
+            v = getattr(self, k)
+            if v is not None:
+                d[k] = v
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+
+@dataclass(frozen=True, slots=True)
 class ModuleSpec:
     module_id: str
     file_path: Path
     imports: Tuple[ImportSpec, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Workspace:
     root: Path
     app_path: Path
@@ -41,20 +65,76 @@ class Workspace:
     modules: Dict[str, ModuleSpec]
     integrations: Dict[str, Dict[str, Any]]
 
+    # Resolved module file path -> module_id, used by the resolver for local imports
+    module_index: Dict[Path, str] = field(default_factory=dict)
+
+    # Local import path checks, shared by the loader and the resolver (None: unmemoized)
+    path_cache: Optional[LocalPathCache] = field(default=None, compare=False, repr=False)
+
 
-def _read_yaml(path: Path) -> Dict[str, Any]:
+# Environment switch for the YAML backend: auto (default) | c | pure
+YAML_LOADER_ENV = "PTBL_YAML_LOADER"
+
+
+def yaml_loader_class(choice: Optional[str] = None) -> type:
+    """
+    Pick the safe YAML loader class.
+      - auto: libyaml's CSafeLoader when PyYAML was built with it, else SafeLoader
+      - c:    CSafeLoader, error if unavailable
+      - pure: pure-Python SafeLoader
+    None reads PTBL_YAML_LOADER (default: auto).
+    """
+    if choice is None:
+        choice = os.environ.get(YAML_LOADER_ENV, "") or "auto"
+    choice = choice.strip().lower()
+
+    if choice == "pure":
+        return yaml.SafeLoader
+
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if choice == "c":
+        if c_loader is None:
+            raise RuntimeError("yaml_loader=c requested but PyYAML was built without libyaml")
+        return c_loader
+    if choice == "auto":
+        return c_loader if c_loader is not None else yaml.SafeLoader
+
+    raise ValueError(f"yaml loader must be auto, c or pure (got {choice!r})")
+
+
+def _read_yaml_source(path: Path, loader_cls: Optional[type] = None) -> Tuple[Dict[str, Any], bytes]:
+    """The parsed document and the exact bytes it was parsed from (one read)."""
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if loader_cls is None:
+        loader_cls = yaml_loader_class()
+    tracer = trace.active
+    if tracer is None:
+        raw = path.read_bytes()
+        data = yaml.load(raw.decode("utf-8"), Loader=loader_cls) or {}
+    else:
+        with tracer.span("read", "file", path=str(path)):
+            raw = path.read_bytes()
+        with tracer.span("yaml_parse", "file", path=str(path)):
+            data = yaml.load(raw.decode("utf-8"), Loader=loader_cls) or {}
+        tracer.count("files_parsed")
     if not isinstance(data, dict):
         raise ValueError(f"PTBL/YAML must be a mapping at top level: {path}")
-    return data
+    return data, raw
+
+
+def _read_yaml(path: Path, loader_cls: Optional[type] = None) -> Dict[str, Any]:
+    return _read_yaml_source(path, loader_cls)[0]
+
+
+def _read_yaml_hashed(path: Path, loader_cls: Optional[type] = None) -> Tuple[Dict[str, Any], str]:
+    """_read_yaml() plus the sha256 of the bytes that were parsed, for cache.store()."""
+    data, raw = _read_yaml_source(path, loader_cls)
+    return data, hashlib.sha256(raw).hexdigest()
 
 
 def _sorted_glob(dir_path: Path, pattern: str) -> List[Path]:
-    if not dir_path.exists():
-        return []
-    return sorted([p for p in dir_path.glob(pattern) if p.is_file()], key=lambda p: str(p).lower())
+    return scan_dir(dir_path, pattern)
 
 
 def _validate_local_relpath(workspace_root: Path, rel_path: str) -> str:
@@ -63,42 +143,23 @@ def _validate_local_relpath(workspace_root: Path, rel_path: str) -> str:
     Must work on both Windows and Linux runners (CI).
     Returns a normalized path string using forward slashes.
     """
-    import re
-
-    if not isinstance(rel_path, str) or not rel_path.strip():
-        raise ValueError("local import path must be a non-empty string")
-
-    raw = rel_path.strip()
-
-    # Reject Windows drive paths and UNC paths even on Linux CI.
-    # Examples: C:\Windows\..., C:/Windows/..., \\server\share\...
-    if re.match(r"^[A-Za-z]:[\\/]", raw) or raw.startswith("\\\\"):
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute/UNC path not allowed: {rel_path}")
-
-    # Normalize Windows separators so CI (Linux) sees traversal too.
-    norm = raw.replace("\\", "/")
-
-    # Reject absolute posix paths
-    if norm.startswith("/"):
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute path not allowed: {rel_path}")
-
-    # Reject any '..' segment explicitly (works cross-platform)
-    parts = [p for p in norm.split("/") if p not in ("", ".")]
-    if ".." in parts:
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path traversal detected: {rel_path}")
-
-    # Final safety: resolved path must still be within workspace_root
-    abs_path = (workspace_root / norm).resolve()
-    root = workspace_root.resolve()
-    try:
-        abs_path.relative_to(root)
-    except ValueError:
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path escapes workspace root: {rel_path}")
-
-    return norm
+    return validate_local_relpath(workspace_root, rel_path)
+
+
+def _import_spec(obj: Dict[str, Any], **fields: Any) -> ImportSpec:
+    # Identifiers repeat across modules; interning makes equal strings share one object.
+    for k in ("name", "version", "url"):
+        if fields.get(k) is not None:
+            fields[k] = sys.intern(fields[k])
+    # Keep only what `raw` could not rebuild from the typed fields, instead of a copy of obj
+    extra = tuple(
+        (k, v) for k, v in obj.items()
+        if k != "source" and (fields.get(k) is None or fields[k] != v)
+    )
+    return ImportSpec(**fields, extra=extra or None)
 
 
-def _parse_import(obj: Any, workspace_root: Path) -> ImportSpec:
+def _parse_import(obj: Any, workspace_root: Path, paths: Optional[LocalPathCache] = None) -> ImportSpec:
     if not isinstance(obj, dict):
         raise ValueError("import entry must be a mapping")
 
@@ -106,15 +167,20 @@ def _parse_import(obj: Any, workspace_root: Path) -> ImportSpec:
     if source not in ("local", "git", "registry", "url"):
         raise ValueError("import.source must be one of: local, git, registry, url")
 
-    raw = dict(obj)
-
     if source == "local":
         path = obj.get("path")
         if not isinstance(path, str) or not path:
             raise ValueError("local import requires non-empty string 'path'")
 
-        safe_path = _validate_local_relpath(workspace_root, path)
-        return ImportSpec(source=source, path=safe_path, raw=raw)
+        validate = paths.validate if paths is not None else partial(_validate_local_relpath, workspace_root)
+        tracer = trace.active
+        if tracer is None:
+            safe_path = validate(path)
+        else:
+            start = time.perf_counter_ns()
+            safe_path = validate(path)
+            tracer.add_time("validate_local_relpath", time.perf_counter_ns() - start)
+        return _import_spec(obj, source=source, path=safe_path)
 
     if source == "registry":
         name = obj.get("name")
@@ -123,7 +189,7 @@ def _parse_import(obj: Any, workspace_root: Path) -> ImportSpec:
             raise ValueError("registry import requires non-empty string 'name'")
         if not isinstance(version, str) or not version:
             raise ValueError("registry import requires non-empty string 'version'")
-        return ImportSpec(source=source, name=name, version=version, raw=raw)
+        return _import_spec(obj, source=source, name=name, version=version)
 
     if source == "git":
         url = obj.get("url")
@@ -135,20 +201,24 @@ def _parse_import(obj: Any, workspace_root: Path) -> ImportSpec:
             raise ValueError("git import 'ref' must be string if present")
         if commit is not None and not isinstance(commit, str):
             raise ValueError("git import 'commit' must be string if present")
-        return ImportSpec(source=source, url=url, ref=ref, commit=commit, raw=raw)
+        return _import_spec(obj, source=source, url=url, ref=ref, commit=commit)
 
     if source == "url":
         url = obj.get("url")
         if not isinstance(url, str) or not url:
             raise ValueError("url import requires non-empty string 'url'")
-        return ImportSpec(source=source, url=url, raw=raw)
+        return _import_spec(obj, source=source, url=url)
 
     raise ValueError("unreachable")
 
 
 def _parse_module(path: Path, workspace_root: Path) -> ModuleSpec:
-    data = _read_yaml(path)
+    return _module_from_data(path, _read_yaml(path), workspace_root)
+
 
+def _module_from_data(
+    path: Path, data: Dict[str, Any], workspace_root: Path, paths: Optional[LocalPathCache] = None
+) -> ModuleSpec:
     module_id = data.get("module_id")
     if not isinstance(module_id, str) or not module_id:
         raise ValueError(f"{path}: module_id must be a non-empty string")
@@ -161,7 +231,13 @@ def _parse_module(path: Path, workspace_root: Path) -> ModuleSpec:
 
     imports: List[ImportSpec] = []
     for item in imports_raw:
-        imports.append(_parse_import(item, workspace_root))
+        imports.append(_parse_import(item, workspace_root, paths))
+
+    tracer = trace.active
+    if tracer is not None:
+        tracer.count("modules")
+        tracer.count("imports", len(imports))
+        start = time.perf_counter_ns()
 
     # Deterministic order inside module spec
     imports_sorted = sorted(
@@ -176,34 +252,372 @@ def _parse_module(path: Path, workspace_root: Path) -> ModuleSpec:
             i.commit or "",
         ),
     )
+    if tracer is not None:
+        tracer.add_time("import_sort", time.perf_counter_ns() - start)
+
+    return ModuleSpec(module_id=sys.intern(module_id), file_path=path, imports=tuple(imports_sorted))
+
+
+def build_module_index(modules: Dict[str, ModuleSpec]) -> Dict[Path, str]:
+    """
+    Map each module's resolved file path to its module_id.
+    One resolve() per module file; built once per load.
+    """
+    index: Dict[Path, str] = {}
+    for mid, spec in modules.items():
+        index.setdefault(spec.file_path.resolve(), mid)
+    return index
+
+
+class LazyModules(Mapping[str, ModuleSpec]):
+    """
+    module_id -> ModuleSpec for a lazily loaded workspace; each file is parsed on first access.
+
+    Lookups try the file-name convention first (modules/<module_id>.ptbl) and verify
+    the parsed module_id. On a miss or a mismatch, every module file is scanned once
+    to build the full id map, raising the same duplicate error as an eager load.
+    Iterating or taking len() also needs the full map.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        module_paths: Tuple[Path, ...],
+        loader_cls: type,
+        cache: Optional[ParseCache],
+        paths: Optional[LocalPathCache] = None,
+    ):
+        self._root = root
+        self._paths = paths
+        self._module_paths = module_paths
+        self._loader_cls = loader_cls
+        self._cache = cache
+        self._by_stem: Dict[str, Path] = {}
+        for p in module_paths:
+            self._by_stem.setdefault(p.stem, p)
+        self._by_path: Dict[Path, ModuleSpec] = {}
+        self._id_map: Optional[Dict[str, Path]] = None  # module_id -> file, once scanned
+
+    def spec_for_path(self, path: Path) -> ModuleSpec:
+        spec = self._by_path.get(path)
+        if spec is None:
+            data = _read_module_data(path, self._loader_cls, self._cache)
+            spec = self._by_path[path] = _module_from_data(path, data, self._root, self._paths)
+        return spec
+
+    def module_id_for_path(self, path: Path) -> Any:
+        """The file's module_id as written, without validating its imports."""
+        spec = self._by_path.get(path)
+        if spec is not None:
+            return spec.module_id
+        return _read_module_data(path, self._loader_cls, self._cache).get("module_id")
+
+    def id_map(self) -> Dict[str, Path]:
+        """module_id -> file for the whole directory; scans every module file's id once."""
+        if self._id_map is None:
+            self._id_map = _scan_module_ids(self._module_paths, self.module_id_for_path)
+        return self._id_map
+
+    @property
+    def parsed_count(self) -> int:
+        """Number of module files parsed so far."""
+        return len(self._by_path)
+
+    def get(self, module_id: str, default: Any = None) -> Any:  # type: ignore[override]
+        if self._id_map is None:
+            candidate = self._by_stem.get(module_id)
+            if candidate is not None:
+                spec = self.spec_for_path(candidate)
+                if spec.module_id == module_id:
+                    return spec
+        path = self.id_map().get(module_id)
+        return default if path is None else self.spec_for_path(path)
+
+    def __getitem__(self, module_id: str) -> ModuleSpec:
+        spec = self.get(module_id)
+        if spec is None:
+            raise KeyError(module_id)
+        return spec
+
+    def __contains__(self, module_id: object) -> bool:
+        return isinstance(module_id, str) and self.get(module_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.id_map())
+
+    def __len__(self) -> int:
+        return len(self.id_map())
+
+
+class LazyModuleIndex(Mapping[Path, str]):
+    """build_module_index() for LazyModules: resolved path -> module_id, parsing only the target file."""
+
+    def __init__(self, modules: LazyModules, module_paths: Tuple[Path, ...]):
+        self._modules = modules
+        self._module_paths = module_paths
+        self._paths = set(module_paths)
+        self._full: Optional[Dict[Path, Path]] = None  # resolved path -> first module file
+
+    def _file_for(self, resolved: Path) -> Optional[Path]:
+        # Common case: the import target is a module file and not a symlink
+        if resolved in self._paths and resolved.resolve() == resolved:
+            return resolved
+        if self._full is None:
+            full: Dict[Path, Path] = {}
+            for p in self._module_paths:
+                full.setdefault(p.resolve(), p)
+            self._full = full
+        return self._full.get(resolved)
+
+    def get(self, resolved: Path, default: Any = None) -> Any:  # type: ignore[override]
+        path = self._file_for(resolved)
+        return default if path is None else self._modules.module_id_for_path(path)
+
+    def __getitem__(self, resolved: Path) -> str:
+        mid = self.get(resolved)
+        if mid is None:
+            raise KeyError(resolved)
+        return mid
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(build_module_index(self._modules))
+
+    def __len__(self) -> int:
+        return len(build_module_index(self._modules))
+
+
+class LazyDocs(Mapping[str, Dict[str, Any]]):
+    """integrations/<name>.ptbl documents keyed by file stem, each parsed on first access."""
+
+    def __init__(self, paths: Tuple[Path, ...], loader_cls: type, cache: Optional[ParseCache]):
+        self._paths = {p.stem: p for p in paths}
+        self._loader_cls = loader_cls
+        self._cache = cache
+        self._docs: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        doc = self._docs.get(name)
+        if doc is None:
+            doc = self._docs[name] = _read_yaml_cached(self._paths[name], self._loader_cls, self._cache)
+        return doc
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+def _read_yaml_cached(path: Path, loader_cls: type, cache: Optional[ParseCache]) -> Dict[str, Any]:
+    if cache is None:
+        return _read_yaml(path, loader_cls)
+    data, st = cache.lookup(path)
+    tracer = trace.active
+    if tracer is not None:
+        tracer.count("cache_hits" if data is not None else "cache_misses")
+    if data is None:
+        data, sha256 = _read_yaml_hashed(path, loader_cls)
+        cache.store(path, st, data, sha256)
+    return data
+
+
+def _read_module_data(path: Path, loader_cls: type, cache: Optional[ParseCache]) -> Dict[str, Any]:
+    """A module file via the restricted prescan (ptbl.workspace.prescan); full YAML parse when it bails."""
+    tracer = trace.active
+    if tracer is None:
+        data = scan_document(path.read_text(encoding="utf-8"))
+    else:
+        with tracer.span("prescan", "file", path=str(path)):
+            data = scan_document(path.read_text(encoding="utf-8"))
+        tracer.count("prescan_fallbacks" if data is None else "prescan_hits")
+    if data is None:
+        data = _read_yaml_cached(path, loader_cls, cache)
+    return data
+
 
-    return ModuleSpec(module_id=module_id, file_path=path, imports=tuple(imports_sorted))
+def _iter_yaml_docs(
+    paths: Sequence[Path],
+    workers: int,
+    executor: str,
+    loader_cls: type,
+    cache: Optional[ParseCache] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield _read_yaml(p) for each path, in input order.
+    Cache hits skip parsing; only misses are parsed (and then stored).
+    With workers > 1 files are parsed concurrently, but results (and the first
+    exception) still surface in input order, exactly as the sequential loop would.
+    """
+    if cache is None:
+        yield from _parse_yaml_files(paths, workers, executor, loader_cls)
+        return
+
+    looked_up = [cache.lookup(p) for p in paths]
+    misses = [p for p, (data, _st) in zip(paths, looked_up) if data is None]
+    tracer = trace.active
+    if tracer is not None:
+        tracer.count("cache_hits", len(paths) - len(misses))
+        tracer.count("cache_misses", len(misses))
+    with closing(_parse_yaml_files(misses, workers, executor, loader_cls, read=_read_yaml_hashed)) as parsed:
+        for p, (data, st) in zip(paths, looked_up):
+            if data is None:
+                data, sha256 = next(parsed)
+                cache.store(p, st, data, sha256)
+            yield data
+
+
+def _parse_yaml_files(
+    paths: Sequence[Path], workers: int, executor: str, loader_cls: type, read: Callable[..., Any] = _read_yaml
+) -> Iterator[Any]:
+    if workers <= 1 or len(paths) < 2:
+        for p in paths:
+            yield read(p, loader_cls)
+        return
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    # Process pools pay per-task IPC, so hand out files in batches
+    chunksize = max(1, len(paths) // (workers * 8)) if executor == "process" else 1
+    try:
+        yield from pool.map(partial(read, loader_cls=loader_cls), paths, chunksize=chunksize)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
-def load_workspace(root: str | Path) -> Workspace:
+def _scan_module_ids(module_paths: Sequence[Path], module_id_of: Callable[[Path], Any]) -> Dict[str, Path]:
+    """module_id -> file for every module file, with the eager loader's id checks and errors."""
+    id_map: Dict[str, Path] = {}
+    for p in module_paths:
+        module_id = module_id_of(p)
+        if not isinstance(module_id, str) or not module_id:
+            raise ValueError(f"{p}: module_id must be a non-empty string")
+        if module_id in id_map:
+            raise ValueError(f"Duplicate module_id '{module_id}' in {p}")
+        id_map[module_id] = p
+    return id_map
+
+
+def load_workspace(
+    root: str | Path,
+    *,
+    workers: int = 1,
+    executor: str = "thread",
+    yaml_loader: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    lazy: bool = False,
+    strict: bool = False,
+) -> Workspace:
+    """
+    Load a workspace from disk.
+
+    lazy=True parses only app.ptbl and lock.ptbl up front. modules, integrations
+    and module_index become LazyModules / LazyDocs / LazyModuleIndex mappings that
+    parse files on first access, so resolve_workspace() reads only the modules
+    reachable from entry_modules. Errors in files that are never reached are not
+    reported. Lazy module files are read with the restricted prescan and only
+    fully YAML-parsed when it bails. strict=True (lazy only) additionally scans
+    every module file's module_id at load, so duplicate or invalid ids fail as
+    they do in an eager load.
+    workers is ignored when lazy.
+
+    workers > 1 parses modules/ and integrations/ files concurrently using a
+    thread or process pool (executor="thread" | "process"). The resulting
+    Workspace and any raised error are identical to the sequential load.
+
+    yaml_loader selects the YAML backend (auto | c | pure); see yaml_loader_class().
+
+    cache, if given, is a persistent ParseCache: unchanged files are not re-parsed.
+    Anything with the same lookup/store methods works too, e.g.
+    ptbl.workspace.batch.SharedParsePool (shared across workspaces, keyed by content);
+    only a ParseCache is pruned after the load.
+
+    Runs under an active ptbl.workspace.trace tracer are recorded (phases, per-file
+    read/parse times, counters).
+    """
+    with trace.span("load_workspace", root=str(root)):
+        return _load_workspace(
+            root, workers=workers, executor=executor, yaml_loader=yaml_loader, cache=cache, lazy=lazy, strict=strict
+        )
+
+
+def _load_workspace(
+    root: str | Path,
+    *,
+    workers: int,
+    executor: str,
+    yaml_loader: Optional[str],
+    cache: Optional[ParseCache],
+    lazy: bool,
+    strict: bool,
+) -> Workspace:
+    if executor not in ("thread", "process"):
+        raise ValueError("executor must be thread or process")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("workers must be a positive integer")
+    loader_cls = yaml_loader_class(yaml_loader)
+
     root_path = Path(root).resolve()
+    paths = LocalPathCache(root_path)
 
     app_path = root_path / "app.ptbl"
     lock_path = root_path / "lock.ptbl"
     modules_dir = root_path / "modules"
     integrations_dir = root_path / "integrations"
 
-    module_paths = tuple(_sorted_glob(modules_dir, "*.ptbl"))
-    integration_paths = tuple(_sorted_glob(integrations_dir, "*.ptbl"))
-
-    app = _read_yaml(app_path)
-    lock = _read_yaml(lock_path) if lock_path.exists() else None
+    with trace.span("discover"):
+        module_paths = tuple(_sorted_glob(modules_dir, "*.ptbl"))
+        integration_paths = tuple(_sorted_glob(integrations_dir, "*.ptbl"))
+
+    with trace.span("read_app_lock"):
+        app = _read_yaml_cached(app_path, loader_cls, cache)
+        lock = _read_yaml_cached(lock_path, loader_cls, cache) if lock_path.exists() else None
+
+    if lazy:
+        lazy_modules = LazyModules(root_path, module_paths, loader_cls, cache, paths)
+        if strict:
+            with trace.span("scan_module_ids"):
+                lazy_modules.id_map()
+        return Workspace(
+            root=root_path,
+            app_path=app_path,
+            lock_path=lock_path if lock_path.exists() else None,
+            module_paths=module_paths,
+            integration_paths=integration_paths,
+            app=app,
+            lock=lock,
+            modules=lazy_modules,  # type: ignore[arg-type]
+            integrations=LazyDocs(integration_paths, loader_cls, cache),  # type: ignore[arg-type]
+            module_index=LazyModuleIndex(lazy_modules, module_paths),  # type: ignore[arg-type]
+            path_cache=paths,
+        )
 
     modules: Dict[str, ModuleSpec] = {}
-    for p in module_paths:
-        spec = _parse_module(p, root_path)
-        if spec.module_id in modules:
-            raise ValueError(f"Duplicate module_id '{spec.module_id}' in {p}")
-        modules[spec.module_id] = spec
-
     integrations: Dict[str, Dict[str, Any]] = {}
-    for p in integration_paths:
-        integrations[p.stem] = _read_yaml(p)
+    with (
+        trace.span("parse_files", files=len(module_paths) + len(integration_paths)),
+        closing(_iter_yaml_docs(module_paths + integration_paths, workers, executor, loader_cls, cache)) as docs,
+    ):
+        for p in module_paths:
+            spec = _module_from_data(p, next(docs), root_path, paths)
+            if spec.module_id in modules:
+                raise ValueError(f"Duplicate module_id '{spec.module_id}' in {p}")
+            modules[spec.module_id] = spec
+
+        for p in integration_paths:
+            integrations[p.stem] = next(docs)
+
+    if isinstance(cache, ParseCache):
+        cache.prune()
+
+    with trace.span("module_index"):
+        module_index = build_module_index(modules)
 
     return Workspace(
         root=root_path,
@@ -215,4 +629,6 @@ def load_workspace(root: str | Path) -> Workspace:
         lock=lock,
         modules=modules,
         integrations=integrations,
+        module_index=module_index,
+        path_cache=paths,
     )
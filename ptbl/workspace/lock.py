@@ -0,0 +1,168 @@
+"""Compiled lock.ptbl: per-import checks for the resolver, and a lock report.
+
+Usage:
+  python -m ptbl.workspace.lock <root> [--mode dev|repro]
+
+Prints one JSON object: every malformed entry, and the entries no item resolved
+in --mode refers to. Exits 1 when there are malformed entries or resolution fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ptbl.errors import (
+    ResolverError,
+    RESOLVE_CONFLICT,
+    RESOLVE_LOCK_INVALID,
+    RESOLVE_UNRESOLVED_IMPORT,
+)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class LockIssue:
+    lock_key: str
+    message: str
+
+
+class CompiledLock:
+    """
+    lock.ptbl `resolved`, validated once and indexed by kind.
+
+    Construction walks every entry and records malformed ones in `issues`
+    without raising. The check_* lookups are O(1) and raise the same
+    ResolverErrors, in the same per-import order, as reading the raw mapping.
+    A malformed entry therefore fails resolution only when something imports it.
+    """
+
+    __slots__ = ("keys", "issues", "_registry", "_git", "_url")
+
+    def __init__(self, resolved: Optional[Dict[str, Any]] = None):
+        self.keys: List[str] = []
+        self.issues: List[LockIssue] = []
+        self._registry: Dict[str, Any] = {}          # name -> pinned_version as written
+        self._git: Dict[str, Optional[str]] = {}     # url -> commit (None: entry without a usable commit)
+        self._url: Dict[str, Optional[str]] = {}     # url -> sha256 (None: entry without a usable sha256)
+
+        for key, entry in (resolved or {}).items():
+            if not isinstance(key, str):
+                self.issues.append(LockIssue(str(key), "lock key must be a string"))
+                continue
+            self.keys.append(key)
+            kind, sep, ident = key.partition(":")
+            if not sep or kind not in ("registry", "git", "url"):
+                self.issues.append(LockIssue(key, "lock key must start with registry:, git: or url:"))
+                continue
+            if not isinstance(entry, dict):
+                self.issues.append(LockIssue(key, "lock entry must be a mapping"))
+                continue
+
+            field = {"registry": "pinned_version", "git": "commit", "url": "sha256"}[kind]
+            value = entry.get(field)
+            valid = isinstance(value, str) and bool(value)
+            if not valid:
+                self.issues.append(LockIssue(key, f"lock entry requires non-empty string '{field}'"))
+
+            if kind == "registry":
+                self._registry[ident] = value
+            elif kind == "git":
+                self._git[ident] = value if valid else None
+            else:
+                self._url[ident] = value if valid else None
+
+    @classmethod
+    def from_lock(cls, lock: Optional[Dict[str, Any]]) -> "CompiledLock":
+        """Compile a parsed lock.ptbl document (None: no lock file)."""
+        resolved: Any = {}
+        if lock is not None:
+            resolved = lock.get("resolved", {}) or {}
+            if not isinstance(resolved, dict):
+                raise ValueError("lock.ptbl: resolved must be a mapping")
+        return cls(resolved)
+
+    # ---- per-import lookups (repro mode) ------------------------------------
+
+    def check_registry(self, name: str, version: str) -> None:
+        pinned = self._registry.get(name, _MISSING)
+        if pinned is _MISSING:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for registry:{name}")
+        if pinned != version:
+            raise ResolverError(
+                RESOLVE_CONFLICT,
+                f"Registry version mismatch for {name}: requested {version} but lock has {pinned}",
+            )
+
+    def check_git(self, url: str) -> None:
+        commit = self._git.get(url, _MISSING)
+        if commit is _MISSING:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for git:{url}")
+        if commit is None:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Lock entry missing commit for git:{url}")
+
+    def check_url(self, url: str) -> None:
+        sha256 = self._url.get(url, _MISSING)
+        if sha256 is _MISSING:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for url:{url}")
+        if sha256 is None:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Lock entry missing sha256 for url:{url}")
+
+    # ---- reports --------------------------------------------------------------
+
+    def validate(self) -> None:
+        """Raise one ResolverError listing every malformed entry (strict CI check)."""
+        if self.issues:
+            details = "; ".join(f"{i.lock_key}: {i.message}" for i in self.issues)
+            raise ResolverError(RESOLVE_LOCK_INVALID, f"{len(self.issues)} malformed lock entries: {details}")
+
+    def unused_keys(self, items: Iterable[Any]) -> List[str]:
+        """Lock keys that no resolved registry/git/url item refers to, sorted."""
+        used = set()
+        for item in items:
+            meta = item.meta
+            if item.kind == "registry":
+                used.add(f"registry:{meta['name']}")
+            elif item.kind in ("git", "url"):
+                used.add(f"{item.kind}:{meta['url']}")
+        return sorted((k for k in self.keys if k not in used), key=str.lower)
+
+    def report(self, items: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
+        """JSON-ready summary: malformed entries, plus unused keys when items are given."""
+        out: Dict[str, Any] = {
+            "entries": len(self.keys),
+            "issues": [{"lock_key": i.lock_key, "message": i.message} for i in self.issues],
+        }
+        if items is not None:
+            out["unused"] = self.unused_keys(items)
+        return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Imported here: the resolver imports this module
+    from ptbl.workspace.loader import load_workspace
+    from ptbl.workspace.resolver import resolve_workspace
+    from ptbl.workspace.trace import tracing_from_env
+
+    p = argparse.ArgumentParser(prog="python -m ptbl.workspace.lock")
+    p.add_argument("root", help="Workspace root")
+    p.add_argument("--mode", choices=["dev", "repro"], default="dev", help="Mode resolved for the unused-entry report")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tracing_from_env():
+        ws = load_workspace(args.root)
+        lock = CompiledLock.from_lock(ws.lock)
+        try:
+            report = lock.report(resolve_workspace(ws, args.mode))
+        except ResolverError as e:
+            report = lock.report()
+            report["error"] = {"rule_id": e.rule_id, "message": e.message}
+    print(json.dumps(report, ensure_ascii=False))
+    return 1 if report["issues"] or "error" in report else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
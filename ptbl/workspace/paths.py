@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import os
+import re
+import stat
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from ptbl.errors import ResolverError, RESOLVE_PATH_TRAVERSAL, RESOLVE_UNRESOLVED_IMPORT
+
+# Windows drive paths and UNC paths, rejected even on Linux CI.
+# Examples: C:\Windows\..., C:/Windows/..., \\server\share\...
+_DRIVE_RE = re.compile(r"^[A-Za-z]:[\\/]")
+
+
+def _check_relpath(workspace_root: Path, resolved_root: Path, rel_path: str) -> Tuple[str, Path]:
+    """Loader rules for a local import path: (normalized path, resolved absolute path)."""
+    if not isinstance(rel_path, str) or not rel_path.strip():
+        raise ValueError("local import path must be a non-empty string")
+
+    raw = rel_path.strip()
+
+    if _DRIVE_RE.match(raw) or raw.startswith("\\\\"):
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute/UNC path not allowed: {rel_path}")
+
+    # Normalize Windows separators so CI (Linux) sees traversal too.
+    norm = raw.replace("\\", "/")
+
+    # Reject absolute posix paths
+    if norm.startswith("/"):
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute path not allowed: {rel_path}")
+
+    # Reject any '..' segment explicitly (works cross-platform)
+    parts = [p for p in norm.split("/") if p not in ("", ".")]
+    if ".." in parts:
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path traversal detected: {rel_path}")
+
+    # Final safety: resolved path must still be within workspace_root
+    abs_path = (workspace_root / norm).resolve()
+    try:
+        abs_path.relative_to(resolved_root)
+    except ValueError:
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path escapes workspace root: {rel_path}")
+
+    return norm, abs_path
+
+
+def _resolve_relpath(workspace_root: Path, resolved_root: Path, rel_path: str) -> Path:
+    """Resolver rules for a local import path: the resolved file path, contained in the root."""
+    if not isinstance(rel_path, str) or not rel_path.strip():
+        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, "Local import path must be a non-empty string")
+
+    raw = rel_path.strip()
+
+    # Normalize to a Path without touching filesystem
+    p = Path(raw)
+
+    # Reject absolute paths immediately (C:\..., \\server\share\..., /etc/...)
+    if p.is_absolute():
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute path not allowed: {raw}")
+
+    # Allow omitting .ptbl extension
+    if p.suffix == "":
+        p = p.with_suffix(".ptbl")
+
+    abs_path = (workspace_root / p).resolve()
+    try:
+        abs_path.relative_to(resolved_root)
+    except ValueError:
+        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path traversal detected: {raw}")
+
+    return abs_path
+
+
+def validate_local_relpath(workspace_root: Path, rel_path: str) -> str:
+    """
+    Phase 1 security: reject any path that can escape the workspace root.
+    Must work on both Windows and Linux runners (CI).
+    Returns a normalized path string using forward slashes.
+    """
+    return _check_relpath(workspace_root, workspace_root.resolve(), rel_path)[0]
+
+
+def resolve_local_path(workspace_root: Path, rel_path: str) -> Path:
+    """
+    Full containment check: join to workspace_root, resolve, ensure it stays under root.
+    Also rejects absolute paths.
+    Accepts either:
+      - modules/auth.ptbl
+      - modules/auth   (auto adds .ptbl)
+    """
+    return _resolve_relpath(workspace_root, workspace_root.resolve(), rel_path)
+
+
+class LocalPathCache:
+    """
+    Memoized local import path checks for one workspace root, shared by the loader
+    (validate) and the resolver (resolve). Results and errors are exactly those of
+    validate_local_relpath() / resolve_local_path().
+
+    The root is resolved once. Rejections decided from the string alone (drive, UNC,
+    absolute, '..') are cached as they are. An accepted path is cached only when it
+    resolved to itself under the root, i.e. no component below the root was a
+    symlink; a hit then lstat()s those components and redoes the full check if any
+    of them has become a symlink since, so a link created after the check can never
+    be answered from the cache. "Escapes workspace root" results depend on the
+    filesystem and are never cached. Swapping the root directory itself is not
+    detected; build a new cache (load the workspace again) for that.
+    """
+
+    def __init__(self, workspace_root: Path):
+        self.root = workspace_root
+        self.resolved_root = workspace_root.resolve()
+        # Plain dict stores only, so threads may share a cache (the loader's thread pool)
+        # raw path -> (result, components to re-check on a hit)
+        self._validated: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._resolved: Dict[str, Tuple[Path, Tuple[str, ...]]] = {}
+        self._rejected: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (kind, raw) -> (rule_id, message)
+        self.hits = 0
+        self.misses = 0
+        self.rechecks = 0  # hits dropped because a component became a symlink
+
+    def __reduce__(self):
+        # A pickled Workspace starts with an empty memo on the other side
+        return (LocalPathCache, (self.root,))
+
+    def __len__(self) -> int:
+        return len(self._validated) + len(self._resolved) + len(self._rejected)
+
+    def validate(self, rel_path: str) -> str:
+        """Same as validate_local_relpath(self.root, rel_path)."""
+        if not isinstance(rel_path, str):
+            return _check_relpath(self.root, self.resolved_root, rel_path)[0]
+        hit = self._validated.get(rel_path)
+        if hit is not None:
+            if self._still_plain(hit[1]):
+                self.hits += 1
+                return hit[0]
+            self._validated.pop(rel_path, None)
+        self._raise_rejected("validate", rel_path)
+        self.misses += 1
+        try:
+            norm, abs_path = _check_relpath(self.root, self.resolved_root, rel_path)
+        except ResolverError as e:
+            if not e.message.startswith("Path escapes workspace root"):
+                self._reject("validate", rel_path, e)
+            raise
+        components = self._plain_components(norm.split("/"), abs_path)
+        if components is not None:
+            # norm validates to itself; the resolver looks imports up by it
+            self._validated[rel_path] = self._validated[norm] = (norm, components)
+        return norm
+
+    def resolve(self, rel_path: str) -> Path:
+        """Same as resolve_local_path(self.root, rel_path)."""
+        if not isinstance(rel_path, str):
+            return _resolve_relpath(self.root, self.resolved_root, rel_path)
+        hit = self._resolved.get(rel_path)
+        if hit is not None:
+            if self._still_plain(hit[1]):
+                self.hits += 1
+                return hit[0]
+            self._resolved.pop(rel_path, None)
+        self._raise_rejected("resolve", rel_path)
+        validated = self._validated.get(rel_path)
+        if (
+            validated is not None
+            and "\\" not in rel_path
+            and Path(validated[0]).suffix
+            and self._still_plain(validated[1])
+        ):
+            # Checked by the loader already: same plain path, resolves to itself
+            self.hits += 1
+            abs_path = Path(validated[1][-1])
+            self._resolved[rel_path] = (abs_path, validated[1])
+            return abs_path
+        self.misses += 1
+        try:
+            abs_path = _resolve_relpath(self.root, self.resolved_root, rel_path)
+        except ResolverError as e:
+            if e.message.startswith("Absolute path not allowed") or not rel_path.strip():
+                self._reject("resolve", rel_path, e)
+            raise
+        p = Path(rel_path.strip())
+        if p.suffix == "":
+            p = p.with_suffix(".ptbl")
+        components = self._plain_components(p.parts, abs_path)
+        if components is not None:
+            self._resolved[rel_path] = (abs_path, components)
+        return abs_path
+
+    # ---- internals ------------------------------------------------------------
+
+    def _reject(self, kind: str, rel_path: str, e: ResolverError) -> None:
+        self._rejected[(kind, rel_path)] = (e.rule_id, e.message)
+
+    def _raise_rejected(self, kind: str, rel_path: str) -> None:
+        rejected = self._rejected.get((kind, rel_path))
+        if rejected is not None:
+            self.hits += 1
+            raise ResolverError(*rejected)
+
+    def _plain_components(self, parts: Sequence[str], abs_path: Path) -> Optional[Tuple[str, ...]]:
+        """
+        The absolute paths of each component below the root when the lexical path
+        under the resolved root equals abs_path (nothing below the root was a
+        symlink or '..'); None when the result must not be cached.
+        """
+        names = [p for p in parts if p not in ("", ".")]
+        if not names or ".." in names:
+            return None
+        components = []
+        current = str(self.resolved_root)
+        for name in names:
+            current = os.path.join(current, name)
+            components.append(current)
+        if components[-1] != str(abs_path):
+            return None
+        return tuple(components)
+
+    def _still_plain(self, components: Tuple[str, ...]) -> bool:
+        for c in components:
+            try:
+                mode = os.lstat(c).st_mode
+            except FileNotFoundError:
+                return True  # nothing deeper exists either; resolve() would also stay lexical
+            except OSError:
+                break
+            if stat.S_ISLNK(mode):
+                break
+        else:
+            return True
+        self.rechecks += 1
+        return False
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.nodes import ScalarNode
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+
+# Restricted line scanner for the common shape of a module file:
+#
+#   module_id: a
+#   imports:
+#     - source: registry
+#       name: pkg
+#       version: "1.0"
+#
+# Top-level `key: scalar` entries plus one level of block sequence whose items
+# are scalars or flat `key: scalar` mappings. Scalars are plain, or single- or
+# double-quoted on one line. Plain scalars are typed with PyYAML's own resolver
+# and constructor, so `1.0`, `true` or `~` come out as they do from safe_load.
+#
+# Anything else makes scan_document() return None and the caller falls back to a
+# full YAML parse. That covers anchors and aliases, tags, flow collections other
+# than `[]`, block scalars, multi-line scalars, escapes, document markers and
+# directives, nested blocks, tabs, duplicate keys and unusual line breaks.
+# When scan_document() returns a mapping it equals yaml.safe_load() of the same
+# text; tests/test_workspace_prescan.py checks this differentially and by fuzzing.
+
+
+class _Unsupported(Exception):
+    pass
+
+
+_KEY_LINE = re.compile(r"([A-Za-z0-9_][A-Za-z0-9_./-]*)[ ]*:(?:[ ]+(.*))?$")
+_SEQ_ITEM = re.compile(r"-(?:([ ]+)(.*))?$")
+_SINGLE_QUOTED = re.compile(r"'((?:[^']|'')*)'(?:[ ]+#.*)?$")
+_DOUBLE_QUOTED = re.compile(r'"([^"\\]*)"(?:[ ]+#.*)?$')
+_PLAIN_COMMENT = re.compile(r"[ ]+#")
+# Characters that cannot start a plain scalar in block context (or that we leave to YAML)
+_INDICATORS = frozenset("&*!|>[]{}#%@`,?:'\"")
+_SUPPORTED_TAGS = frozenset(
+    "tag:yaml.org,2002:" + t for t in ("str", "int", "float", "bool", "null", "timestamp")
+)
+
+_resolver = Resolver()
+_constructor = SafeConstructor()
+
+
+@lru_cache(maxsize=4096)
+def _plain(text: str) -> Any:
+    """Type a plain scalar exactly as PyYAML's safe loader would (cached: keys and values repeat)."""
+    tag = _resolver.resolve(ScalarNode, text, (True, False))
+    if tag not in _SUPPORTED_TAGS:
+        raise _Unsupported
+    if tag == "tag:yaml.org,2002:str":
+        return text
+    try:
+        return _constructor.construct_object(ScalarNode(tag, text))
+    finally:
+        # The constructor memoizes every node it builds; each scalar gets a fresh node
+        _constructor.constructed_objects.clear()
+        _constructor.recursive_objects.clear()
+
+
+def _scalar(text: str) -> Any:
+    """Value after `key:` or `- ` on a single line. '' (or only a comment) is null."""
+    if not text or text.startswith("#"):
+        return None
+    first = text[0]
+    if first == "'":
+        m = _SINGLE_QUOTED.match(text)
+        if m is None:
+            raise _Unsupported
+        return m.group(1).replace("''", "'")
+    if first == '"':
+        m = _DOUBLE_QUOTED.match(text)
+        if m is None:
+            raise _Unsupported
+        return m.group(1)
+    if first in _INDICATORS or (first == "-" and (len(text) == 1 or text[1] == " ")):
+        raise _Unsupported
+    m = _PLAIN_COMMENT.search(text)
+    if m is not None:
+        text = text[: m.start()]
+    text = text.rstrip(" ")
+    if ": " in text or text.endswith(":") or " #" in text:
+        raise _Unsupported
+    return _plain(text)
+
+
+def _key(text: str) -> str:
+    key = _plain(text)
+    if not isinstance(key, str):
+        raise _Unsupported
+    return key
+
+
+def _lines(text: str) -> List[Tuple[int, str]]:
+    """(indent, content) for every line that is not blank or a comment."""
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    text = text.replace("\r\n", "\n")
+    if any(c in text for c in "\t\r\x85\ufeff\u2028\u2029"):
+        raise _Unsupported
+    if Reader.NON_PRINTABLE.search(text):
+        raise _Unsupported
+    out: List[Tuple[int, str]] = []
+    for line in text.split("\n"):
+        content = line.lstrip(" ").rstrip(" ")
+        if not content or content.startswith("#"):
+            continue
+        if line.startswith(("---", "...", "%")):
+            raise _Unsupported
+        out.append((len(line) - len(line.lstrip(" ")), content))
+    return out
+
+
+def _sequence(lines: List[Tuple[int, str]], i: int) -> Tuple[List[Any], int]:
+    """Block sequence starting at lines[i]; returns (items, index after the sequence)."""
+    seq_indent = lines[i][0]
+    items: List[Any] = []
+    while i < len(lines):
+        indent, content = lines[i]
+        if indent != seq_indent:
+            if indent < seq_indent:
+                break
+            raise _Unsupported
+        m = _SEQ_ITEM.match(content)
+        if m is None:
+            if indent == 0:
+                break  # next top-level key (sequence written at column 0)
+            raise _Unsupported
+        if m.group(2) is None:
+            raise _Unsupported  # "-" alone: item continues on the next lines
+        i += 1
+        kv = _KEY_LINE.match(m.group(2))
+        if kv is None:
+            items.append(_scalar(m.group(2)))
+            if i < len(lines) and lines[i][0] > seq_indent:
+                raise _Unsupported
+            continue
+        item_indent = seq_indent + 1 + len(m.group(1))
+        item: Dict[str, Any] = {}
+        while True:
+            key = _key(kv.group(1))
+            if key in item or (kv.group(2) is None and i < len(lines) and lines[i][0] > item_indent):
+                raise _Unsupported
+            item[key] = _scalar(kv.group(2) or "")
+            if i >= len(lines) or lines[i][0] <= seq_indent:
+                break
+            if lines[i][0] != item_indent:
+                raise _Unsupported
+            kv = _KEY_LINE.match(lines[i][1])
+            if kv is None:
+                raise _Unsupported
+            i += 1
+        items.append(item)
+    return items, i
+
+
+def _document(text: str) -> Dict[str, Any]:
+    lines = _lines(text)
+    doc: Dict[str, Any] = {}
+    i = 0
+    while i < len(lines):
+        indent, content = lines[i]
+        kv = _KEY_LINE.match(content) if indent == 0 else None
+        if kv is None:
+            raise _Unsupported
+        key = _key(kv.group(1))
+        if key in doc:
+            raise _Unsupported
+        i += 1
+        value_text = kv.group(2) or ""
+        nested = i < len(lines) and (lines[i][0] > 0 or _SEQ_ITEM.match(lines[i][1]) is not None)
+        if not nested:
+            doc[key] = [] if value_text.split(" #")[0].rstrip(" ") == "[]" else _scalar(value_text)
+        elif value_text and not value_text.startswith("#"):
+            raise _Unsupported  # multi-line scalar or a value followed by a block
+        elif _SEQ_ITEM.match(lines[i][1]) is None:
+            raise _Unsupported  # nested mapping
+        else:
+            doc[key], i = _sequence(lines, i)
+    return doc
+
+
+def scan_document(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a module file's text with the restricted scanner.
+    Returns the top-level mapping (equal to yaml.safe_load(text) or {}), or None
+    when the text uses YAML the scanner does not handle.
+    """
+    try:
+        return _document(text)
+    except (_Unsupported, yaml.YAMLError, ValueError):
+        return None
@@ -1,8 +1,10 @@
 ﻿from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ptbl.errors import (
     ResolverError,
@@ -10,28 +12,47 @@ from ptbl.errors import (
     RESOLVE_UNRESOLVED_IMPORT,
     RESOLVE_CYCLE,
     RESOLVE_CONFLICT,
-    RESOLVE_PATH_TRAVERSAL,
     RESOLVE_SOURCE_UNSUPPORTED,
 )
-from ptbl.workspace.loader import Workspace
+from ptbl.workspace import trace
+from ptbl.workspace.graph import DependencyGraph
+from ptbl.workspace.loader import ModuleSpec, Workspace, build_module_index
+from ptbl.workspace.lock import CompiledLock
+from ptbl.workspace.paths import resolve_local_path
 
 
-@dataclass(frozen=True)
+# One shared key tuple per distinct ResolvedItem.meta layout
+_META_KEYS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class ResolvedItem:
     key: str
     kind: str  # module | registry | git | url
     locked: bool
-    meta: Dict[str, Any]
+    # meta is stored as shared keys + a values tuple and rebuilt as a dict on access
+    _meta_keys: Tuple[str, ...] = field(repr=False)
+    _meta_values: Tuple[Any, ...] = field(repr=False)
+
+    def __init__(self, key: str, kind: str, locked: bool, meta: Dict[str, Any]):
+        keys = tuple(meta)
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "locked", locked)
+        object.__setattr__(self, "_meta_keys", _META_KEYS.setdefault(keys, keys))
+        object.__setattr__(self, "_meta_values", tuple(meta.values()))
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return dict(zip(self._meta_keys, self._meta_values))
+
+    def __repr__(self) -> str:
+        return f"ResolvedItem(key={self.key!r}, kind={self.kind!r}, locked={self.locked!r}, meta={self.meta!r})"
 
 
-def _is_within(child: Path, parent: Path) -> bool:
-    child = child.resolve()
-    parent = parent.resolve()
-    try:
-        child.relative_to(parent)
-        return True
-    except ValueError:
-        return False
+def resolved_item_to_dict(item: ResolvedItem) -> Dict[str, Any]:
+    """JSON-ready form of a ResolvedItem (stable key order)."""
+    return {"key": item.key, "kind": item.kind, "locked": item.locked, "meta": item.meta}
 
 
 def _resolve_local_path(workspace: Workspace, rel_path: str) -> Path:
@@ -41,29 +62,12 @@ def _resolve_local_path(workspace: Workspace, rel_path: str) -> Path:
     Accepts either:
       - modules/auth.ptbl
       - modules/auth   (auto adds .ptbl)
+    Memoized through workspace.path_cache when the workspace has one.
     """
-    if not isinstance(rel_path, str) or not rel_path.strip():
-        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, "Local import path must be a non-empty string")
-
-    raw = rel_path.strip()
-
-    # Normalize to a Path without touching filesystem
-    p = Path(raw)
-
-    # Reject absolute paths immediately (C:\..., \\server\share\..., /etc/...)
-    if p.is_absolute():
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Absolute path not allowed: {raw}")
-
-    # Allow omitting .ptbl extension
-    if p.suffix == "":
-        p = p.with_suffix(".ptbl")
-
-    abs_path = (workspace.root / p).resolve()
-
-    if not _is_within(abs_path, workspace.root):
-        raise ResolverError(RESOLVE_PATH_TRAVERSAL, f"Path traversal detected: {raw}")
-
-    return abs_path
+    paths = workspace.path_cache
+    if paths is None:
+        return resolve_local_path(workspace.root, rel_path)
+    return paths.resolve(rel_path)
 
 
 def _entry_modules_from_app(workspace: Workspace) -> List[str]:
@@ -77,167 +81,331 @@ def _entry_modules_from_app(workspace: Workspace) -> List[str]:
     return sorted(entry, key=lambda s: s.lower())
 
 
-def resolve_workspace(workspace: Workspace, mode: str) -> List[ResolvedItem]:
+@dataclass(frozen=True)
+class _CompiledModule:
+    """
+    Per-module resolution steps, in import order, replayed by _walk():
+      ("module", target_id)      recurse into a local import
+      ("request", (name, ver))   record a registry request for conflict detection
+      ("item", ResolvedItem)     emit an item
+      ("error", ResolverError)   raise (kept in place so errors surface in DFS order)
+    The module's own item is the last step (post-order).
+    """
+    module_id: str
+    steps: Tuple[Tuple[str, Any], ...]
+    local_paths: Tuple[Path, ...]  # resolved local import targets, found or not
+
+
+def _compile_lock(workspace: Workspace, mode: str) -> CompiledLock:
     if mode not in ("dev", "repro"):
         raise ValueError("mode must be dev or repro")
 
     if mode == "repro" and workspace.lock is None:
         raise ResolverError(RESOLVE_LOCK_MISSING, "Repro mode requires lock.ptbl")
 
-    lock_resolved: Dict[str, Any] = {}
-    if workspace.lock is not None:
-        lock_resolved = workspace.lock.get("resolved", {}) or {}
-        if not isinstance(lock_resolved, dict):
-            raise ValueError("lock.ptbl: resolved must be a mapping")
+    return CompiledLock.from_lock(workspace.lock)
 
-    entry_module_ids = _entry_modules_from_app(workspace)
-
-    # Conflict detection for registry imports: name -> set(versions)
-    registry_requested: Dict[str, Set[str]] = {}
 
-    resolved_items: List[ResolvedItem] = []
-    visited_modules: Set[str] = set()
-    visiting_stack: List[str] = []
-
-    def add_resolved(item: ResolvedItem) -> None:
-        resolved_items.append(item)
-
-    def dfs_module(module_id: str) -> None:
-        if module_id in visiting_stack:
-            cycle = " -> ".join(visiting_stack + [module_id])
-            raise ResolverError(RESOLVE_CYCLE, f"Cycle detected: {cycle}")
-
-        if module_id in visited_modules:
-            return
-
-        spec = workspace.modules.get(module_id)
-        if spec is None:
-            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing module_id: {module_id}")
-
-        visiting_stack.append(module_id)
-
-        # Resolve imports first (depth-first), deterministic order already applied in loader
-        for imp in spec.imports:
+def _compile_module(
+    workspace: Workspace,
+    spec: ModuleSpec,
+    mode: str,
+    lock: CompiledLock,
+    module_index: Dict[Path, str],
+    shared_items: Optional[Dict[Tuple[Any, ...], ResolvedItem]] = None,
+) -> _CompiledModule:
+    """
+    shared_items: registry/git/url items already built by other modules, keyed by
+    (kind, identifying fields, locked). Every module importing the same package
+    then reuses one ResolvedItem instead of allocating its own.
+    """
+    steps: List[Tuple[str, Any]] = []
+    local_paths: List[Path] = []
+    locked = (mode == "repro")
+    if shared_items is None:
+        shared_items = {}
+
+    # Deterministic order already applied in loader
+    for imp in spec.imports:
+        try:
             if imp.source == "local":
                 abs_path = _resolve_local_path(workspace, imp.path or "")
+                local_paths.append(abs_path)
 
-                # Map absolute module file path to module_id by matching loaded modules
-                target_id: Optional[str] = None
-                for mid, mspec in workspace.modules.items():
-                    if mspec.file_path.resolve() == abs_path:
-                        target_id = mid
-                        break
-
+                # Map absolute module file path to module_id via the workspace index
+                target_id: Optional[str] = module_index.get(abs_path)
                 if target_id is None:
                     raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Local import not found: {imp.path}")
 
-                dfs_module(target_id)
+                steps.append(("module", target_id))
 
             elif imp.source == "registry":
                 name = imp.name or ""
                 version = imp.version or ""
-                registry_requested.setdefault(name, set()).add(version)
+                steps.append(("request", (name, version)))
 
-                locked = (mode == "repro")
                 if locked:
-                    lock_key = f"registry:{name}"
-                    lock_entry = lock_resolved.get(lock_key)
-                    if not isinstance(lock_entry, dict):
-                        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for {lock_key}")
-                    pinned = lock_entry.get("pinned_version")
-                    if pinned != version:
-                        raise ResolverError(
-                            RESOLVE_CONFLICT,
-                            f"Registry version mismatch for {name}: requested {version} but lock has {pinned}",
-                        )
-
-                add_resolved(
-                    ResolvedItem(
+                    lock.check_registry(name, version)
+
+                ident = ("registry", name, version, locked)
+                item = shared_items.get(ident)
+                if item is None:
+                    item = shared_items[ident] = ResolvedItem(
                         key=f"registry:{name}@{version}",
                         kind="registry",
                         locked=locked,
                         meta={"name": name, "version": version},
                     )
-                )
+                steps.append(("item", item))
 
             elif imp.source == "git":
                 # Stubbed: record it, require lock entry in repro mode
-                locked = (mode == "repro")
                 url = imp.url or ""
                 ref = imp.ref
 
                 if locked:
-                    lock_key = f"git:{url}"
-                    lock_entry = lock_resolved.get(lock_key)
-                    if not isinstance(lock_entry, dict):
-                        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for {lock_key}")
-                    if not isinstance(lock_entry.get("commit"), str) or not lock_entry.get("commit"):
-                        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Lock entry missing commit for {lock_key}")
-
-                add_resolved(
-                    ResolvedItem(
+                    lock.check_git(url)
+
+                ident = ("git", url, ref, locked)
+                item = shared_items.get(ident)
+                if item is None:
+                    item = shared_items[ident] = ResolvedItem(
                         key=f"git:{url}#{ref or 'unknown'}",
                         kind="git",
                         locked=locked,
                         meta={"url": url, "ref": ref},
                     )
-                )
+                steps.append(("item", item))
 
             elif imp.source == "url":
-                locked = (mode == "repro")
                 url = imp.url or ""
 
                 if locked:
-                    lock_key = f"url:{url}"
-                    lock_entry = lock_resolved.get(lock_key)
-                    if not isinstance(lock_entry, dict):
-                        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing lock entry for {lock_key}")
-                    if not isinstance(lock_entry.get("sha256"), str) or not lock_entry.get("sha256"):
-                        raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Lock entry missing sha256 for {lock_key}")
-
-                add_resolved(
-                    ResolvedItem(
+                    lock.check_url(url)
+
+                ident = ("url", url, locked)
+                item = shared_items.get(ident)
+                if item is None:
+                    item = shared_items[ident] = ResolvedItem(
                         key=f"url:{url}",
                         kind="url",
                         locked=locked,
                         meta={"url": url},
                     )
-                )
+                steps.append(("item", item))
 
             else:
                 raise ResolverError(RESOLVE_SOURCE_UNSUPPORTED, f"Unsupported source: {imp.source}")
 
+        except ResolverError as e:
+            # Nothing after an error is ever replayed
+            steps.append(("error", e))
+            break
+    else:
         # Record module itself after imports
-        add_resolved(
+        steps.append((
+            "item",
             ResolvedItem(
                 key=f"module:{spec.module_id}",
                 kind="module",
-                locked=(mode == "repro"),
+                locked=locked,
                 meta={"module_id": spec.module_id, "file": str(spec.file_path)},
-            )
-        )
+            ),
+        ))
+
+    return _CompiledModule(module_id=spec.module_id, steps=tuple(steps), local_paths=tuple(local_paths))
+
+
+def _walk(
+    entry_module_ids: List[str],
+    compiled_for: Callable[[str], Optional[_CompiledModule]],
+) -> Tuple[Dict[Tuple[str, str], ResolvedItem], Dict[str, Set[str]]]:
+    """
+    Depth-first walk from the entry modules, replaying compiled steps.
+    Returns (items deduplicated by (kind, key) in first-emission order,
+    registry name -> requested versions).
+    """
+    # Conflict detection for registry imports: name -> set(versions)
+    registry_requested: Dict[str, Set[str]] = {}
+
+    # Dedupe at insertion: the first emitted item for a (kind, key) wins
+    resolved_items: Dict[Tuple[str, str], ResolvedItem] = {}
+    visited_modules: Set[str] = set()
+    visiting_stack: List[str] = []
+    visiting: Set[str] = set()  # mirrors visiting_stack for O(1) cycle checks
+
+    def enter(module_id: str) -> Optional[Iterator[Tuple[str, Any]]]:
+        if module_id in visiting:
+            cycle = " -> ".join(visiting_stack + [module_id])
+            raise ResolverError(RESOLVE_CYCLE, f"Cycle detected: {cycle}")
+
+        if module_id in visited_modules:
+            return None
 
-        visiting_stack.pop()
-        visited_modules.add(module_id)
+        compiled = compiled_for(module_id)
+        if compiled is None:
+            raise ResolverError(RESOLVE_UNRESOLVED_IMPORT, f"Missing module_id: {module_id}")
+
+        visiting_stack.append(module_id)
+        visiting.add(module_id)
+        return iter(compiled.steps)
 
-    # Walk all entry modules deterministically
+    # Explicit-stack DFS: one step iterator per module on the visiting stack.
+    # Emission order is the same post-order as a recursive walk, without the
+    # recursion limit on deep local-import chains.
     for mid in entry_module_ids:
-        dfs_module(mid)
+        root_steps = enter(mid)
+        if root_steps is None:
+            continue
+
+        frames: List[Iterator[Tuple[str, Any]]] = [root_steps]
+        while frames:
+            # Resolve imports first (depth-first)
+            for op, arg in frames[-1]:
+                if op == "module":
+                    child = enter(arg)
+                    if child is not None:
+                        frames.append(child)
+                        break
+                elif op == "item":
+                    k = (arg.kind, arg.key)
+                    if k not in resolved_items:
+                        resolved_items[k] = arg
+                elif op == "request":
+                    name, version = arg
+                    registry_requested.setdefault(name, set()).add(version)
+                else:
+                    # Compiled steps outlive one resolve (IncrementalResolver): raise
+                    # the stored error without the traceback of an earlier raise
+                    raise arg.with_traceback(None)
+            else:
+                # All steps replayed (the module's own item was the last one)
+                frames.pop()
+                done = visiting_stack.pop()
+                visiting.discard(done)
+                visited_modules.add(done)
+
+    return resolved_items, registry_requested
+
 
+def _finalize(
+    resolved_items: Dict[Tuple[str, str], ResolvedItem], registry_requested: Dict[str, Set[str]]
+) -> List[ResolvedItem]:
+    return list(_iter_finalized(resolved_items, registry_requested))
+
+
+def _iter_finalized(
+    resolved_items: Dict[Tuple[str, str], ResolvedItem], registry_requested: Dict[str, Set[str]]
+) -> Iterator[ResolvedItem]:
     # Registry conflict check: if any name has >1 requested version, error
     for name, versions in registry_requested.items():
         if len(versions) > 1:
             raise ResolverError(RESOLVE_CONFLICT, f"Registry version conflict for {name}: {sorted(versions)}")
 
-    # Deduplicate items by (kind, key) deterministically, then sort deterministically
-    seen: Set[tuple[str, str]] = set()
-    unique: List[ResolvedItem] = []
-    for item in resolved_items:
-        k = (item.kind, item.key)
-        if k in seen:
-            continue
-        seen.add(k)
-        unique.append(item)
+    # Bucket by kind with each sort key computed once: (key.lower(), item)
+    by_kind: Dict[str, List[Tuple[str, ResolvedItem]]] = {}
+    for (kind, key), item in resolved_items.items():
+        by_kind.setdefault(kind, []).append((key.lower(), item))
 
-    unique_sorted = sorted(unique, key=lambda x: (x.kind, x.key.lower()))
-    return unique_sorted
+    # Same order as a stable sort on (kind, key.lower()), one kind at a time
+    for kind in sorted(by_kind):
+        bucket = by_kind.pop(kind)
+        bucket.sort(key=_sort_key)
+        for _, item in bucket:
+            yield item
+
+
+_sort_key = itemgetter(0)
+
+
+def resolve_workspace(workspace: Workspace, mode: str, *, strict_lock: bool = False) -> List[ResolvedItem]:
+    """
+    strict_lock=True first checks the whole lock.ptbl and raises one
+    RESOLVE_LOCK_INVALID error listing every malformed entry, imported or not.
+    """
+    return list(iter_resolve_workspace(workspace, mode, strict_lock=strict_lock))
+
+
+def resolve_with_graph(workspace: Workspace, mode: str) -> Tuple[List[ResolvedItem], DependencyGraph]:
+    """
+    resolve_workspace() plus the import graph of the result: one node per item
+    (same order), an edge from each visited module to every module and package
+    it imports. Costs one resolve; the graph is built from the compiled modules
+    the walk already visited.
+    """
+    compiled: Dict[str, _CompiledModule] = {}
+    items = list(_iter_resolve(workspace, mode, compiled))
+    entries = [f"module:{mid}" for mid in _entry_modules_from_app(workspace)]
+    return items, DependencyGraph.build(items, _graph_edges(compiled.values()), entries)
+
+
+def _graph_edges(compiled: Iterable[_CompiledModule]) -> Iterator[Tuple[str, str]]:
+    """(importer key, imported key) for each module import and package import step."""
+    for c in compiled:
+        src = f"module:{c.module_id}"
+        for op, arg in c.steps:
+            if op == "module":
+                yield src, f"module:{arg}"
+            elif op == "item" and arg.key != src:
+                yield src, arg.key
+
+
+def iter_resolve_workspace(workspace: Workspace, mode: str, *, strict_lock: bool = False) -> Iterator[ResolvedItem]:
+    """
+    resolve_workspace() as an iterator; not a streaming resolve. The whole graph is
+    resolved, and every item held, before the first item is yielded (the order
+    and the conflict check need all of them), so a consumer never sees a partial
+    result. It only skips building the sorted result list: items are sorted one
+    kind at a time as they are reached.
+    """
+    return _iter_resolve(workspace, mode, None, strict_lock=strict_lock)
+
+
+def _iter_resolve(
+    workspace: Workspace,
+    mode: str,
+    compiled_sink: Optional[Dict[str, _CompiledModule]],
+    *,
+    strict_lock: bool = False,
+) -> Iterator[ResolvedItem]:
+    tracer = trace.active
+    with trace.span("compile_lock"):
+        lock = _compile_lock(workspace, mode)
+    if strict_lock:
+        lock.validate()
+
+    entry_module_ids = _entry_modules_from_app(workspace)
+
+    # Resolved file path -> module_id (precomputed by load_workspace)
+    module_index = workspace.module_index or build_module_index(workspace.modules)
+
+    shared_items: Dict[Tuple[Any, ...], ResolvedItem] = {}
+
+    def compiled_for(module_id: str) -> Optional[_CompiledModule]:
+        spec = workspace.modules.get(module_id)
+        if spec is None:
+            return None
+        compiled = _compile_module(workspace, spec, mode, lock, module_index, shared_items)
+        if compiled_sink is not None:
+            compiled_sink[module_id] = compiled
+        return compiled
+
+    if tracer is None:
+        resolved_items, registry_requested = _walk(entry_module_ids, compiled_for)
+        yield from _iter_finalized(resolved_items, registry_requested)
+        return
+
+    def timed_compiled_for(module_id: str) -> Optional[_CompiledModule]:
+        start = time.perf_counter_ns()
+        try:
+            return compiled_for(module_id)
+        finally:
+            tracer.add_time("compile_module", time.perf_counter_ns() - start)
+
+    with tracer.span("walk", mode=mode):
+        resolved_items, registry_requested = _walk(entry_module_ids, timed_compiled_for)
+    # Materialized so the span times dedupe/sort rather than the consumer
+    with tracer.span("finalize"):
+        items = list(_iter_finalized(resolved_items, registry_requested))
+    tracer.count("resolved_items", len(items))
+    yield from items
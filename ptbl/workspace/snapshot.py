@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ptbl.errors import ResolverError
+from ptbl.workspace.trace import tracing_from_env
+from ptbl.workspace.cache import _is_json_native
+from ptbl.workspace.fs import scan_dir
+from ptbl.workspace.loader import ImportSpec, ModuleSpec, Workspace, _sorted_glob, build_module_index, load_workspace
+from ptbl.workspace.paths import LocalPathCache
+from ptbl.workspace.resolver import ResolvedItem, resolve_workspace
+
+# Bump when the binary layout changes.
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_MAGIC = b"PTBLSNAP"
+
+# Layout (little-endian):
+#   header   magic[8] version:u32 section_count:u32 tree_sha256[32] code_version[16]
+#   sections section_count x (tag[4] offset:u32 length:u32)
+#   STRS     count:u32, offsets:u32[count + 1] into the UTF-8 blob that follows
+#   DOCS     app:s lock:s integration_count:u32, then (name:s json:s) pairs
+#   MODS     count:u32, then (module_id:s file:s first_import:u32 import_count:u32), load order
+#   MIDX     module record numbers sorted by module_id (binary search without decoding)
+#   IMPS     (source:u8 pad[3] path:s name:s version:s url:s ref:s commit:s extra:s) records
+#   R<mode>  status:u32 rule_id:s message:s count:u32, then (key:s kind:s locked:u32 meta:s)
+# where s is a string-table index (0xFFFFFFFF for None). JSON documents are
+# stored as strings. Module paths are relative to the workspace root, so a
+# snapshot can be used from another checkout of the same tree.
+_HEADER = struct.Struct("<8sII32s16s")
+_SECTION = struct.Struct("<4sII")
+_U32 = struct.Struct("<I")
+_MOD = struct.Struct("<IIII")
+_IMP = struct.Struct("<B3xIIIIIII")
+_ITEM = struct.Struct("<IIII")
+_RESULT = struct.Struct("<IIII")
+_NONE = 0xFFFFFFFF
+
+_SOURCES = ("local", "git", "registry", "url")
+_MODE_TAGS = {"dev": b"RDEV", "repro": b"RREP"}
+
+_STATUS_OK = 0
+_STATUS_RESOLVER_ERROR = 1
+_STATUS_VALUE_ERROR = 2
+
+# open_or_build() loads this many times while the tree keeps changing under it
+_LOAD_ATTEMPTS = 3
+
+
+class SnapshotUnsupported(ValueError):
+    """The workspace holds data a snapshot cannot represent (non-JSON YAML values)."""
+
+
+def tree_sha256(root: str | Path) -> str:
+    """
+    Hash of the files load_workspace() reads: app.ptbl, lock.ptbl, modules/*.ptbl and
+    integrations/*.ptbl. Same scheme as the parity harness's stable_dir_sha256
+    (relative path + NUL + bytes + NUL, in sorted path order), limited to those inputs.
+    """
+    root_path = Path(root).resolve()
+    files = [p for p in (root_path / "app.ptbl", root_path / "lock.ptbl") if p.is_file()]
+    files += _sorted_glob(root_path / "modules", "*.ptbl")
+    files += _sorted_glob(root_path / "integrations", "*.ptbl")
+    h = hashlib.sha256()
+    for p in sorted(files, key=lambda x: x.relative_to(root_path).as_posix()):
+        h.update(p.relative_to(root_path).as_posix().encode("utf-8"))
+        h.update(b"\x00")
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _code_version_sources() -> List[Path]:
+    """Every ptbl.workspace module plus ptbl/errors.py: path rules, messages and rule ids live there too."""
+    workspace_dir = Path(__file__).resolve().parent
+    return scan_dir(workspace_dir, "*.py") + [workspace_dir.parent / "errors.py"]
+
+
+def snapshot_code_version() -> bytes:
+    """16-byte key of the layout version plus the sources that produced the data."""
+    h = hashlib.sha256(f"format={SNAPSHOT_FORMAT_VERSION}\0".encode("utf-8"))
+    for src in _code_version_sources():
+        h.update(f"{src.name}\0".encode("utf-8"))
+        h.update(src.read_bytes())
+        h.update(b"\0")
+    return h.digest()[:16]
+
+
+# ---------------------------------------------------------------------------
+# Writing
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._values: List[bytes] = []
+
+    def add(self, s: Optional[str]) -> int:
+        if s is None:
+            return _NONE
+        i = self._index.get(s)
+        if i is None:
+            i = self._index[s] = len(self._values)
+            self._values.append(s.encode("utf-8"))
+        return i
+
+    def add_json(self, obj: Any) -> int:
+        if not _is_json_native(obj):
+            raise SnapshotUnsupported("workspace data is not JSON-native; cannot snapshot")
+        return self.add(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+
+    def encode(self) -> bytes:
+        offsets = [0]
+        for v in self._values:
+            offsets.append(offsets[-1] + len(v))
+        head = _U32.pack(len(self._values)) + struct.pack(f"<{len(offsets)}I", *offsets)
+        return head + b"".join(self._values)
+
+
+def _resolve_for_snapshot(ws: Workspace, mode: str, strings: _StringTable) -> bytes:
+    try:
+        items = resolve_workspace(ws, mode)
+    except ResolverError as e:
+        message = str(e)
+        prefix = f"{e.rule_id}: "
+        if message.startswith(prefix):
+            message = message[len(prefix):]
+        return _RESULT.pack(_STATUS_RESOLVER_ERROR, strings.add(e.rule_id), strings.add(message), 0)
+    except ValueError as e:
+        return _RESULT.pack(_STATUS_VALUE_ERROR, _NONE, strings.add(str(e)), 0)
+
+    out = [_RESULT.pack(_STATUS_OK, _NONE, _NONE, len(items))]
+    for item in items:
+        meta = item.meta
+        if item.kind == "module":
+            meta["file"] = Path(meta["file"]).relative_to(ws.root).as_posix()
+        out.append(_ITEM.pack(strings.add(item.key), strings.add(item.kind), int(item.locked), strings.add_json(meta)))
+    return b"".join(out)
+
+
+def build_snapshot(
+    ws: Workspace, *, tree_digest: str, modes: Sequence[str] = ("dev", "repro")
+) -> bytes:
+    """Serialize a loaded workspace and its resolve results (or errors) for each mode."""
+    strings = _StringTable()
+
+    docs = [_U32.pack(strings.add_json(ws.app)), _U32.pack(strings.add_json(ws.lock) if ws.lock is not None else _NONE)]
+    docs.append(_U32.pack(len(ws.integrations)))
+    for name, data in ws.integrations.items():
+        docs.append(_U32.pack(strings.add(name)) + _U32.pack(strings.add_json(data)))
+
+    mods: List[bytes] = [_U32.pack(len(ws.modules))]
+    imps: List[bytes] = []
+    n_imports = 0
+    for spec in ws.modules.values():
+        rel = spec.file_path.relative_to(ws.root).as_posix()
+        mods.append(_MOD.pack(strings.add(spec.module_id), strings.add(rel), n_imports, len(spec.imports)))
+        for imp in spec.imports:
+            imps.append(_IMP.pack(
+                _SOURCES.index(imp.source),
+                strings.add(imp.path), strings.add(imp.name), strings.add(imp.version),
+                strings.add(imp.url), strings.add(imp.ref), strings.add(imp.commit),
+                strings.add_json([list(kv) for kv in imp.extra]) if imp.extra else _NONE,
+            ))
+        n_imports += len(spec.imports)
+
+    ids = list(ws.modules)
+    order = sorted(range(len(ids)), key=lambda i: ids[i].encode("utf-8"))
+    midx = struct.pack(f"<{len(order)}I", *order)
+
+    sections: List[Tuple[bytes, bytes]] = [(b"DOCS", b"".join(docs)), (b"MODS", b"".join(mods)),
+                                           (b"MIDX", midx), (b"IMPS", b"".join(imps))]
+    for mode in modes:
+        sections.append((_MODE_TAGS[mode], _resolve_for_snapshot(ws, mode, strings)))
+    sections.insert(0, (b"STRS", strings.encode()))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table: List[bytes] = []
+    for tag, body in sections:
+        table.append(_SECTION.pack(tag, offset, len(body)))
+        offset += len(body)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(sections),
+                          bytes.fromhex(tree_digest), snapshot_code_version())
+    return header + b"".join(table) + b"".join(body for _, body in sections)
+
+
+def write_snapshot(path: str | Path, ws: Workspace, *, tree_digest: str, modes: Sequence[str] = ("dev", "repro")) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp.write_bytes(build_snapshot(ws, tree_digest=tree_digest, modes=modes))
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+
+class WorkspaceSnapshot:
+    """
+    Read-only view of a snapshot file, memory-mapped.
+
+    Nothing is decoded up front: module(), iter_resolved() and workspace()
+    decode only the records they touch. Paths are rebuilt against `root`.
+    """
+
+    def __init__(self, buf: Any, root: Path, *, _mmap: Optional[mmap.mmap] = None):
+        self._buf = memoryview(buf)
+        self._mmap = _mmap
+        self.root = root
+        try:
+            self._parse()
+        except Exception:
+            self._buf.release()
+            raise
+
+    def _parse(self) -> None:
+        if len(self._buf) < _HEADER.size:
+            raise ValueError("snapshot: truncated header")
+        magic, version, n_sections, digest, code = _HEADER.unpack_from(self._buf, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError("snapshot: unknown format")
+        self.tree_sha256: str = digest.hex()
+        self.code_version: bytes = code
+
+        self._sections: Dict[bytes, Tuple[int, int]] = {}
+        for i in range(n_sections):
+            tag, off, length = _SECTION.unpack_from(self._buf, _HEADER.size + i * _SECTION.size)
+            if off + length > len(self._buf):
+                raise ValueError("snapshot: truncated section")
+            self._sections[tag] = (off, length)
+
+        strs = self._section(b"STRS")
+        (self._n_strings,) = _U32.unpack_from(self._buf, strs)
+        self._str_offsets = strs + _U32.size
+        self._str_blob = self._str_offsets + _U32.size * (self._n_strings + 1)
+        self._strings: Dict[int, str] = {}
+
+        self._mods = self._section(b"MODS")
+        (self.module_count,) = _U32.unpack_from(self._buf, self._mods)
+        self._midx = self._section(b"MIDX")
+        self._imps = self._section(b"IMPS")
+
+    @classmethod
+    def open(cls, path: str | Path, root: str | Path) -> "WorkspaceSnapshot":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm, Path(root).resolve(), _mmap=mm)
+        except Exception:
+            mm.close()
+            raise
+
+    def close(self) -> None:
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "WorkspaceSnapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def modes(self) -> List[str]:
+        return [m for m, tag in _MODE_TAGS.items() if tag in self._sections]
+
+    def is_current(self, tree_digest: str) -> bool:
+        return self.tree_sha256 == tree_digest and self.code_version == snapshot_code_version()
+
+    # ---- raw access ---------------------------------------------------------
+
+    def _section(self, tag: bytes) -> int:
+        try:
+            return self._sections[tag][0]
+        except KeyError:
+            raise ValueError(f"snapshot: missing section {tag.decode()}") from None
+
+    def _string_bytes(self, i: int) -> memoryview:
+        start, end = struct.unpack_from("<II", self._buf, self._str_offsets + _U32.size * i)
+        return self._buf[self._str_blob + start:self._str_blob + end]
+
+    def _str(self, i: int) -> Optional[str]:
+        if i == _NONE:
+            return None
+        s = self._strings.get(i)
+        if s is None:
+            s = self._strings[i] = str(self._string_bytes(i), "utf-8")
+        return s
+
+    def _json(self, i: int) -> Any:
+        return None if i == _NONE else json.loads(self._str(i))
+
+    # ---- modules --------------------------------------------------------------
+
+    def module_ids(self) -> Iterator[str]:
+        """Module ids in load order."""
+        for n in range(self.module_count):
+            yield self._str(_MOD.unpack_from(self._buf, self._mods + _U32.size + n * _MOD.size)[0])
+
+    def _module_record(self, n: int) -> ModuleSpec:
+        mid, rel, first, count = _MOD.unpack_from(self._buf, self._mods + _U32.size + n * _MOD.size)
+        imports = []
+        for k in range(first, first + count):
+            src, path, name, version, url, ref, commit, extra = _IMP.unpack_from(self._buf, self._imps + k * _IMP.size)
+            imports.append(ImportSpec(
+                source=_SOURCES[src], path=self._str(path), name=self._str(name), version=self._str(version),
+                url=self._str(url), ref=self._str(ref), commit=self._str(commit),
+                extra=tuple((k, v) for k, v in self._json(extra)) if extra != _NONE else None,
+            ))
+        return ModuleSpec(module_id=self._str(mid), file_path=self.root / rel_path(self._str(rel)),
+                          imports=tuple(imports))
+
+    def module(self, module_id: str) -> Optional[ModuleSpec]:
+        """One module by id: binary search over the sorted index, comparing UTF-8 bytes."""
+        want = module_id.encode("utf-8")
+        lo, hi = 0, self.module_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (n,) = _U32.unpack_from(self._buf, self._midx + mid * _U32.size)
+            (sid,) = _U32.unpack_from(self._buf, self._mods + _U32.size + n * _MOD.size)
+            got = bytes(self._string_bytes(sid))
+            if got == want:
+                return self._module_record(n)
+            if got < want:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    # ---- resolve results -------------------------------------------------------
+
+    def iter_resolved(self, mode: str) -> Iterator[ResolvedItem]:
+        """Stored resolve_workspace(ws, mode) result; re-raises the stored error."""
+        tag = _MODE_TAGS.get(mode)
+        if tag is None or tag not in self._sections:
+            raise KeyError(f"snapshot has no results for mode {mode!r}")
+        off = self._sections[tag][0]
+        status, rule_id, message, count = _RESULT.unpack_from(self._buf, off)
+        if status == _STATUS_RESOLVER_ERROR:
+            raise ResolverError(self._str(rule_id), self._str(message))
+        if status == _STATUS_VALUE_ERROR:
+            raise ValueError(self._str(message))
+        off += _RESULT.size
+        for n in range(count):
+            key, kind, locked, meta = _ITEM.unpack_from(self._buf, off + n * _ITEM.size)
+            kind_s = self._str(kind)
+            meta_d = self._json(meta)
+            if kind_s == "module":
+                meta_d["file"] = str(self.root / rel_path(meta_d["file"]))
+            yield ResolvedItem(key=self._str(key), kind=kind_s, locked=bool(locked), meta=meta_d)
+
+    def resolved(self, mode: str) -> List[ResolvedItem]:
+        return list(self.iter_resolved(mode))
+
+    def workspace(self) -> Workspace:
+        """Materialize the full Workspace (equal to load_workspace(root))."""
+        off = self._section(b"DOCS")
+        app, lock, n_integrations = struct.unpack_from("<III", self._buf, off)
+        integrations: Dict[str, Dict[str, Any]] = {}
+        for k in range(n_integrations):
+            name, data = struct.unpack_from("<II", self._buf, off + 12 + 8 * k)
+            integrations[self._str(name)] = self._json(data)
+
+        modules = {spec.module_id: spec for spec in (self._module_record(n) for n in range(self.module_count))}
+        lock_path = self.root / "lock.ptbl"
+        return Workspace(
+            root=self.root,
+            app_path=self.root / "app.ptbl",
+            lock_path=lock_path if lock != _NONE else None,
+            module_paths=tuple(spec.file_path for spec in modules.values()),
+            integration_paths=tuple(self.root / "integrations" / f"{name}.ptbl" for name in integrations),
+            app=self._json(app),
+            lock=self._json(lock),
+            modules=modules,
+            integrations=integrations,
+            module_index=build_module_index(modules),
+            path_cache=LocalPathCache(self.root),
+        )
+
+
+def rel_path(posix: str) -> Path:
+    return Path(*posix.split("/"))
+
+
+def open_or_build(
+    root: str | Path,
+    snapshot_path: str | Path,
+    *,
+    modes: Sequence[str] = ("dev", "repro"),
+    **load_kwargs: Any,
+) -> WorkspaceSnapshot:
+    """
+    Open the snapshot for the current tree, rebuilding it first when it is missing,
+    unreadable, stale (tree hash or code version differ) or lacks a requested mode.
+    load_kwargs go to load_workspace() on rebuild. Raises SnapshotUnsupported when
+    the workspace cannot be snapshotted; callers then use load_workspace() directly.
+    """
+    root_path = Path(root).resolve()
+    snapshot_path = Path(snapshot_path)
+    digest = tree_sha256(root_path)
+
+    if snapshot_path.exists():
+        try:
+            snap = WorkspaceSnapshot.open(snapshot_path, root_path)
+        except (OSError, ValueError, struct.error):
+            snap = None
+        if snap is not None:
+            if snap.is_current(digest) and set(modes) <= set(snap.modes):
+                return snap
+            snap.close()
+
+    for _attempt in range(_LOAD_ATTEMPTS):
+        ws = load_workspace(root_path, **load_kwargs)
+        after = tree_sha256(root_path)
+        if after == digest:
+            write_snapshot(snapshot_path, ws, tree_digest=digest, modes=modes)
+            return WorkspaceSnapshot.open(snapshot_path, root_path)
+        # The tree was edited during the load: ws may match neither hash, so load again
+        digest = after
+    # Still changing: serve the last load from memory and leave the file alone
+    return WorkspaceSnapshot(build_snapshot(ws, tree_digest=digest, modes=modes), root_path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m ptbl.workspace.snapshot")
+    p.add_argument("root", help="Workspace root")
+    p.add_argument("snapshot", help="Snapshot file (rebuilt when missing or stale)")
+    p.add_argument("--mode", action="append", choices=["dev", "repro"], help="Mode(s) to store (default: both)")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tracing_from_env(), open_or_build(args.root, args.snapshot, modes=args.mode or ["dev", "repro"]) as snap:
+        print(json.dumps({"snapshot": str(args.snapshot), "tree_sha256": snap.tree_sha256,
+                          "modules": snap.module_count, "modes": snap.modes}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+# Set to a file path to have entry points (python -m ptbl.ndjson, python -m
+# ptbl.workspace.snapshot) write a trace of their run there; see tracing_from_env().
+TRACE_ENV = "PTBL_TRACE"
+
+# The tracer recording right now, or None. Instrumented code reads this once per
+# call and does nothing else when it is None, so disabled tracing costs one
+# attribute load and compare. It is process-wide (not thread-local) so that
+# loader worker threads report into the tracer of the call that started them;
+# process-pool workers do not report.
+active: Optional["Tracer"] = None
+
+_NULL_SPAN = nullcontext()
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEvent:
+    name: str
+    cat: str  # phase | file
+    start_ns: int  # relative to the tracer's origin
+    dur_ns: int
+    tid: int
+    args: Optional[Dict[str, Any]] = None
+
+
+class Tracer:
+    """
+    Timings and counters for one load/resolve run.
+
+    span() records a timed event (per phase, or per file with cat="file").
+    add_time() accumulates time for hot spots called once per import, where an
+    event each would cost more than the work measured. count() bumps a counter
+    (files, imports, cache hits, ...).
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self.events: List[TraceEvent] = []
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, List[int]] = {}  # name -> [calls, total_ns]
+
+    @contextmanager
+    def span(self, name: str, cat: str = "phase", **args: Any) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, cat, start, time.perf_counter_ns() - start, args or None)
+
+    def record(self, name: str, cat: str, start_ns: int, dur_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        event = TraceEvent(name, cat, start_ns - self._origin, dur_ns, threading.get_ident(), args)
+        with self._lock:
+            self.events.append(event)
+
+    def add_time(self, name: str, dur_ns: int) -> None:
+        with self._lock:
+            t = self.timers.setdefault(name, [0, 0])
+            t[0] += 1
+            t[1] += dur_ns
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # ---- output ---------------------------------------------------------------
+
+    def to_json(self) -> Dict[str, Any]:
+        """Summary: per-phase totals, per-file timings, accumulated timers and counters."""
+        phases: Dict[str, Dict[str, Any]] = {}
+        files: Dict[str, Dict[str, float]] = {}
+        for e in self.events:
+            if e.cat == "file":
+                path = str((e.args or {}).get("path", ""))
+                entry = files.setdefault(path, {})
+                entry[f"{e.name}_ms"] = round(entry.get(f"{e.name}_ms", 0.0) + e.dur_ns / 1e6, 3)
+                continue
+            p = phases.setdefault(e.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            p["count"] += 1
+            p["total_ms"] += e.dur_ns / 1e6
+            p["max_ms"] = max(p["max_ms"], e.dur_ns / 1e6)
+        for p in phases.values():
+            p["total_ms"] = round(p["total_ms"], 3)
+            p["max_ms"] = round(p["max_ms"], 3)
+        return {
+            "phases": phases,
+            "timers": {
+                name: {"calls": calls, "total_ms": round(total / 1e6, 3)}
+                for name, (calls, total) in sorted(self.timers.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "files": [{"path": path, **timings} for path, timings in sorted(files.items())],
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace-event format (chrome://tracing, Perfetto); the summary rides along under "summary"."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for e in sorted(self.events, key=lambda e: (e.start_ns, -e.dur_ns)):
+            ev: Dict[str, Any] = {
+                "name": e.name,
+                "cat": e.cat,
+                "ph": "X",
+                "ts": e.start_ns / 1e3,
+                "dur": e.dur_ns / 1e3,
+                "pid": pid,
+                "tid": e.tid,
+            }
+            if e.args:
+                ev["args"] = e.args
+            events.append(ev)
+        if self.counters:
+            end = max((e.start_ns + e.dur_ns for e in self.events), default=0)
+            events.append({"name": "counters", "ph": "C", "ts": end / 1e3, "pid": pid, "args": dict(self.counters)})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "summary": self.to_json()}
+
+    def write(self, path: Path) -> None:
+        """Write the Chrome trace (with the summary embedded) as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()) + "\n", encoding="utf-8")
+
+
+def span(name: str, cat: str = "phase", **args: Any) -> ContextManager[None]:
+    """Phase-level span on the active tracer; a shared no-op context when tracing is off."""
+    tracer = active
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, **args)
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Make tracer (a new one by default) the active tracer for the duration of the block."""
+    global active
+    tracer = tracer if tracer is not None else Tracer()
+    previous, active = active, tracer
+    try:
+        yield tracer
+    finally:
+        active = previous
+
+
+@contextmanager
+def tracing_from_env() -> Iterator[Optional[Tracer]]:
+    """Trace the block and write it to $PTBL_TRACE when that is set; otherwise do nothing."""
+    target = os.environ.get(TRACE_ENV, "")
+    if not target:
+        yield None
+        return
+    with tracing() as tracer:
+        try:
+            yield tracer
+        finally:
+            tracer.write(Path(target))
@@ -0,0 +1,475 @@
+"""Watch mode: keep a resolved workspace warm in memory and serve it over a Unix socket.
+
+Usage:
+  python -m ptbl.workspace.watch <root> [--socket PATH] [--mode dev] [--poll]
+
+Each re-resolution is printed to stdout as one JSON line. Socket clients send one
+JSON request per line and get one JSON response per line:
+  {"op": "ping"}
+  {"op": "resolve", "mode": "dev"}
+  {"op": "shutdown"}
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ptbl.workspace.fs import scan_dir_stat
+from ptbl.workspace.incremental import IncrementalResolver, diff_items
+from ptbl.workspace.resolver import resolved_item_to_dict
+
+
+WATCHED_FILES = ("app.ptbl", "lock.ptbl")
+WATCHED_DIRS = ("modules", "integrations")
+
+# Collect follow-up events for this long after the first one (editors save in bursts)
+DEFAULT_SETTLE_S = 0.02
+
+
+def _is_relevant(root: Path, path: Path) -> bool:
+    if path.parent == root:
+        return path.name in WATCHED_FILES
+    return path.parent.parent == root and path.parent.name in WATCHED_DIRS and path.suffix == ".ptbl"
+
+
+# ---- file watchers ----------------------------------------------------------
+
+
+class PollingWatcher:
+    """Portable watcher: compares (mtime_ns, size, inode) snapshots of the watched files."""
+
+    def __init__(self, root: Path, *, interval: float = 0.1):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int, int]]:
+        snap: Dict[Path, Tuple[int, int, int]] = {}
+        for name in WATCHED_FILES:
+            p = self.root / name
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            snap[p] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        for d in WATCHED_DIRS:
+            for entry in scan_dir_stat(self.root / d, "*.ptbl"):
+                snap[entry.path] = (entry.mtime_ns, entry.size, entry.ino)
+        return snap
+
+    def poll(self, timeout: float) -> Tuple[Set[Path], bool]:
+        """Wait up to `timeout` seconds; return (changed paths, rescan_needed)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            snap = self._scan()
+            changed = {p for p in snap.keys() | self._snapshot.keys() if snap.get(p) != self._snapshot.get(p)}
+            self._snapshot = snap
+            if changed or time.monotonic() >= deadline:
+                return changed, False
+            time.sleep(min(self.interval, max(0.0, deadline - time.monotonic())))
+
+    def close(self) -> None:
+        pass
+
+
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_FILE_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_DIR_MASK = _FILE_MASK | _IN_DELETE_SELF | _IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (via libc). Raises OSError where inotify is unavailable."""
+
+    def __init__(self, root: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self._fd = fd
+        self._dirs: Dict[int, Path] = {}
+        self._add_watch(root)
+        for d in WATCHED_DIRS:
+            if (root / d).is_dir():
+                self._add_watch(root / d)
+
+    def _add_watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), _DIR_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def poll(self, timeout: float) -> Tuple[Set[Path], bool]:
+        changed: Set[Path] = set()
+        rescan = False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed, rescan
+
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                base = self._dirs.get(wd)
+                if base is None or not name:
+                    if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                        rescan = True
+                    continue
+
+                path = base / os.fsdecode(name)
+                if mask & _IN_ISDIR:
+                    # modules/ or integrations/ appeared or went away
+                    if base == self.root and path.name in WATCHED_DIRS:
+                        if mask & (_IN_CREATE | _IN_MOVED_TO) and path.is_dir():
+                            self._add_watch(path)
+                        rescan = True
+                    continue
+                if _is_relevant(self.root, path):
+                    changed.add(path)
+        return changed, rescan
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(root: Path, *, force_polling: bool = False, interval: float = 0.1):
+    """inotify where available, polling otherwise."""
+    if not force_polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval=interval)
+
+
+# ---- warm state ---------------------------------------------------------------
+
+
+def _error_to_dict(e: Exception) -> Dict[str, Any]:
+    return {"type": type(e).__name__, "rule_id": getattr(e, "rule_id", None), "message": str(e)}
+
+
+class WarmWorkspace:
+    """
+    Per-mode IncrementalResolver state behind a lock.
+    A mode whose tree cannot be loaded keeps its error and is rebuilt from scratch
+    on the next change. generation counts applied change batches; results carry
+    the generation they were computed at.
+    """
+
+    def __init__(self, root: str | Path, modes: Sequence[str] = ("dev",)):
+        self.root = Path(root).resolve()
+        self._lock = threading.Lock()
+        self._resolvers: Dict[str, Optional[IncrementalResolver]] = {}
+        self._errors: Dict[str, Optional[Exception]] = {}
+        self.generation = 0
+        for mode in modes:
+            self._build(mode)
+
+    def _build(self, mode: str) -> None:
+        try:
+            self._resolvers[mode] = IncrementalResolver(self.root, mode)
+            self._errors[mode] = None
+        except Exception as e:  # ResolverError, ValueError, YAML and IO errors from the loader
+            self._resolvers[mode] = None
+            self._errors[mode] = e
+
+    def apply(self, changed: Set[Path], *, rescan: bool = False) -> List[Dict[str, Any]]:
+        """Feed file changes to every mode; returns one event dict per mode."""
+        events: List[Dict[str, Any]] = []
+        with self._lock:
+            for mode in list(self._resolvers):
+                t0 = time.perf_counter()
+                resolver = self._resolvers[mode]
+                event: Dict[str, Any] = {
+                    "event": "resolved",
+                    "mode": mode,
+                    "changed": sorted(str(p) for p in changed),
+                }
+                if resolver is None or rescan:
+                    previous = resolver.items if resolver is not None else ()
+                    self._build(mode)
+                    resolver = self._resolvers[mode]
+                    added, removed = diff_items(previous, resolver.items if resolver is not None else ())
+                else:
+                    try:
+                        delta = resolver.update(changed)
+                        added, removed = delta.added, delta.removed
+                        self._errors[mode] = None
+                    except Exception as e:
+                        self._errors[mode] = e
+                        added, removed = (), ()
+
+                error = self._errors[mode]
+                event["ok"] = error is None
+                if error is not None:
+                    event["error"] = _error_to_dict(error)
+                else:
+                    event["added"] = [i.key for i in added]
+                    event["removed"] = [i.key for i in removed]
+                event["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+                events.append(event)
+            self.generation += 1
+        return events
+
+    def result(self, mode: str) -> Dict[str, Any]:
+        with self._lock:
+            if mode not in self._resolvers:
+                if mode not in ("dev", "repro"):
+                    return {"ok": False, "mode": mode, "error": _error_to_dict(ValueError("mode must be dev or repro"))}
+                self._build(mode)
+            error = self._errors[mode]
+            if error is not None:
+                return {"ok": False, "mode": mode, "error": _error_to_dict(error), "generation": self.generation}
+            resolver = self._resolvers[mode]
+            assert resolver is not None
+            return {
+                "ok": True,
+                "mode": mode,
+                "items": [resolved_item_to_dict(i) for i in resolver.items],
+                "generation": self.generation,
+            }
+
+
+# ---- socket server ------------------------------------------------------------
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: "WatchServer" = self.server.watch  # type: ignore[attr-defined]
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                response = server.handle_request(request)
+            except Exception as e:
+                response = {"ok": False, "error": _error_to_dict(e)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if response.get("shutdown"):
+                return
+
+
+class WatchServer:
+    """Watch loop + optional Unix socket server around a WarmWorkspace."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        modes: Sequence[str] = ("dev",),
+        socket_path: Optional[str | Path] = None,
+        force_polling: bool = False,
+        poll_interval: float = 0.1,
+        settle: float = DEFAULT_SETTLE_S,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.warm = WarmWorkspace(root, modes)
+        self.root = self.warm.root
+        self.watcher = make_watcher(self.root, force_polling=force_polling, interval=poll_interval)
+        self.settle = settle
+        self.on_event = on_event
+        self.socket_path = Path(socket_path) if socket_path is not None else None
+        self._socket_ino: Optional[int] = None  # inode of the socket this server bound
+        self._stop = threading.Event()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def generation(self) -> int:
+        """Change batches applied so far."""
+        return self.warm.generation
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "root": str(self.root), "generation": self.generation}
+        if op == "resolve":
+            return self.warm.result(str(request.get("mode", "dev")))
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True, "shutdown": True}
+        return {"ok": False, "error": _error_to_dict(ValueError(f"unknown op: {op!r}"))}
+
+    def _watch_loop(self) -> None:
+        while not self._stop.is_set():
+            changed, rescan = self.watcher.poll(0.2)
+            if not changed and not rescan:
+                continue
+            # Let a burst of writes settle into one batch
+            while True:
+                more, more_rescan = self.watcher.poll(self.settle)
+                if not more and not more_rescan:
+                    break
+                changed |= more
+                rescan = rescan or more_rescan
+            for event in self.warm.apply(changed, rescan=rescan):
+                if self.on_event is not None:
+                    self.on_event(event)
+
+    def start(self) -> None:
+        if self.socket_path is not None:
+            if not hasattr(socket, "AF_UNIX"):
+                raise OSError("Unix sockets are not supported on this platform")
+            _remove_stale_socket(self.socket_path)
+            server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _RequestHandler)
+            self._socket_ino = os.stat(self.socket_path).st_ino
+            server.daemon_threads = True
+            server.watch = self  # type: ignore[attr-defined]
+            self._server = server
+            st = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True)
+            st.start()
+            self._threads.append(st)
+
+        t = threading.Thread(target=self._watch_loop, name="ptbl-watch", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def wait(self) -> None:
+        while not self._stop.wait(0.5):
+            pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.socket_path is not None and self._owns_socket():
+                self.socket_path.unlink()
+        for t in self._threads:
+            t.join(timeout=2)
+        self.watcher.close()
+
+    def _owns_socket(self) -> bool:
+        """True while socket_path is still the socket this server bound (not a successor's)."""
+        assert self.socket_path is not None
+        try:
+            st = os.lstat(self.socket_path)
+        except OSError:
+            return False
+        return stat.S_ISSOCK(st.st_mode) and st.st_ino == self._socket_ino
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """
+    Unlink path if it is a socket nobody listens on (left by a server that died).
+    Anything else there, a live server's socket or a non-socket file, raises OSError.
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError(errno.EADDRINUSE, "socket path already in use (not a socket)", str(path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except ConnectionRefusedError:
+            path.unlink()
+            return
+        except FileNotFoundError:
+            return
+    raise OSError(errno.EADDRINUSE, "socket path already in use by a running server", str(path))
+
+
+def query(socket_path: str | Path, request: Dict[str, Any], *, timeout: float = 30.0) -> Dict[str, Any]:
+    """Send one request to a running watch server and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(socket_path))
+        s.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(1 << 16)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf.decode("utf-8"))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m ptbl.workspace.watch")
+    p.add_argument("root", help="Workspace root")
+    p.add_argument("--mode", action="append", choices=["dev", "repro"], help="Mode(s) to keep warm (default: dev)")
+    p.add_argument("--socket", default=None, help="Serve requests on this Unix socket path")
+    p.add_argument("--poll", action="store_true", default=False, help="Force the polling watcher")
+    p.add_argument("--poll-interval", type=float, default=0.1)
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    def emit(event: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    server = WatchServer(
+        args.root,
+        modes=args.mode or ["dev"],
+        socket_path=args.socket,
+        force_polling=args.poll,
+        poll_interval=args.poll_interval,
+        on_event=emit,
+    )
+    for mode in args.mode or ["dev"]:
+        emit({"event": "ready", **server.warm.result(mode)})
+    server.start()
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""Benchmark: resolving many workspace roots that share module files.
+
+Each root holds copies of the same `--shared` modules plus its own entry module.
+The script compares load_workspace + resolve_workspace called once per root
+against resolve_many(), which parses every distinct file once.
+
+Usage (from repo root):
+  python -m tests.bench.bench_batch_resolve --roots 50 --shared 200 --workers 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from ptbl.workspace.batch import resolve_many
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import WorkspaceShape, generate_modules, local_import, write_workspace
+
+
+def build_roots(base: Path, roots: int, shared: int) -> List[Path]:
+    modules, shared_entries, lock = generate_modules(WorkspaceShape(modules=shared), seed=0)
+    template = write_workspace(base / "template", modules, entry_modules=shared_entries, lock_resolved=lock)
+    out = []
+    for i in range(roots):
+        root = base / f"app{i:04d}"
+        shutil.copytree(template / "modules", root / "modules")
+        shutil.copyfile(template / "lock.ptbl", root / "lock.ptbl")
+        # Own entry module importing the shared entry modules
+        app = f"app{i:04d}"
+        write_workspace(root, {app: [local_import(m) for m in shared_entries]}, entry_modules=[app])
+        out.append(root)
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--roots", type=int, default=50)
+    p.add_argument("--shared", type=int, default=200, help="Shared modules per root")
+    p.add_argument("--workers", nargs="*", type=int, default=[1, 4])
+    p.add_argument("--mode", choices=["dev", "repro"], default="repro")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tempfile.TemporaryDirectory() as td:
+        roots = build_roots(Path(td), args.roots, args.shared)
+
+        t0 = time.perf_counter()
+        expected = [resolve_workspace(load_workspace(r), args.mode) for r in roots]
+        t_loop = time.perf_counter() - t0
+        print(f"{'per-root loop':>22}: {t_loop:8.3f}s")
+
+        for executor in ("thread", "process"):
+            for w in args.workers:
+                t0 = time.perf_counter()
+                results = resolve_many(roots, args.mode, workers=w, executor=executor)
+                dt = time.perf_counter() - t0
+                assert [r.unwrap() for r in results] == expected
+                print(f"{f'resolve_many {executor} x{w}':>22}: {dt:8.3f}s ({t_loop / dt:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Benchmark: os.scandir directory scans (ptbl.workspace.fs) against glob/rglob + is_file().
+
+Times, for a modules/ directory of N files and a tree of the same size:
+  - the previous _sorted_glob (glob + is_file + sort) vs scan_dir
+  - the same plus a stat() per file (watcher, cache prune) vs scan_dir_stat
+  - the previous harness walk (rglob + is_file + sort) vs scan_tree
+
+Usage (from repo root):
+  python -m tests.bench.bench_dir_scan --sizes 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from ptbl.workspace.fs import scan_dir, scan_dir_stat, scan_tree
+
+
+def legacy_sorted_glob(dir_path: Path, pattern: str):
+    if not dir_path.exists():
+        return []
+    return sorted([p for p in dir_path.glob(pattern) if p.is_file()], key=lambda p: str(p).lower())
+
+
+def legacy_glob_stat(dir_path: Path, pattern: str):
+    return [(p, p.stat()) for p in legacy_sorted_glob(dir_path, pattern)]
+
+
+def legacy_tree_files(root: Path):
+    return sorted([p for p in root.rglob("*") if p.is_file()], key=lambda x: x.as_posix())
+
+
+def _populate(root: Path, n: int) -> None:
+    modules = root / "modules"
+    modules.mkdir(parents=True)
+    for i in range(n):
+        (modules / f"Mod_{i:06d}.ptbl").write_bytes(b"module_id: m\n")
+    for i in range(max(1, n // 100)):  # non-matching neighbours
+        (modules / f"notes_{i}.txt").write_bytes(b"")
+    tree = root / "tree"
+    for i in range(n):
+        d = tree / f"d{i % 50:02d}" / f"e{i % 7}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"f{i}.json").write_bytes(b"{}")
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def run(sizes: Sequence[int], repeat: int) -> None:
+    print(f"{'files':>7} {'glob_s':>8} {'scan_s':>8} {'glob+st_s':>9} {'scan+st_s':>9} {'rglob_s':>8} {'tree_s':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            _populate(root, n)
+            modules, tree = root / "modules", root / "tree"
+            assert scan_dir(modules, "*.ptbl") == legacy_sorted_glob(modules, "*.ptbl")
+            assert scan_tree(tree) == legacy_tree_files(tree)
+            row = [
+                _best(lambda: legacy_sorted_glob(modules, "*.ptbl"), repeat),
+                _best(lambda: scan_dir(modules, "*.ptbl"), repeat),
+                _best(lambda: legacy_glob_stat(modules, "*.ptbl"), repeat),
+                _best(lambda: scan_dir_stat(modules, "*.ptbl"), repeat),
+                _best(lambda: legacy_tree_files(tree), repeat),
+                _best(lambda: scan_tree(tree), repeat),
+            ]
+            print(f"{n:>7} " + " ".join(f"{t:>{w}.4f}" for t, w in zip(row, (8, 8, 9, 9, 8, 8))))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", nargs="*", type=int, default=[1000, 10000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(list(argv) if argv is not None else None)
+    run(args.sizes, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
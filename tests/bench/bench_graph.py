@@ -0,0 +1,66 @@
+"""Benchmark: dependency graph from resolve_with_graph() and its queries.
+
+Times resolve_workspace() against resolve_with_graph() (the graph's build cost),
+then per-query costs on the graph: direct and transitive dependents of a
+package, and transitive dependencies of an entry module, versus re-resolving.
+
+Usage (from repo root):
+  python -m tests.bench.bench_graph --sizes 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_with_graph, resolve_workspace
+from tests.bench.synth import WorkspaceShape, generate_workspace
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def run(sizes: Sequence[int], repeat: int) -> None:
+    print(f"{'modules':>8} {'edges':>8} {'resolve_s':>10} {'with_graph_s':>12} "
+          f"{'direct_us':>10} {'dependents*_ms':>14} {'deps*_ms':>9}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as td:
+            root = generate_workspace(Path(td), WorkspaceShape(modules=n, diamond_density=0.5), seed=0)
+            ws = load_workspace(root)
+            t_resolve = _best(lambda: resolve_workspace(ws, "dev"), repeat)
+            t_graph = _best(lambda: resolve_with_graph(ws, "dev"), repeat)
+            _items, graph = resolve_with_graph(ws, "dev")
+
+            package = max(
+                (k for k in graph.keys if not k.startswith("module:")), key=lambda k: len(graph.dependents(k))
+            )
+            entry = graph.keys[graph.entries[0]]
+            t_direct = _best(lambda: graph.dependents(package), repeat)
+            # The memo is cleared each time so the transitive walk is measured, not the lookup
+            t_dependents = _best(lambda: (graph._reach.clear(), graph.dependents(package, transitive=True)), repeat)
+            t_deps = _best(lambda: (graph._reach.clear(), graph.dependencies(entry, transitive=True)), repeat)
+            print(f"{n:>8} {graph.edge_count:>8} {t_resolve:>10.3f} {t_graph:>12.3f} "
+                  f"{t_direct * 1e6:>10.1f} {t_dependents * 1e3:>14.2f} {t_deps * 1e3:>9.2f}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", nargs="*", type=int, default=[1000, 10000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(list(argv) if argv is not None else None)
+    run(args.sizes, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""Benchmark: local-import lookup in resolve_workspace.
+
+Compares the precomputed Workspace.module_index lookup against the previous
+per-import scan over workspace.modules (one resolve() per module per import).
+The indexed path should grow linearly with N; the scan grows quadratically.
+
+Usage (from repo root):
+  python -m tests.bench.bench_local_import_index --sizes 250 500 1000 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ptbl.workspace.loader import Workspace, load_workspace
+from ptbl.workspace.resolver import _resolve_local_path, resolve_workspace
+from tests.bench.synth import tree_workspace
+
+
+def legacy_scan_lookups(ws: Workspace) -> int:
+    """Replay the pre-index lookup: scan all modules for every local import."""
+    found = 0
+    for spec in ws.modules.values():
+        for imp in spec.imports:
+            if imp.source != "local":
+                continue
+            abs_path = _resolve_local_path(ws, imp.path or "")
+            for _mid, mspec in ws.modules.items():
+                if mspec.file_path.resolve() == abs_path:
+                    found += 1
+                    break
+    return found
+
+
+def run(sizes: Sequence[int], *, skip_legacy_above: int) -> None:
+    print(f"{'modules':>8} {'load_s':>8} {'resolve_s':>10} {'us/module':>10} {'legacy_scan_s':>14}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as td:
+            root = tree_workspace(Path(td), n)
+
+            t0 = time.perf_counter()
+            ws = load_workspace(root)
+            t_load = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            items = resolve_workspace(ws, mode="dev")
+            t_resolve = time.perf_counter() - t0
+            assert len(items) == n
+
+            legacy = "skipped"
+            if n <= skip_legacy_above:
+                t0 = time.perf_counter()
+                legacy_scan_lookups(ws)
+                legacy = f"{time.perf_counter() - t0:.3f}"
+
+            print(f"{n:>8} {t_load:>8.3f} {t_resolve:>10.4f} {t_resolve / n * 1e6:>10.1f} {legacy:>14}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", nargs="*", type=int, default=[250, 500, 1000, 2000])
+    p.add_argument("--skip-legacy-above", type=int, default=2000, help="Skip the quadratic scan for larger N")
+    args = p.parse_args(list(argv) if argv is not None else None)
+    run(args.sizes, skip_legacy_above=args.skip_legacy_above)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
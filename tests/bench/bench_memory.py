@@ -0,0 +1,96 @@
+"""Benchmark: memory held by a loaded and resolved workspace (tracemalloc).
+
+Reports bytes per module retained by load_workspace() and resolve_workspace().
+Each run is appended to a JSONL history (default tests/_out/bench_memory.jsonl)
+and compared against the previous entry, so regressions show up over time.
+
+Usage (from repo root):
+  python -m tests.bench.bench_memory --modules 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import flat_workspace
+
+DEFAULT_HISTORY = Path("tests/_out/bench_memory.jsonl")
+
+
+def _git_rev() -> str:
+    try:
+        cp = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return cp.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _retained(fn) -> tuple[Any, int]:
+    """Run fn() and return (result, bytes still allocated while result is alive)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def measure(root: Path, modules: int, mode: str = "dev") -> Dict[str, Any]:
+    ws, ws_bytes = _retained(lambda: load_workspace(root))
+    items, items_bytes = _retained(lambda: resolve_workspace(ws, mode))
+    return {
+        "modules": modules,
+        "imports_per_module": sum(len(s.imports) for s in ws.modules.values()) / max(1, len(ws.modules)),
+        "workspace_bytes_per_module": round(ws_bytes / modules, 1),
+        "resolved_items": len(items),
+        "resolved_bytes_per_item": round(items_bytes / max(1, len(items)), 1),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--modules", type=int, default=5000)
+    p.add_argument("--registry-deps", type=int, default=8)
+    p.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSONL history file ('' to disable)")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tempfile.TemporaryDirectory() as td:
+        root = flat_workspace(Path(td) / "ws", args.modules, registry_deps=args.registry_deps)
+        row = measure(root, args.modules)
+
+    row = {"ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "rev": _git_rev(), **row}
+    print(json.dumps(row))
+
+    if str(args.history):
+        prev = None
+        if args.history.exists():
+            for line in args.history.read_text(encoding="utf-8").splitlines():
+                entry = json.loads(line)
+                if entry.get("modules") == row["modules"]:
+                    prev = entry
+        if prev is not None:
+            for k in ("workspace_bytes_per_module", "resolved_bytes_per_item"):
+                delta = row[k] - prev[k]
+                print(f"{k}: {row[k]:.1f} ({delta:+.1f} vs {prev['rev']} at {prev['ts']})")
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+"""Benchmark: load_workspace with 1/2/4/8 parse workers.
+
+Usage (from repo root):
+  python -m tests.bench.bench_parallel_load --modules 5000 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ptbl.workspace.loader import load_workspace
+from tests.bench.synth import flat_workspace
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--modules", type=int, default=5000)
+    p.add_argument("--workers", nargs="*", type=int, default=[1, 2, 4, 8])
+    p.add_argument("--executors", nargs="*", default=["thread", "process"], choices=["thread", "process"])
+    p.add_argument("--repeat", type=int, default=1)
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    print(f"cpus={os.cpu_count()} modules={args.modules}")
+    with tempfile.TemporaryDirectory() as td:
+        root = flat_workspace(Path(td), args.modules)
+        baseline = load_workspace(root)
+
+        print(f"{'executor':>8} {'workers':>7} {'best_s':>8} {'speedup':>8}")
+        t_seq: Optional[float] = None
+        for executor in args.executors:
+            for w in args.workers:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    ws = load_workspace(root, workers=w, executor=executor)
+                    best = min(best, time.perf_counter() - t0)
+                assert ws == baseline
+                if w == 1 and t_seq is None:
+                    t_seq = best
+                speedup = (t_seq / best) if t_seq else 1.0
+                print(f"{executor:>8} {w:>7} {best:>8.3f} {speedup:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+"""Benchmark: cold vs warm load_workspace with a persistent ParseCache.
+
+Usage (from repo root):
+  python -m tests.bench.bench_parse_cache --modules 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ptbl.workspace.cache import ParseCache
+from ptbl.workspace.loader import load_workspace
+from tests.bench.synth import flat_workspace
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--modules", type=int, default=2000)
+    p.add_argument("--yaml-loader", default=None, choices=["auto", "c", "pure"])
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tempfile.TemporaryDirectory() as td:
+        root = flat_workspace(Path(td) / "ws", args.modules)
+        cache_dir = Path(td) / "cache"
+
+        t0 = time.perf_counter()
+        baseline = load_workspace(root, yaml_loader=args.yaml_loader)
+        t_nocache = time.perf_counter() - t0
+
+        for label in ("cold", "warm", "warm"):
+            cache = ParseCache(cache_dir)
+            t0 = time.perf_counter()
+            ws = load_workspace(root, yaml_loader=args.yaml_loader, cache=cache)
+            dt = time.perf_counter() - t0
+            assert ws == baseline
+            print(f"{label:>5} {dt:8.3f}s (no cache {t_nocache:.3f}s) stats={cache.stats.as_dict()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Benchmark: memoized local import path checks (ptbl.workspace.paths.LocalPathCache).
+
+For a synthetic workspace, times the loader check + resolver resolve of every
+local import path, uncached (a resolve() of root and path per call, as before)
+against one LocalPathCache per workspace, then resolve_workspace() with and
+without the workspace's cache.
+
+Usage (from repo root):
+  python -m tests.bench.bench_path_cache --sizes 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.paths import LocalPathCache, resolve_local_path, validate_local_relpath
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import WorkspaceShape, generate_workspace
+
+
+def _local_paths(ws) -> List[str]:
+    return [imp.path for spec in ws.modules.values() for imp in spec.imports if imp.source == "local"]
+
+
+def run(sizes: Sequence[int], repeat: int) -> None:
+    print(f"{'modules':>8} {'imports':>8} {'checks_s':>9} {'cached_s':>9} {'resolve_s':>10} {'cached_s':>9}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as td:
+            root = generate_workspace(Path(td), WorkspaceShape(modules=n, diamond_density=0.5), seed=0)
+            ws = load_workspace(root)
+            paths = _local_paths(ws)
+
+            def best(fn) -> float:
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    fn()
+                    times.append(time.perf_counter() - t0)
+                return min(times)
+
+            def uncached() -> None:
+                for p in paths:
+                    resolve_local_path(ws.root, validate_local_relpath(ws.root, p))
+
+            def cached() -> None:
+                cache = LocalPathCache(ws.root)
+                for p in paths:
+                    cache.resolve(cache.validate(p))
+
+            plain_ws = replace(ws, path_cache=None)
+            t_checks, t_cached = best(uncached), best(cached)
+            t_resolve = best(lambda: resolve_workspace(plain_ws, "dev"))
+            t_resolve_cached = best(lambda: resolve_workspace(replace(ws, path_cache=LocalPathCache(ws.root)), "dev"))
+            print(
+                f"{n:>8} {len(paths):>8} {t_checks:>9.3f} {t_cached:>9.3f} {t_resolve:>10.3f} {t_resolve_cached:>9.3f}"
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", nargs="*", type=int, default=[1000, 5000])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(list(argv) if argv is not None else None)
+    run(args.sizes, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Benchmark: dedupe and sort at the tail of resolve_workspace.
+
+Compares the current resolver (items shared across modules, deduplicated on
+insertion, sort keys computed once) against a replay of the previous tail: a
+fresh ResolvedItem for every import in every module, all collected in one
+list, then deduplicated through a seen set and sorted by a lambda on
+(kind, key.lower()).
+
+Usage (from repo root):
+  python -m tests.bench.bench_resolve_dedupe --modules 1000 --deps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Tuple
+
+from ptbl.workspace.loader import Workspace, load_workspace
+from ptbl.workspace.resolver import (
+    ResolvedItem,
+    _compile_module,
+    _entry_modules_from_app,
+    _compile_lock,
+    resolve_workspace,
+)
+from tests.bench.synth import shared_deps_workspace
+
+
+def legacy_resolve(ws: Workspace, mode: str) -> List[ResolvedItem]:
+    """Previous tail; valid for workspaces without local imports (walk order == entry order)."""
+    lock = _compile_lock(ws, mode)
+    resolved_items: List[ResolvedItem] = []
+    for mid in _entry_modules_from_app(ws):
+        compiled = _compile_module(ws, ws.modules[mid], mode, lock, ws.module_index)
+        resolved_items.extend(arg for op, arg in compiled.steps if op == "item")
+
+    seen: Set[Tuple[str, str]] = set()
+    unique: List[ResolvedItem] = []
+    for item in resolved_items:
+        k = (item.kind, item.key)
+        if k in seen:
+            continue
+        seen.add(k)
+        unique.append(item)
+    return sorted(unique, key=lambda x: (x.kind, x.key.lower()))
+
+
+def _measure(fn, repeat: int) -> Tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--modules", type=int, default=1000)
+    p.add_argument("--deps", type=int, default=50)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    with tempfile.TemporaryDirectory() as td:
+        ws = load_workspace(shared_deps_workspace(Path(td) / "ws", args.modules, deps=args.deps))
+
+    assert legacy_resolve(ws, "dev") == resolve_workspace(ws, "dev")
+    print(f"{args.modules} modules x {args.deps} shared registry deps")
+    print(f"{'variant':>8} {'best_s':>8} {'peak_kib':>9}")
+    for label, fn in (("legacy", lambda: legacy_resolve(ws, "dev")), ("current", lambda: resolve_workspace(ws, "dev"))):
+        best, peak = _measure(fn, args.repeat)
+        print(f"{label:>8} {best:>8.4f} {peak / 1024:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Benchmark: load and resolve time and peak memory across workspace sizes, checked against budgets.
+
+Workspaces come from tests.bench.synth.generate_workspace() with the shape and
+seed in the budgets file (default tests/bench/budgets.json). Each size gets its
+own budget. Any measurement above it is reported and the exit status is 1.
+Rows are appended to a JSONL history (default tests/_out/bench_scaling.jsonl).
+
+Times are the best of --repeat runs. Peak memory comes from a separate
+tracemalloc pass over load + resolve (dev).
+
+Usage (from repo root):
+  python -m tests.bench.bench_scaling                       # every size in the budgets file
+  python -m tests.bench.bench_scaling --sizes 10 100 1000   # a subset
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.bench_memory import _git_rev
+from tests.bench.synth import WorkspaceShape, generate_workspace
+
+DEFAULT_BUDGETS = Path(__file__).with_name("budgets.json")
+DEFAULT_HISTORY = Path("tests/_out/bench_scaling.jsonl")
+# Above this size every measurement is taken once, whatever --repeat says
+SINGLE_RUN_FROM = 10_000
+
+
+def load_budgets(path: Path) -> Dict[str, Any]:
+    cfg = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(cfg.get("sizes"), dict) or not cfg["sizes"]:
+        raise ValueError(f"{path}: 'sizes' must map module counts to budgets")
+    return cfg
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(root: Path, modules: int, repeat: int) -> Dict[str, Any]:
+    if modules >= SINGLE_RUN_FROM:
+        repeat = 1
+    ws = load_workspace(root)
+    row: Dict[str, Any] = {
+        "modules": modules,
+        "load_s": round(_best(lambda: load_workspace(root), repeat), 4),
+        "resolve_dev_s": round(_best(lambda: resolve_workspace(ws, "dev"), repeat), 4),
+        "resolve_repro_s": round(_best(lambda: resolve_workspace(ws, "repro"), repeat), 4),
+        "resolved_items": len(resolve_workspace(ws, "dev")),
+    }
+    del ws
+    row["peak_mib"] = round(_peak_bytes(lambda: resolve_workspace(load_workspace(root), "dev")) / 2**20, 2)
+    return row
+
+
+def over_budget(row: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """One message per measurement in row that exceeds its budget."""
+    return [
+        f"{row['modules']} modules: {key} {row[key]} > budget {limit}"
+        for key, limit in budget.items()
+        if key in row and row[key] > limit
+    ]
+
+
+def run(sizes: Sequence[int], budgets: Dict[str, Any], *, repeat: int = 3) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Measure each size; returns (rows, budget violations)."""
+    shape_fields = dict(budgets.get("shape") or {})
+    seed = int(budgets.get("seed", 0))
+    rows: List[Dict[str, Any]] = []
+    failures: List[str] = []
+    for n in sizes:
+        shape = WorkspaceShape(**{**shape_fields, "modules": n})
+        with tempfile.TemporaryDirectory() as td:
+            root = generate_workspace(Path(td) / "ws", shape, seed=seed)
+            row = measure(root, n, repeat)
+        rows.append(row)
+        budget = budgets["sizes"].get(str(n))
+        if budget is None:
+            failures.append(f"{n} modules: no budget configured")
+        else:
+            failures.extend(over_budget(row, budget))
+    return rows, failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS)
+    p.add_argument("--sizes", nargs="*", type=int, default=None, help="Module counts (default: all sizes in the budgets file)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--history", default=str(DEFAULT_HISTORY), help="JSONL history file ('' to disable)")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    budgets = load_budgets(args.budgets)
+    sizes = args.sizes or sorted(int(n) for n in budgets["sizes"])
+    rows, failures = run(sizes, budgets, repeat=max(1, args.repeat))
+
+    print(f"{'modules':>8} {'load_s':>8} {'dev_s':>8} {'repro_s':>8} {'peak_mib':>9} {'items':>8}")
+    for row in rows:
+        print(
+            f"{row['modules']:>8} {row['load_s']:>8.3f} {row['resolve_dev_s']:>8.3f} "
+            f"{row['resolve_repro_s']:>8.3f} {row['peak_mib']:>9.1f} {row['resolved_items']:>8}"
+        )
+
+    if args.history:
+        history = Path(args.history)
+        stamp = {"ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "rev": _git_rev()}
+        history.parent.mkdir(parents=True, exist_ok=True)
+        with history.open("a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({**stamp, **row}) + "\n")
+
+    for msg in failures:
+        print(f"OVER BUDGET: {msg}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
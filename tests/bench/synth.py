@@ -0,0 +1,185 @@
+"""Synthetic PTBL workspaces for benchmarks and stress tests.
+
+Workspaces are written to disk in the standard layout (app.ptbl, lock.ptbl,
+modules/*.ptbl) so they exercise the real load_workspace() path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+
+def write_workspace(
+    root: Path,
+    modules: Dict[str, Sequence[Dict[str, Any]]],
+    *,
+    entry_modules: Sequence[str],
+    lock_resolved: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Write a workspace: one modules/<module_id>.ptbl file per module."""
+    modules_dir = root / "modules"
+    modules_dir.mkdir(parents=True, exist_ok=True)
+
+    (root / "app.ptbl").write_text(
+        yaml.safe_dump({"entry_modules": list(entry_modules)}, sort_keys=False), encoding="utf-8"
+    )
+    if lock_resolved is not None:
+        (root / "lock.ptbl").write_text(
+            yaml.safe_dump({"resolved": lock_resolved}, sort_keys=False), encoding="utf-8"
+        )
+
+    for module_id, imports in modules.items():
+        doc = {"module_id": module_id, "imports": list(imports)}
+        (modules_dir / f"{module_id}.ptbl").write_text(yaml.safe_dump(doc, sort_keys=False), encoding="utf-8")
+
+    return root
+
+
+def local_import(module_id: str) -> Dict[str, Any]:
+    return {"source": "local", "path": f"modules/{module_id}.ptbl"}
+
+
+def module_name(i: int) -> str:
+    return f"m{i:06d}"
+
+
+def tree_workspace(root: Path, n: int) -> Path:
+    """N modules arranged as a binary tree rooted at module 0 (depth ~log2 N)."""
+    modules: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(n):
+        children = [c for c in (2 * i + 1, 2 * i + 2) if c < n]
+        modules[module_name(i)] = [local_import(module_name(c)) for c in children]
+    return write_workspace(root, modules, entry_modules=[module_name(0)], lock_resolved={})
+
+
+def registry_import(name: str, version: str) -> Dict[str, Any]:
+    return {"source": "registry", "name": name, "version": version}
+
+
+def flat_workspace(root: Path, n: int, *, registry_deps: int = 8) -> Path:
+    """N independent entry modules, each importing `registry_deps` registry packages."""
+    modules: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(n):
+        modules[module_name(i)] = [registry_import(f"pkg{(i + k) % 97:03d}", "1.0") for k in range(registry_deps)]
+    return write_workspace(root, modules, entry_modules=list(modules), lock_resolved={})
+
+
+def shared_deps_workspace(root: Path, n: int, *, deps: int = 50) -> Path:
+    """N entry modules that all import the same `deps` registry packages."""
+    shared = [registry_import(f"pkg{k:03d}", "1.0") for k in range(deps)]
+    modules = {module_name(i): shared for i in range(n)}
+    return write_workspace(root, modules, entry_modules=list(modules), lock_resolved={})
+
+
+def chain_workspace(root: Path, n: int) -> Path:
+    """N modules in one local-import chain: m0 -> m1 -> ... -> m(N-1)."""
+    modules: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(n):
+        modules[module_name(i)] = [local_import(module_name(i + 1))] if i + 1 < n else []
+    return write_workspace(root, modules, entry_modules=[module_name(0)], lock_resolved={})
+
+
+def fanout_workspace(root: Path, width: int) -> Path:
+    """One entry module importing `width` leaf modules directly."""
+    modules: Dict[str, List[Dict[str, Any]]] = {module_name(0): [local_import(module_name(i)) for i in range(1, width + 1)]}
+    for i in range(1, width + 1):
+        modules[module_name(i)] = []
+    return write_workspace(root, modules, entry_modules=[module_name(0)], lock_resolved={})
+
+
+@dataclass(frozen=True)
+class WorkspaceShape:
+    """Parameters for generate_workspace(); every field has a moderate default."""
+
+    modules: int = 100
+    depth: int = 4  # layers of local imports; layer 0 holds the entry modules
+    fan_out: int = 3  # local imports per module (into the next layer)
+    diamond_density: float = 0.3  # share of local imports aimed at a few hot modules (shared children)
+    external_deps: int = 4  # registry/git/url imports per module
+    source_mix: Dict[str, float] = field(default_factory=lambda: {"registry": 0.8, "git": 0.1, "url": 0.1})
+    package_pool: int = 200  # distinct external packages to draw from
+    lock_coverage: float = 1.0  # share of the external packages pinned in lock.ptbl
+
+    def to_json(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__dataclass_fields__}
+
+
+def _external_import(source: str, n: int) -> Dict[str, Any]:
+    if source == "registry":
+        return registry_import(f"pkg{n:05d}", f"{1 + n % 3}.{n % 10}")
+    if source == "git":
+        return {"source": "git", "url": f"https://git.example.com/repo{n:05d}.git", "ref": "main"}
+    return {"source": "url", "url": f"https://dl.example.com/archive{n:05d}.tgz"}
+
+
+def _lock_entry(imp: Dict[str, Any]) -> Dict[str, Any]:
+    if imp["source"] == "registry":
+        return {f"registry:{imp['name']}": {"pinned_version": imp["version"]}}
+    digest = hashlib.sha256(imp["url"].encode("utf-8")).hexdigest()
+    if imp["source"] == "git":
+        return {f"git:{imp['url']}": {"commit": digest[:40]}}
+    return {f"url:{imp['url']}": {"sha256": digest}}
+
+
+def generate_modules(
+    shape: WorkspaceShape, *, seed: int = 0
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str], Dict[str, Any]]:
+    """(modules, entry_modules, lock_resolved) for shape; the same seed gives the same workspace.
+
+    Modules are split into `depth` layers and local imports only point from one
+    layer to the next, so the graph is acyclic and chains are `depth` long.
+    Each package always uses the same version, so no registry conflicts occur.
+    """
+    if shape.modules < 1 or shape.depth < 1:
+        raise ValueError("modules and depth must be positive")
+    r = random.Random(seed)
+    depth = min(shape.depth, shape.modules)
+    names = [module_name(i) for i in range(shape.modules)]
+    # Layer sizes: as even as possible, earlier layers take the remainder
+    base, extra = divmod(shape.modules, depth)
+    layers: List[List[str]] = []
+    start = 0
+    for d in range(depth):
+        size = base + (1 if d < extra else 0)
+        layers.append(names[start:start + size])
+        start += size
+
+    sources = sorted(shape.source_mix)
+    weights = [shape.source_mix[s] for s in sources]
+    pool = [_external_import(src, n) for n, src in enumerate(r.choices(sources, weights, k=shape.package_pool))]
+
+    modules: Dict[str, List[Dict[str, Any]]] = {}
+    used: Dict[int, Dict[str, Any]] = {}
+    for d, layer in enumerate(layers):
+        below = layers[d + 1] if d + 1 < len(layers) else []
+        hot = below[: max(1, len(below) // 10)]
+        for name in layer:
+            targets: List[str] = []
+            for _ in range(min(shape.fan_out, len(below))):
+                t = r.choice(hot) if r.random() < shape.diamond_density else r.choice(below)
+                if t not in targets:
+                    targets.append(t)
+            imports = [local_import(t) for t in targets]
+            for n in r.sample(range(len(pool)), min(shape.external_deps, len(pool))):
+                used[n] = pool[n]
+                imports.append(pool[n])
+            modules[name] = imports
+
+    lock: Dict[str, Any] = {}
+    covered = sorted(used)
+    r.shuffle(covered)
+    for n in sorted(covered[: round(len(covered) * shape.lock_coverage)]):
+        lock.update(_lock_entry(used[n]))
+    return modules, layers[0], lock
+
+
+def generate_workspace(root: Path, shape: WorkspaceShape, *, seed: int = 0) -> Path:
+    """Write a seeded synthetic workspace of the given shape (see generate_modules)."""
+    modules, entry_modules, lock = generate_modules(shape, seed=seed)
+    return write_workspace(root, modules, entry_modules=entry_modules, lock_resolved=lock)
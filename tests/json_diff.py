@@ -0,0 +1,159 @@
+"""Structural diff for JSON values (parity harness, snapshot tests).
+
+diff_json(a, b) walks both values once and reports every difference as an
+RFC 6901 JSON pointer, stopping after `limit` differences. An equal subtree
+is skipped without being descended into. It is found with one `==` and then
+confirmed by comparing canonical JSON encodings. The confirmation is needed
+because `==` treats 1, 1.0 and True as equal. Both checks run in C, and each
+equal subtree is encoded only once. Values of different Python types differ
+(int vs float vs bool), as before. Dict keys are visited in sorted order, so
+the report is deterministic.
+
+Usage as a library:
+  result = diff_json(expected, actual, limit=20)
+  assert not result, result.summary()
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DIFF_LIMIT = 50
+
+# Difference kinds
+DIFF_VALUE = "value"  # same type, different scalar value
+DIFF_TYPE = "type"  # value types differ
+DIFF_MISSING = "missing"  # present in a, absent in b
+DIFF_EXTRA = "extra"  # absent in a, present in b
+
+_MISSING = object()
+
+
+def pointer_escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _strict_equal(x: Any, y: Any) -> bool:
+    """x == y without conflating 1, 1.0 and True anywhere inside containers."""
+    if x != y:
+        return False
+    try:
+        return json.dumps(x, sort_keys=True) == json.dumps(y, sort_keys=True)
+    except (TypeError, ValueError):
+        return False
+
+
+@dataclass(frozen=True)
+class Difference:
+    pointer: str  # RFC 6901; "" is the document root
+    kind: str
+    a: Any = None
+    b: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {"pointer": self.pointer, "kind": self.kind}
+        if self.kind != DIFF_EXTRA:
+            d["a"] = self.a
+        if self.kind != DIFF_MISSING:
+            d["b"] = self.b
+        return d
+
+
+@dataclass
+class DiffResult:
+    differences: List[Difference] = field(default_factory=list)
+    truncated: bool = False  # limit reached; more differences may exist
+
+    def __bool__(self) -> bool:
+        return bool(self.differences)
+
+    def __len__(self) -> int:
+        return len(self.differences)
+
+    @property
+    def first(self) -> Optional[Difference]:
+        return self.differences[0] if self.differences else None
+
+    def count_label(self) -> str:
+        n = len(self.differences)
+        return f"{n}+" if self.truncated else str(n)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.differences),
+            "truncated": self.truncated,
+            "differences": [d.to_dict() for d in self.differences],
+        }
+
+    def summary(self) -> str:
+        if not self.differences:
+            return "no differences"
+        lines = [f"{self.count_label()} difference(s):"]
+        for d in self.differences:
+            lines.append(f"  {d.pointer or '/'} [{d.kind}] a={d.a!r} b={d.b!r}")
+        return "\n".join(lines)
+
+
+class _LimitReached(Exception):
+    pass
+
+
+def diff_json(a: Any, b: Any, *, limit: Optional[int] = DEFAULT_DIFF_LIMIT) -> DiffResult:
+    """All differences between JSON values a and b, capped at `limit` (None: no cap)."""
+    result = DiffResult()
+    if limit is not None and limit <= 0:
+        raise ValueError("limit must be positive")
+
+    def report(pointer: str, kind: str, x: Any, y: Any) -> None:
+        if limit is not None and len(result.differences) >= limit:
+            result.truncated = True
+            raise _LimitReached
+        result.differences.append(
+            Difference(pointer, kind, None if x is _MISSING else x, None if y is _MISSING else y)
+        )
+
+    # Explicit stack of (pointer, a, b); pushed in reverse so pops follow document order.
+    stack = [("", a, b)]
+    try:
+        while stack:
+            ptr, x, y = stack.pop()
+            if x is y:
+                continue
+            if x is _MISSING:
+                report(ptr, DIFF_EXTRA, x, y)
+                continue
+            if y is _MISSING:
+                report(ptr, DIFF_MISSING, x, y)
+                continue
+            if type(x) is not type(y):
+                report(ptr, DIFF_TYPE, x, y)
+                continue
+            if isinstance(x, (dict, list)):
+                if _strict_equal(x, y):
+                    continue
+            elif x == y:
+                continue
+            if isinstance(x, dict):
+                children = [
+                    (f"{ptr}/{pointer_escape(str(k))}", x.get(k, _MISSING), y.get(k, _MISSING))
+                    for k in sorted(set(x) | set(y), key=str)
+                ]
+                stack.extend(reversed(children))
+            elif isinstance(x, list):
+                n = max(len(x), len(y))
+                children = [
+                    (f"{ptr}/{i}", x[i] if i < len(x) else _MISSING, y[i] if i < len(y) else _MISSING)
+                    for i in range(n)
+                ]
+                stack.extend(reversed(children))
+            else:
+                report(ptr, DIFF_VALUE, x, y)
+    except _LimitReached:
+        pass
+    return result
+
+
+def first_difference(a: Any, b: Any) -> Optional[Difference]:
+    return diff_json(a, b, limit=1).first
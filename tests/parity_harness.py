@@ -15,21 +15,47 @@ Typical usage (once Rust CLI exists):
 
 Until Rust exists, you can self-test the harness by running Python as the "rust" side:
   python tests/parity_harness.py --fixtures neg_schema_invalid --modes interactive --oracle baseline --use-python-as-rust
+
+Batch mode:
+  A validator that supports `validate --batch` is started once and serves every
+  fixture x mode over stdin/stdout (see BatchValidator). The harness derives the
+  batch command from the command template (tokens before the first placeholder,
+  plus --batch), or takes --rust-batch-cmd. If the process does not advertise the
+  protocol on its first stdout line, the harness falls back to one subprocess per run.
 """
 
 from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import json
 import os
+import queue
 import subprocess
 import sys
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from tests.json_diff import DEFAULT_DIFF_LIMIT, diff_json
+except ImportError:  # run as a script: tests/ is sys.path[0]
+    from json_diff import DEFAULT_DIFF_LIMIT, diff_json
+
+    sys.path.insert(1, str(Path(__file__).resolve().parent.parent))
+
+from ptbl.ndjson import is_validate_ndjson, iter_ndjson, validation_result_from_records
+from ptbl.workspace.fs import scan_tree, scan_tree_stat
+
 
+# Same variable as ptbl.workspace.trace.TRACE_ENV: a validator run with it set
+# writes a timing trace (Chrome trace-event JSON) to that path.
+TRACE_ENV = "PTBL_TRACE"
 
 TIER_RANK = {"schema": 0, "semantic": 1, "policy": 2}
 SEV_RANK = {"error": 0, "warning": 1, "info": 2}
@@ -47,6 +73,14 @@ class ParityConfig:
     write_artifacts: bool
     rust_cmd_template: Optional[List[str]]  # list of tokens with placeholders
     use_baseline_as_rust: bool
+    rust_batch_cmd_template: Optional[List[str]] = None  # explicit batch command (no placeholders)
+    use_batch: bool = True  # use the batch protocol when the validator advertises it
+    jobs: int = 1  # concurrent fixture comparisons
+    fail_fast: bool = False  # stop at the first mismatch
+    hash_cache_path: Optional[Path] = None  # persistent fixture hash cache (JSON)
+    max_diffs: int = DEFAULT_DIFF_LIMIT  # differences reported per mismatch
+    determinism_runs: int = 2  # candidate runs per fixture x mode with check_determinism
+    trace: bool = False  # run validators with PTBL_TRACE and keep their traces as artifacts
 
 
 def repo_root_from_here() -> Path:
@@ -60,25 +94,112 @@ def read_json(path: Path) -> Any:
 
 def write_json(path: Path, obj: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    # Write-then-rename: concurrent or cancelled runs never leave a torn artifact
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
 
 
-def stable_dir_sha256(root: Path) -> str:
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _tree_files(root: Path) -> List[Path]:
+    """Files under root, in the sorted relative-path order stable_dir_sha256 hashes them."""
+    if not root.exists():
+        raise FileNotFoundError(root)
+    return scan_tree(root)
+
+
+def stable_dir_sha256(root: Path, files: Optional[Sequence[Path]] = None) -> str:
     """Stable content hash of a directory tree.
     Hash includes relative path + NUL + file bytes for each file, in sorted path order.
+    File contents are streamed in fixed-size chunks.
     """
     h = hashlib.sha256()
-    if not root.exists():
-        raise FileNotFoundError(root)
-    for p in sorted([p for p in root.rglob("*") if p.is_file()], key=lambda x: x.as_posix()):
+    if files is None:
+        files = _tree_files(root)
+    for p in files:
         rel = p.relative_to(root).as_posix().encode("utf-8")
         h.update(rel)
         h.update(b"\x00")
-        h.update(p.read_bytes())
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
         h.update(b"\x00")
     return h.hexdigest()
 
 
+class FixtureHasher:
+    """stable_dir_sha256 computed at most once per fixture root per run.
+
+    With cache_path, digests also persist across runs, keyed by the tree's
+    (relative path, size, mtime_ns) listing: an unchanged listing reuses the
+    stored digest without reading any file contents.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path
+        self._memo: Dict[Path, str] = {}
+        self._key_locks: Dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._persistent: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        if cache_path is not None and cache_path.exists():
+            try:
+                data = read_json(cache_path)
+                if isinstance(data, dict) and isinstance(data.get("trees"), dict):
+                    self._persistent = data["trees"]
+            except (OSError, ValueError):
+                self._persistent = {}
+
+    def digest(self, root: Path) -> str:
+        root = root.resolve()
+        with self._lock:
+            if root in self._memo:
+                return self._memo[root]
+            key_lock = self._key_locks.setdefault(root, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if root in self._memo:
+                    return self._memo[root]
+            digest = self._compute(root)
+            with self._lock:
+                self._memo[root] = digest
+            return digest
+
+    def _compute(self, root: Path) -> str:
+        if self.cache_path is None:
+            return stable_dir_sha256(root, _tree_files(root))
+
+        if not root.exists():
+            raise FileNotFoundError(root)
+        entries = scan_tree_stat(root)
+        files = [e.path for e in entries]
+        listing = hashlib.sha256()
+        for e in entries:
+            listing.update(f"{e.path.relative_to(root).as_posix()}\0{e.size}\0{e.mtime_ns}\n".encode("utf-8"))
+        listing_key = listing.hexdigest()
+
+        with self._lock:
+            entry = self._persistent.get(str(root))
+        if entry is not None and entry.get("listing_sha256") == listing_key:
+            return entry["sha256"]
+
+        digest = stable_dir_sha256(root, files)
+        with self._lock:
+            self._persistent[str(root)] = {"listing_sha256": listing_key, "sha256": digest}
+            self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        with self._lock:
+            trees = dict(sorted(self._persistent.items()))
+            self._dirty = False
+        write_json(self.cache_path, {"version": 1, "trees": trees})
+
+
 def load_fixtures(fixtures_json_path: Path) -> List[Dict[str, Any]]:
     data = read_json(fixtures_json_path)
     fixtures = data.get("fixtures", [])
@@ -149,6 +270,27 @@ def run_validator_cmd(
     max_diagnostics: int,
     cwd: Path,
 ) -> Dict[str, Any]:
+    return parse_validator_stdout(
+        *run_validator_cmd_raw(
+            cmd_template, root=root, mode=mode, schemas_dir=schemas_dir, max_diagnostics=max_diagnostics, cwd=cwd
+        )
+    )
+
+
+def run_validator_cmd_raw(
+    cmd_template: List[str],
+    *,
+    root: Path,
+    mode: str,
+    schemas_dir: Path,
+    max_diagnostics: int,
+    cwd: Path,
+    trace_path: Optional[Path] = None,
+) -> Tuple[int, str, str]:
+    """Run one validation; returns (exit_code, stdout, stderr) without parsing.
+
+    trace_path: set PTBL_TRACE for the run so the validator writes its trace there.
+    """
     # Substitute placeholders into a list of tokens
     tokens: List[str] = []
     for t in cmd_template:
@@ -161,11 +303,16 @@ def run_validator_cmd(
             )
         )
 
+    env = None
+    if trace_path is not None:
+        env = {**os.environ, TRACE_ENV: str(trace_path)}
+
     # If the template is a single string (shell fallback), run with shell=True
     if len(tokens) == 1 and (" " in tokens[0] or "\t" in tokens[0]):
         cp = subprocess.run(
             tokens[0],
             cwd=str(cwd),
+            env=env,
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -176,32 +323,291 @@ def run_validator_cmd(
         cp = subprocess.run(
             tokens,
             cwd=str(cwd),
+            env=env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             encoding="utf-8",
         )
 
-    if cp.returncode not in (0, 1):
+    return cp.returncode, cp.stdout, cp.stderr
+
+
+BATCH_PROTOCOL = "ptbl-validate-batch/1"
+BATCH_HELLO_TIMEOUT_S = 30.0
+
+
+def batch_cmd_from_template(cmd_template: List[str]) -> Optional[List[str]]:
+    """Derive `<cmd> validate --batch` from a per-run template: tokens before the first placeholder."""
+    if len(cmd_template) == 1 and (" " in cmd_template[0] or "\t" in cmd_template[0]):
+        # Shell-string fallback templates are not split; no batch form for them.
+        return None
+    prefix: List[str] = []
+    for t in cmd_template:
+        if "{" in t:
+            break
+        prefix.append(t)
+    if not prefix:
+        return None
+    return prefix + ["--batch"]
+
+
+class _StderrTail:
+    """The last lines a process wrote to stderr, plus how many lines it wrote in total."""
+
+    def __init__(self, keep: int = 200):
+        self._lines: "deque[str]" = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            self.total += 1
+
+    def since(self, mark: int) -> str:
+        """Lines written after self.total was `mark` (those still kept)."""
+        with self._lock:
+            n = min(self.total - mark, len(self._lines))
+            return "".join(list(self._lines)[len(self._lines) - n:])
+
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._lines)
+
+
+class BatchValidator:
+    """Persistent validator process speaking newline-delimited JSON over stdin/stdout.
+
+    Protocol (one JSON object per line):
+      validator -> harness, once at startup:
+        {"protocol": "ptbl-validate-batch/1"}
+      harness -> validator, per run:
+        {"id": 1, "root": "...", "mode": "interactive", "schemas_dir": "...", "max_diagnostics": 200}
+      validator -> harness, per run:
+        {"id": 1, "exit_code": 0, "stdout": "<exact text the one-shot CLI would print>", "stderr": "..."}
+        or {"id": 1, "error": "..."}
+
+    "stderr" (optional) is what the run wrote to stderr. Without it, a run's stderr
+    is whatever the process wrote to its stderr while the run was in flight.
+
+    start() returns None when the process exits or prints anything else first,
+    so callers can fall back to one subprocess per run.
+    """
+
+    def __init__(self, proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]", stderr_tail: _StderrTail):
+        self._proc = proc
+        self._lines = lines
+        self._stderr_tail = stderr_tail
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @classmethod
+    def start(
+        cls, cmd: List[str], *, cwd: Path, hello_timeout: float = BATCH_HELLO_TIMEOUT_S
+    ) -> Optional["BatchValidator"]:
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                cwd=str(cwd),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError:
+            return None
+
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        stderr_tail = _StderrTail()
+
+        def pump_stdout() -> None:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)  # EOF
+
+        def pump_stderr() -> None:
+            assert proc.stderr is not None
+            for line in proc.stderr:
+                stderr_tail.append(line)
+
+        threading.Thread(target=pump_stdout, daemon=True).start()
+        threading.Thread(target=pump_stderr, daemon=True).start()
+
+        bv = cls(proc, lines, stderr_tail)
+        try:
+            hello = json.loads(lines.get(timeout=hello_timeout) or "null")
+        except (queue.Empty, ValueError):
+            hello = None
+        if not isinstance(hello, dict) or hello.get("protocol") != BATCH_PROTOCOL:
+            bv.close()
+            return None
+        return bv
+
+    def run_raw(self, *, root: Path, mode: str, schemas_dir: Path, max_diagnostics: int) -> Tuple[int, str, str]:
+        """Run one validation; returns (exit_code, stdout, stderr) of that run only."""
+        with self._lock:
+            self._next_id += 1
+            req_id = self._next_id
+            request = {
+                "id": req_id,
+                "root": str(root),
+                "mode": mode,
+                "schemas_dir": str(schemas_dir),
+                "max_diagnostics": max_diagnostics,
+            }
+            assert self._proc.stdin is not None
+            stderr_mark = self._stderr_tail.total
+            try:
+                self._proc.stdin.write(json.dumps(request) + "\n")
+                self._proc.stdin.flush()
+            except OSError as e:
+                raise RuntimeError(f"Batch validator stdin closed: {e}\nSTDERR:\n{self.stderr()}") from e
+
+            line = self._lines.get()
+            if line is None:
+                raise RuntimeError(f"Batch validator exited unexpectedly.\nSTDERR:\n{self.stderr()}")
+            try:
+                resp = json.loads(line)
+            except ValueError as e:
+                raise RuntimeError(f"Batch validator sent a non-JSON line: {line[:2000]}") from e
+            run_stderr = self._stderr_tail.since(stderr_mark)
+
+        if not isinstance(resp, dict) or resp.get("id") != req_id:
+            raise RuntimeError(f"Batch validator response out of sequence (expected id {req_id}): {line[:2000]}")
+        if "error" in resp:
+            raise RuntimeError(f"Batch validator failed: {resp['error']}")
+        if "stderr" in resp:
+            run_stderr = str(resp["stderr"])
+        return int(resp.get("exit_code", 3)), str(resp.get("stdout", "")), run_stderr
+
+    def stderr(self) -> str:
+        """Recent stderr of the process across all runs (for crash reports)."""
+        return self._stderr_tail.text()[-2000:]
+
+    def close(self) -> None:
+        try:
+            if self._proc.stdin is not None:
+                self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
+def parse_validator_stdout(exit_code: int, stdout: str, stderr: str = "") -> Dict[str, Any]:
+    if exit_code not in (0, 1):
         raise RuntimeError(
             "Validator command failed unexpectedly.\n"
-            f"Return code: {cp.returncode}\n"
-            f"STDERR:\n{cp.stderr}"
+            f"Return code: {exit_code}\n"
+            f"STDERR:\n{stderr}"
         )
 
     try:
-        return json.loads(cp.stdout)
+        # Validators may stream `--format ndjson` (see ptbl/ndjson.py); reassemble line by line.
+        if is_validate_ndjson(stdout):
+            return validation_result_from_records(iter_ndjson(io.StringIO(stdout)))
+        return json.loads(stdout)
     except Exception as e:
         raise RuntimeError(
             "Validator did not emit valid JSON.\n"
-            f"STDOUT (first 2000 chars):\n{cp.stdout[:2000]}\n"
-            f"STDERR (first 2000 chars):\n{cp.stderr[:2000]}"
+            f"STDOUT (first 2000 chars):\n{stdout[:2000]}\n"
+            f"STDERR (first 2000 chars):\n{stderr[:2000]}"
         ) from e
 
 
+class ValidatorRunner:
+    """Runs one validator command for many fixtures: batch process if advertised, else subprocess per run.
+
+    Each calling thread gets its own batch process, so --jobs N runs N validators side by side.
+    """
+
+    def __init__(
+        self,
+        cmd_template: List[str],
+        *,
+        cwd: Path,
+        schemas_dir: Path,
+        max_diagnostics: int,
+        batch_cmd: Optional[List[str]] = None,
+        use_batch: bool = True,
+    ):
+        self.cmd_template = cmd_template
+        self.cwd = cwd
+        self.schemas_dir = schemas_dir
+        self.max_diagnostics = max_diagnostics
+        self.batch_cmd = batch_cmd if batch_cmd is not None else batch_cmd_from_template(cmd_template)
+        self._use_batch = use_batch and self.batch_cmd is not None
+        self._local = threading.local()
+        self._started: List[BatchValidator] = []
+        self._lock = threading.Lock()
+
+    @property
+    def batch_active(self) -> bool:
+        return bool(self._started)
+
+    def _batch_validator(self) -> Optional[BatchValidator]:
+        if not self._use_batch:
+            return None
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            return batch
+
+        assert self.batch_cmd is not None
+        batch = BatchValidator.start(self.batch_cmd, cwd=self.cwd)
+        with self._lock:
+            if batch is None:
+                # Not advertised: stop probing, every thread falls back to subprocess per run
+                self._use_batch = False
+                return None
+            self._started.append(batch)
+        self._local.batch = batch
+        return batch
+
+    def run(self, root: Path, mode: str, *, trace_path: Optional[Path] = None) -> Dict[str, Any]:
+        return parse_validator_stdout(*self.run_raw(root, mode, trace_path=trace_path))
+
+    def run_raw(self, root: Path, mode: str, *, trace_path: Optional[Path] = None) -> Tuple[int, str, str]:
+        """One validation as (exit_code, stdout, stderr), unparsed.
+
+        A traced run always gets its own subprocess: the environment of a batch
+        process is fixed when it starts.
+        """
+        batch = self._batch_validator() if trace_path is None else None
+        if batch is not None:
+            return batch.run_raw(
+                root=root, mode=mode, schemas_dir=self.schemas_dir, max_diagnostics=self.max_diagnostics
+            )
+        return run_validator_cmd_raw(
+            self.cmd_template,
+            root=root,
+            mode=mode,
+            schemas_dir=self.schemas_dir,
+            max_diagnostics=self.max_diagnostics,
+            cwd=self.cwd,
+            trace_path=trace_path,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            started, self._started = self._started, []
+        for batch in started:
+            batch.close()
+
+
 def normalize_result(raw: Dict[str, Any], *, ignore_validator_version: bool) -> Dict[str, Any]:
-    """Normalize a validation result for parity comparison."""
-    obj = json.loads(json.dumps(raw))  # deep copy
+    """Normalize a validation result for parity comparison.
+
+    Copy-on-write: raw is never mutated; only the containers that change are
+    copied, everything else is shared with raw.
+    """
+    obj = dict(raw)
 
     if ignore_validator_version and "validator_version" in obj:
         obj["validator_version"] = "<ignored>"
@@ -209,10 +615,12 @@ def normalize_result(raw: Dict[str, Any], *, ignore_validator_version: bool) ->
     # Normalize schema-tier message text
     diags = obj.get("diagnostics", [])
     if isinstance(diags, list):
-        for d in diags:
-            if isinstance(d, dict) and d.get("tier") == "schema":
-                if "message" in d:
-                    d["message"] = "<schema_message>"
+        diags = [
+            {**d, "message": "<schema_message>"}
+            if isinstance(d, dict) and d.get("tier") == "schema" and "message" in d
+            else d
+            for d in diags
+        ]
 
     # Deterministic sort of diagnostics (using normalized message)
     def diag_key(d: Dict[str, Any]) -> Tuple[int, int, str, str, str, str]:
@@ -245,42 +653,13 @@ def normalize_result(raw: Dict[str, Any], *, ignore_validator_version: bool) ->
     return obj
 
 
-def first_diff_path(a: Any, b: Any, path: str = "") -> Optional[str]:
-    """Return the first differing JSON path, or None if equal."""
-    if type(a) != type(b):
-        return path or "$"
-
-    if isinstance(a, dict):
-        a_keys = set(a.keys())
-        b_keys = set(b.keys())
-        if a_keys != b_keys:
-            return (path or "$") + f".<keys differ a={sorted(a_keys)} b={sorted(b_keys)}>"
-        for k in sorted(a.keys()):
-            p = f"{path}.{k}" if path else f"$.{k}"
-            d = first_diff_path(a[k], b[k], p)
-            if d is not None:
-                return d
-        return None
-
-    if isinstance(a, list):
-        if len(a) != len(b):
-            return (path or "$") + f".<len differ a={len(a)} b={len(b)}>"
-        for i, (x, y) in enumerate(zip(a, b)):
-            p = f"{path}[{i}]" if path else f"$[{i}]"
-            d = first_diff_path(x, y, p)
-            if d is not None:
-                return d
-        return None
-
-    if a != b:
-        return path or "$"
-
-    return None
-
-
 def load_oracle_baseline(
     cfg: ParityConfig, fixture_id: str, mode: str
 ) -> Dict[str, Any]:
+    return read_json(oracle_baseline_path(cfg, fixture_id, mode))
+
+
+def oracle_baseline_path(cfg: ParityConfig, fixture_id: str, mode: str) -> Path:
     path = (
         cfg.repo_root
         / "tests"
@@ -292,20 +671,30 @@ def load_oracle_baseline(
     )
     if not path.exists():
         raise FileNotFoundError(f"Missing baseline oracle file: {path}")
-    return read_json(path)
+    return path
 
 
 def run_live_python_oracle(
-    cfg: ParityConfig, fixture_root: Path, mode: str
+    cfg: ParityConfig,
+    fixture_root: Path,
+    mode: str,
+    *,
+    runner: Optional[ValidatorRunner] = None,
+    trace_path: Optional[Path] = None,
 ) -> Dict[str, Any]:
+    if runner is not None:
+        return runner.run(fixture_root, mode, trace_path=trace_path)
     cmd = python_cmd_template()
-    return run_validator_cmd(
-        cmd,
-        root=fixture_root,
-        mode=mode,
-        schemas_dir=cfg.schemas_dir,
-        max_diagnostics=cfg.max_diagnostics,
-        cwd=cfg.repo_root,
+    return parse_validator_stdout(
+        *run_validator_cmd_raw(
+            cmd,
+            root=fixture_root,
+            mode=mode,
+            schemas_dir=cfg.schemas_dir,
+            max_diagnostics=cfg.max_diagnostics,
+            cwd=cfg.repo_root,
+            trace_path=trace_path,
+        )
     )
 
 
@@ -314,64 +703,226 @@ def run_rust_candidate(
     fixture_id: str,
     fixture_root: Path,
     mode: str,
+    *,
+    runner: Optional[ValidatorRunner] = None,
+    trace_path: Optional[Path] = None,
 ) -> Dict[str, Any]:
     if cfg.use_baseline_as_rust:
         # Harness self-test mode: treat baseline oracle output as the Rust candidate.
         return load_oracle_baseline(cfg, fixture_id, mode)
+    return parse_validator_stdout(
+        *run_rust_candidate_raw(cfg, fixture_id, fixture_root, mode, runner=runner, trace_path=trace_path)
+    )
+
+
+def run_rust_candidate_raw(
+    cfg: ParityConfig,
+    fixture_id: str,
+    fixture_root: Path,
+    mode: str,
+    *,
+    runner: Optional[ValidatorRunner] = None,
+    trace_path: Optional[Path] = None,
+) -> Tuple[int, str, str]:
+    """One candidate run as (exit_code, stdout, stderr), unparsed."""
+    if cfg.use_baseline_as_rust:
+        return 0, oracle_baseline_path(cfg, fixture_id, mode).read_text(encoding="utf-8"), ""
 
     if cfg.rust_cmd_template is None:
         raise ValueError(
             "Rust command not configured. Provide --rust-cmd. (Tip: --use-python-as-rust makes the Rust side read baseline artifacts for a quick self-test.)"
         )
-    return run_validator_cmd(
+    if runner is not None:
+        return runner.run_raw(fixture_root, mode, trace_path=trace_path)
+    return run_validator_cmd_raw(
         cfg.rust_cmd_template,
         root=fixture_root,
         mode=mode,
         schemas_dir=cfg.schemas_dir,
         max_diagnostics=cfg.max_diagnostics,
         cwd=cfg.repo_root,
+        trace_path=trace_path,
     )
 
 
+DIVERGENCE_CONTEXT_BYTES = 40
+_DIVERGENCE_BLOCK = 4096
+
+
+def first_byte_divergence(a: bytes, b: bytes) -> Optional[int]:
+    """Offset of the first differing byte (or of the shorter end), None if equal."""
+    if a == b:
+        return None
+    n = min(len(a), len(b))
+    for start in range(0, n, _DIVERGENCE_BLOCK):
+        end = min(start + _DIVERGENCE_BLOCK, n)
+        if a[start:end] != b[start:end]:
+            for i in range(start, end):
+                if a[i] != b[i]:
+                    return i
+    return n
+
+
+@dataclass
+class DeterminismReport:
+    """Outcome of N candidate runs of one fixture x mode, compared to run 1.
+
+    Bytes are compared first. Runs whose bytes differ fall back to a
+    structured comparison of the parsed JSON; only structural differences
+    (or differing exit codes) count as non-deterministic.
+    """
+    runs: int
+    variants: List[List[int]]  # run numbers (1-based) grouped by identical (exit_code, stdout)
+    divergences: List[Dict[str, Any]]  # one per run that differs from run 1
+
+    @property
+    def byte_stable(self) -> bool:
+        return len(self.variants) == 1
+
+    @property
+    def deterministic(self) -> bool:
+        return not any(d["structural"] for d in self.divergences)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "byte_stable": self.byte_stable,
+            "deterministic": self.deterministic,
+            "variants": self.variants,
+            "divergences": self.divergences,
+        }
+
+    def summary(self) -> str:
+        s = f"{len(self.variants)} distinct output(s) across {self.runs} runs"
+        bad = [d for d in self.divergences if d["structural"]] or self.divergences
+        if bad:
+            d = bad[0]
+            s += f"; run 1 vs run {d['run']}: first byte divergence at offset {d['offset']}"
+            if d.get("first_diff") is not None:
+                s += f", first diff at {d['first_diff'] or '/'}"
+            if d.get("exit_codes") is not None:
+                s += f", exit codes {d['exit_codes'][0]} vs {d['exit_codes'][1]}"
+        return s
+
+
+def check_determinism(outputs: Sequence[Tuple[int, str]]) -> DeterminismReport:
+    """Compare (exit_code, stdout) of repeated runs byte-for-byte, structurally only when bytes differ."""
+    variants: Dict[Tuple[int, str], List[int]] = {}
+    for i, out in enumerate(outputs, start=1):
+        variants.setdefault(out, []).append(i)
+
+    base_code, base_out = outputs[0]
+    base_bytes = base_out.encode("utf-8")
+    base_parsed: Any = None
+    divergences: List[Dict[str, Any]] = []
+    for run in range(2, len(outputs) + 1):
+        code, out = outputs[run - 1]
+        if code == base_code and out == base_out:
+            continue
+        data = out.encode("utf-8")
+        offset = first_byte_divergence(base_bytes, data)
+        lo = max(0, (offset or 0) - DIVERGENCE_CONTEXT_BYTES)
+        hi = (offset or 0) + DIVERGENCE_CONTEXT_BYTES
+        entry: Dict[str, Any] = {
+            "run": run,
+            "offset": offset,
+            "context_expected": base_bytes[lo:hi].decode("utf-8", "replace"),
+            "context_actual": data[lo:hi].decode("utf-8", "replace"),
+            "exit_codes": [base_code, code] if code != base_code else None,
+            "first_diff": None,
+        }
+        try:
+            # Same parsing as the comparison itself, so JSON and NDJSON output both work
+            if base_parsed is None:
+                base_parsed = parse_validator_stdout(base_code, base_out)
+            diff = diff_json(base_parsed, parse_validator_stdout(code, out), limit=1)
+            entry["first_diff"] = diff.first.pointer if diff else None
+            structural = bool(diff)
+        except RuntimeError:
+            structural = True
+        entry["structural"] = structural or code != base_code
+        divergences.append(entry)
+
+    return DeterminismReport(runs=len(outputs), variants=list(variants.values()), divergences=divergences)
+
+
+class ComparisonStopped(Exception):
+    """Raised by compare_one() when its stop event is set before a validator run."""
+
+
+def _check_stop(stop: Optional[threading.Event]) -> None:
+    if stop is not None and stop.is_set():
+        raise ComparisonStopped
+
+
 def compare_one(
     cfg: ParityConfig,
     fixture: Dict[str, Any],
     mode: str,
     *,
     artifacts_root: Optional[Path],
+    runners: Optional["ParityRunners"] = None,
+    emit: Callable[[str], None] = print,
+    hasher: Optional[FixtureHasher] = None,
+    stop: Optional[threading.Event] = None,
 ) -> Tuple[bool, str]:
+    """Compare one fixture x mode. Raises ComparisonStopped if `stop` is set before a validator run."""
     fixture_id = fixture["id"]
     fixture_root = cfg.repo_root / fixture["fixture_root"]
 
     # Optional fixture hash check (warn only)
     try:
-        got = stable_dir_sha256(fixture_root)
+        got = hasher.digest(fixture_root) if hasher is not None else stable_dir_sha256(fixture_root)
         expected = fixture.get("content_sha256", "")
         if expected and got != expected:
-            print(
+            emit(
                 f"Warning: fixture content hash differs for {fixture_id}. "
                 f"baseline={expected} current={got}"
             )
     except Exception as e:
-        print(f"Warning: could not hash fixture {fixture_id}: {e}")
+        emit(f"Warning: could not hash fixture {fixture_id}: {e}")
+
+    # Traces are written by the validator processes themselves, next to the other artifacts
+    oracle_trace = rust_trace = None
+    if cfg.trace and artifacts_root is not None:
+        oracle_trace = artifacts_root / fixture_id / f"{mode}_oracle.trace.json"
+        rust_trace = artifacts_root / fixture_id / f"{mode}_rust.trace.json"
 
     if cfg.oracle == "baseline":
         oracle_raw = load_oracle_baseline(cfg, fixture_id, mode)
     else:
-        oracle_raw = run_live_python_oracle(cfg, fixture_root, mode)
-
-    rust_raw = run_rust_candidate(cfg, fixture_id, fixture_root, mode)
+        _check_stop(stop)
+        oracle_raw = run_live_python_oracle(
+            cfg, fixture_root, mode, runner=runners.oracle if runners else None, trace_path=oracle_trace
+        )
 
+    rust_runner = runners.rust if runners else None
     if cfg.check_determinism:
-        rust_raw_2 = run_rust_candidate(cfg, fixture_id, fixture_root, mode)
-        if json.dumps(rust_raw, sort_keys=True) != json.dumps(rust_raw_2, sort_keys=True):
-            return False, f"{fixture_id}:{mode} rust output is not deterministic across two runs"
+        outputs = []
+        for i in range(max(2, cfg.determinism_runs)):
+            traced = {"trace_path": rust_trace} if rust_trace is not None and i == 0 else {}
+            _check_stop(stop)
+            exit_code, stdout, stderr = run_rust_candidate_raw(
+                cfg, fixture_id, fixture_root, mode, runner=rust_runner, **traced
+            )
+            outputs.append((exit_code, stdout, stderr))
+        rust_raw = parse_validator_stdout(*outputs[0])
+        report = check_determinism([(code, out) for code, out, _err in outputs])
+        if not report.byte_stable and artifacts_root is not None:
+            write_json(artifacts_root / fixture_id / f"{mode}_determinism.json", report.to_json())
+        if not report.deterministic:
+            return False, f"{fixture_id}:{mode} rust output is not deterministic: {report.summary()}"
+        if not report.byte_stable:
+            emit(f"Warning: {fixture_id}:{mode} rust output bytes differ between runs ({report.summary()})")
+    else:
+        _check_stop(stop)
+        rust_raw = run_rust_candidate(cfg, fixture_id, fixture_root, mode, runner=rust_runner, trace_path=rust_trace)
 
     oracle = normalize_result(oracle_raw, ignore_validator_version=cfg.ignore_validator_version)
     rust = normalize_result(rust_raw, ignore_validator_version=cfg.ignore_validator_version)
 
-    diff = first_diff_path(oracle, rust)
-    if diff is None:
+    diff = diff_json(oracle, rust, limit=cfg.max_diffs)
+    if not diff:
         if cfg.write_artifacts and artifacts_root is not None:
             write_json(artifacts_root / fixture_id / f"{mode}_oracle.normalized.json", oracle)
             write_json(artifacts_root / fixture_id / f"{mode}_rust.normalized.json", rust)
@@ -383,14 +934,40 @@ def compare_one(
         write_json(artifacts_root / fixture_id / f"{mode}_rust.raw.json", rust_raw)
         write_json(artifacts_root / fixture_id / f"{mode}_oracle.normalized.json", oracle)
         write_json(artifacts_root / fixture_id / f"{mode}_rust.normalized.json", rust)
+        write_json(artifacts_root / fixture_id / f"{mode}_diff.json", diff.to_json())
 
-    # Include a small value preview for the first differing path
-    preview = ""
-    try:
-        preview = f" (first diff at {diff})"
-    except Exception:
-        pass
-    return False, f"{fixture_id}:{mode} MISMATCH{preview}"
+    first = diff.first
+    return False, (
+        f"{fixture_id}:{mode} MISMATCH "
+        f"(first diff at {first.pointer or '/'} [{first.kind}]; {diff.count_label()} difference(s))"
+    )
+
+
+@dataclass
+class ParityRunners:
+    """Validator runners shared by all fixture comparisons of one parity run."""
+    rust: Optional[ValidatorRunner] = None
+    oracle: Optional[ValidatorRunner] = None
+
+    @classmethod
+    def for_config(cls, cfg: ParityConfig) -> "ParityRunners":
+        runners = cls()
+        common = dict(cwd=cfg.repo_root, schemas_dir=cfg.schemas_dir, max_diagnostics=cfg.max_diagnostics)
+        if cfg.rust_cmd_template is not None and not cfg.use_baseline_as_rust:
+            runners.rust = ValidatorRunner(
+                cfg.rust_cmd_template,
+                batch_cmd=cfg.rust_batch_cmd_template,
+                use_batch=cfg.use_batch,
+                **common,
+            )
+        if cfg.oracle == "live":
+            runners.oracle = ValidatorRunner(python_cmd_template(), use_batch=cfg.use_batch, **common)
+        return runners
+
+    def close(self) -> None:
+        for r in (self.rust, self.oracle):
+            if r is not None:
+                r.close()
 
 
 def run_parity(
@@ -411,20 +988,102 @@ def run_parity(
         ts = os.environ.get("PTBL_PARITY_RUN_ID") or __import__("datetime").datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         artifacts_root = cfg.repo_root / "tests" / "parity_runs" / ts
 
+    tasks = [
+        (fx, m)
+        for fx in selected
+        for m in modes
+        if m in fx.get("modes", ["interactive", "commit"])
+    ]
+
     any_fail = False
-    for fx in selected:
-        fx_modes = fx.get("modes", ["interactive", "commit"])
-        for m in modes:
-            if m not in fx_modes:
-                continue
-            ok, msg = compare_one(cfg, fx, m, artifacts_root=artifacts_root)
-            print(msg)
-            if not ok:
-                any_fail = True
+    runners = ParityRunners.for_config(cfg)
+    hasher = FixtureHasher(cfg.hash_cache_path)
+    try:
+        if cfg.jobs <= 1:
+            for i, (fx, m) in enumerate(tasks):
+                ok, msg = compare_one(cfg, fx, m, artifacts_root=artifacts_root, runners=runners, hasher=hasher)
+                print(msg)
+                if not ok:
+                    any_fail = True
+                    if cfg.fail_fast:
+                        print(f"Fail-fast: skipped {len(tasks) - i - 1} remaining comparison(s)")
+                        break
+        else:
+            any_fail = _run_parallel(cfg, tasks, artifacts_root=artifacts_root, runners=runners, hasher=hasher)
+    finally:
+        runners.close()
+        hasher.save()
 
     return 1 if any_fail else 0
 
 
+def _run_parallel(
+    cfg: ParityConfig,
+    tasks: Sequence[Tuple[Dict[str, Any], str]],
+    *,
+    artifacts_root: Optional[Path],
+    runners: ParityRunners,
+    hasher: FixtureHasher,
+) -> bool:
+    """
+    Run comparisons in a thread pool; print each task's output in task order.
+
+    Results are collected as they complete. With fail_fast, a mismatch stops every
+    task after it in task order (pending ones are cancelled, running ones stop
+    before their next validator run) while earlier tasks finish, so the printed
+    output is the sequential run's.
+    """
+    stops = [threading.Event() for _ in tasks]
+
+    def run_task(i: int, fx: Dict[str, Any], m: str) -> Optional[Tuple[bool, List[str]]]:
+        lines: List[str] = []
+        try:
+            ok, msg = compare_one(
+                cfg, fx, m, artifacts_root=artifacts_root, runners=runners, emit=lines.append, hasher=hasher,
+                stop=stops[i],
+            )
+        except ComparisonStopped:
+            return None
+        lines.append(msg)
+        return ok, lines
+
+    any_fail = False
+    fail_at = len(tasks)  # task index of the first mismatch so far (fail_fast only)
+    results: Dict[int, Optional[Tuple[bool, List[str]]]] = {}
+    printed = 0
+    pool = ThreadPoolExecutor(max_workers=cfg.jobs, thread_name_prefix="parity")
+    try:
+        futures = [pool.submit(run_task, i, fx, m) for i, (fx, m) in enumerate(tasks)]
+        index = {fut: i for i, fut in enumerate(futures)}
+        for fut in as_completed(futures):
+            if fut.cancelled():
+                continue
+            i = index[fut]
+            results[i] = result = fut.result()
+            if cfg.fail_fast and result is not None and not result[0] and i < fail_at:
+                for j in range(i + 1, fail_at):
+                    stops[j].set()
+                    futures[j].cancel()
+                fail_at = i
+            while printed <= min(fail_at, len(tasks) - 1) and printed in results:
+                done = results[printed]
+                assert done is not None  # only tasks after fail_at are stopped
+                ok, lines = done
+                for line in lines:
+                    print(line)
+                any_fail = any_fail or not ok
+                printed += 1
+            if printed > fail_at or printed == len(tasks):
+                break
+        if fail_at < len(tasks):
+            print(f"Fail-fast: skipped {len(tasks) - fail_at - 1} remaining comparison(s)")
+    finally:
+        for ev in stops:
+            ev.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+    return any_fail
+
+
 def build_config(args: argparse.Namespace) -> ParityConfig:
     repo_root = repo_root_from_here()
 
@@ -437,6 +1096,17 @@ def build_config(args: argparse.Namespace) -> ParityConfig:
 
     rust_cmd_template = parse_rust_cmd(args.rust_cmd, args.use_python_as_rust)
 
+    rust_batch_cmd_template = None
+    rust_batch_cmd = getattr(args, "rust_batch_cmd", None)
+    if rust_batch_cmd is not None:
+        rust_batch_cmd_template = parse_rust_cmd(rust_batch_cmd, False)
+
+    hash_cache_path = None
+    if getattr(args, "hash_cache", None):
+        hash_cache_path = Path(args.hash_cache)
+        if not hash_cache_path.is_absolute():
+            hash_cache_path = repo_root / hash_cache_path
+
     return ParityConfig(
         repo_root=repo_root,
         schemas_dir=schemas_dir,
@@ -444,10 +1114,18 @@ def build_config(args: argparse.Namespace) -> ParityConfig:
         oracle=args.oracle,
         baseline_version=baseline_version,
         ignore_validator_version=args.ignore_validator_version,
-        check_determinism=args.check_determinism,
+        check_determinism=args.check_determinism or getattr(args, "determinism_runs", None) is not None,
         write_artifacts=args.write_artifacts,
         rust_cmd_template=rust_cmd_template,
         use_baseline_as_rust=args.use_python_as_rust,
+        rust_batch_cmd_template=rust_batch_cmd_template,
+        use_batch=getattr(args, "use_batch", True),
+        jobs=max(1, getattr(args, "jobs", 1)),
+        fail_fast=getattr(args, "fail_fast", False),
+        hash_cache_path=hash_cache_path,
+        max_diffs=max(1, getattr(args, "max_diffs", DEFAULT_DIFF_LIMIT)),
+        determinism_runs=max(2, getattr(args, "determinism_runs", None) or 2),
+        trace=getattr(args, "trace", False),
     )
 
 
@@ -461,11 +1139,24 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     p.add_argument("--baseline-version", default=None, help="Override baseline version folder name")
     p.add_argument("--ignore-validator-version", action="store_true", default=True, help="Ignore validator_version field")
     p.add_argument("--no-ignore-validator-version", dest="ignore_validator_version", action="store_false")
-    p.add_argument("--check-determinism", action="store_true", default=False, help="Run Rust twice and require identical output")
+    p.add_argument("--check-determinism", action="store_true", default=False, help="Run Rust repeatedly (see --determinism-runs) and require identical output: bytes first, then structure")
     p.add_argument("--write-artifacts", action="store_true", default=True, help="Write debug artifacts to tests/parity_runs/")
     p.add_argument("--no-write-artifacts", dest="write_artifacts", action="store_false")
     p.add_argument("--rust-cmd", default=None, help="Rust command template as JSON array of tokens, or a shell string")
     p.add_argument("--use-python-as-rust", action="store_true", default=False, help="Self-test: run Python as Rust side")
+    p.add_argument("--rust-batch-cmd", default=None, help="Batch-mode Rust command as JSON array of tokens (default: derived from --rust-cmd)")
+    p.add_argument("--no-batch", dest="use_batch", action="store_false", default=True, help="Always spawn one validator process per run")
+    p.add_argument("--jobs", type=int, default=1, help="Run up to N fixture comparisons concurrently (output stays in fixture order)")
+    p.add_argument("--fail-fast", action="store_true", default=False, help="Stop at the first mismatch")
+    p.add_argument("--determinism-runs", type=int, default=None, metavar="N",
+                   help="Run Rust N times per fixture x mode (implies --check-determinism; default 2)")
+    p.add_argument("--max-diffs", type=int, default=DEFAULT_DIFF_LIMIT,
+                   help="Maximum differences recorded per mismatch (written to <mode>_diff.json)")
+    p.add_argument("--hash-cache", nargs="?", const="tests/_out/parity_hash_cache.json", default=None,
+                   help="Persist fixture content hashes across runs (default path: tests/_out/parity_hash_cache.json)")
+    p.add_argument("--trace", action="store_true", default=False,
+                   help="Run validators with PTBL_TRACE set and keep their timing traces as <mode>_<side>.trace.json "
+                        "artifacts (traced runs do not use batch mode)")
     args = p.parse_args(list(argv) if argv is not None else None)
 
     cfg = build_config(args)
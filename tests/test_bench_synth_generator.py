@@ -0,0 +1,69 @@
+"""Seeded synthetic workspaces (tests/bench/synth.py) and the scaling budget check."""
+
+from __future__ import annotations
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_UNRESOLVED_IMPORT
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.bench_scaling import DEFAULT_BUDGETS, load_budgets, over_budget, run
+from tests.bench.synth import WorkspaceShape, generate_modules, generate_workspace
+
+
+def test_same_seed_same_workspace():
+    shape = WorkspaceShape(modules=60)
+    assert generate_modules(shape, seed=7) == generate_modules(shape, seed=7)
+    assert generate_modules(shape, seed=7) != generate_modules(shape, seed=8)
+
+
+def test_layers_bound_chain_depth_and_imports():
+    shape = WorkspaceShape(modules=40, depth=4, fan_out=2, external_deps=3)
+    modules, entries, _lock = generate_modules(shape, seed=1)
+    assert len(modules) == 40
+    assert entries == list(modules)[:10]
+    layer = {mid: i // 10 for i, mid in enumerate(modules)}
+    for mid, imports in modules.items():
+        local = [imp for imp in imports if imp["source"] == "local"]
+        external = [imp for imp in imports if imp["source"] != "local"]
+        assert len(external) == 3
+        assert len(local) <= 2
+        for imp in local:
+            target = imp["path"].removeprefix("modules/").removesuffix(".ptbl")
+            assert layer[target] == layer[mid] + 1
+
+
+def test_generated_workspace_resolves_in_both_modes(tmp_path):
+    root = generate_workspace(tmp_path, WorkspaceShape(modules=50, diamond_density=0.9), seed=3)
+    ws = load_workspace(root)
+    dev = resolve_workspace(ws, "dev")
+    repro = resolve_workspace(ws, "repro")
+    assert [i.key for i in dev] == [i.key for i in repro]
+    assert sum(1 for i in dev if i.kind == "module") <= 50
+
+
+def test_partial_lock_coverage_fails_repro(tmp_path):
+    shape = WorkspaceShape(modules=30, lock_coverage=0.5, source_mix={"git": 1.0})
+    modules, _entries, lock = generate_modules(shape, seed=0)
+    externals = {imp["url"] for imports in modules.values() for imp in imports if imp["source"] == "git"}
+    assert len(lock) == round(len(externals) * 0.5)
+    assert all(key.startswith("git:") and "commit" in entry for key, entry in lock.items())
+
+    ws = load_workspace(generate_workspace(tmp_path, shape, seed=0))
+    resolve_workspace(ws, "dev")
+    with pytest.raises(ResolverError) as exc:
+        resolve_workspace(ws, "repro")
+    assert exc.value.rule_id == RESOLVE_UNRESOLVED_IMPORT
+
+
+def test_over_budget_reports_each_exceeded_measurement():
+    row = {"modules": 10, "load_s": 0.5, "peak_mib": 1.0}
+    assert over_budget(row, {"load_s": 0.1, "peak_mib": 2.0, "missing": 0}) == ["10 modules: load_s 0.5 > budget 0.1"]
+
+
+def test_small_sizes_stay_within_budget():
+    budgets = load_budgets(DEFAULT_BUDGETS)
+    assert {"10", "100", "1000", "10000", "100000"} <= set(budgets["sizes"])
+    rows, failures = run([10, 100], budgets, repeat=1)
+    assert [r["modules"] for r in rows] == [10, 100]
+    assert failures == []
@@ -0,0 +1,66 @@
+"""Structural JSON diff used by the parity harness, plus copy-on-write normalization."""
+
+from __future__ import annotations
+
+import copy
+import json
+
+from tests.json_diff import DIFF_EXTRA, DIFF_MISSING, DIFF_TYPE, DIFF_VALUE, diff_json, first_difference
+from tests.parity_harness import normalize_result
+
+
+def test_equal_values_have_no_differences():
+    doc = {"a": [1, {"b": None}], "c": "x"}
+    assert not diff_json(doc, copy.deepcopy(doc))
+    assert first_difference(doc, doc) is None
+
+
+def test_reports_all_differences_in_document_order():
+    a = {"diagnostics": [{"rule_id": "R1", "line": 1}, {"rule_id": "R2"}], "ok": True, "x/y": 1, "gone": 0}
+    b = {"diagnostics": [{"rule_id": "R9", "line": "1"}], "ok": False, "x/y": 2, "new": 1}
+    result = diff_json(a, b)
+    assert [(d.pointer, d.kind) for d in result.differences] == [
+        ("/diagnostics/0/line", DIFF_TYPE),
+        ("/diagnostics/0/rule_id", DIFF_VALUE),
+        ("/diagnostics/1", DIFF_MISSING),
+        ("/gone", DIFF_MISSING),
+        ("/new", DIFF_EXTRA),
+        ("/ok", DIFF_VALUE),
+        ("/x~1y", DIFF_VALUE),
+    ]
+    assert not result.truncated
+    json.dumps(result.to_json())
+
+
+def test_limit_caps_report_and_marks_truncation():
+    a = {"items": list(range(100))}
+    b = {"items": [i + 1 for i in range(100)]}
+    result = diff_json(a, b, limit=5)
+    assert [d.pointer for d in result.differences] == [f"/items/{i}" for i in range(5)]
+    assert result.truncated
+    assert result.count_label() == "5+"
+
+
+def test_bool_and_number_are_different_types():
+    assert first_difference({"v": 1}, {"v": True}).kind == DIFF_TYPE
+
+
+def test_normalize_result_does_not_mutate_input():
+    raw = {
+        "validator_version": "1.2.3",
+        "diagnostics": [
+            {"tier": "schema", "severity": "error", "message": "schema says no", "file": "b.yaml"},
+            {"tier": "semantic", "severity": "error", "message": "kept", "file": "a.yaml"},
+        ],
+        "fix_actions": [{"op": "z"}, {"op": "a"}],
+    }
+    before = copy.deepcopy(raw)
+    out = normalize_result(raw, ignore_validator_version=True)
+    assert raw == before
+    assert out["validator_version"] == "<ignored>"
+    assert [d["message"] for d in out["diagnostics"]] == ["<schema_message>", "kept"]
+    assert [f["op"] for f in out["fix_actions"]] == ["a", "z"]
+
+
+def test_int_and_float_are_different_types_inside_equal_looking_containers():
+    assert [d.pointer for d in diff_json({"a": [1, 2]}, {"a": [1, 2.0]}).differences] == ["/a/1"]
@@ -0,0 +1,123 @@
+"""NDJSON streaming of resolver and validator results."""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import RESOLVE_CONFLICT, ResolverError
+from ptbl.ndjson import (
+    LOAD_ERROR,
+    VALIDATE_FORMAT,
+    is_validate_ndjson,
+    iter_ndjson,
+    iter_resolved_dicts,
+    resolve_records,
+    validation_result_from_records,
+    validation_result_records,
+    write_ndjson,
+)
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import iter_resolve_workspace, resolve_workspace, resolved_item_to_dict
+from tests.parity_harness import parse_validator_stdout
+
+
+def _roundtrip(records):
+    buf = io.StringIO()
+    write_ndjson(buf, records)
+    buf.seek(0)
+    return buf
+
+
+def test_iter_resolve_matches_resolve_workspace():
+    ws = load_workspace(Path("fixtures/phase1/diamond"))
+    assert list(iter_resolve_workspace(ws, "dev")) == resolve_workspace(ws, "dev")
+
+
+def test_iter_resolve_raises_before_first_item():
+    ws = load_workspace(Path("fixtures/phase1/conflict"))
+    with pytest.raises(ResolverError) as exc:
+        next(iter_resolve_workspace(ws, "dev"))
+    assert exc.value.rule_id == RESOLVE_CONFLICT
+
+
+def test_resolve_stream_roundtrip():
+    root = Path("fixtures/phase1/diamond")
+    buf = _roundtrip(resolve_records(root, "dev"))
+    expected = [resolved_item_to_dict(i) for i in resolve_workspace(load_workspace(root), "dev")]
+    assert list(iter_resolved_dicts(buf)) == expected
+
+
+def test_resolve_stream_error_record_is_reraised():
+    buf = _roundtrip(resolve_records(Path("fixtures/phase1/conflict"), "dev"))
+    with pytest.raises(ResolverError) as exc:
+        list(iter_resolved_dicts(buf))
+    assert exc.value.rule_id == RESOLVE_CONFLICT
+    assert str(exc.value).count(RESOLVE_CONFLICT) == 1
+
+
+def test_load_failure_ends_the_stream_with_an_error_record(tmp_path):
+    (tmp_path / "modules").mkdir()
+    records = list(resolve_records(tmp_path, "dev"))
+    assert [r["type"] for r in records] == ["header", "error", "end"]
+    assert records[1]["rule_id"] == LOAD_ERROR and "app.ptbl" in records[1]["message"]
+    assert records[2]["count"] == 0
+    with pytest.raises(ResolverError) as exc:
+        list(iter_resolved_dicts(_roundtrip(records)))
+    assert exc.value.rule_id == LOAD_ERROR
+
+    (tmp_path / "app.ptbl").write_text("entry_modules: [a\n", encoding="utf-8")
+    assert [r["type"] for r in resolve_records(tmp_path, "dev")] == ["header", "error", "end"]
+
+
+def test_truncated_stream_is_rejected():
+    lines = _roundtrip(resolve_records(Path("fixtures/phase1/diamond"), "dev")).read().splitlines(True)
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_resolved_dicts(lines[:-1]))
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_ndjson([lines[0], "{not json\n"]))
+
+
+def test_cli_writes_one_line_per_item():
+    cp = subprocess.run(
+        [sys.executable, "-m", "ptbl.ndjson", "resolve", "fixtures/phase1/diamond", "--mode", "dev"],
+        capture_output=True, text=True, check=True,
+    )
+    assert len(list(iter_resolved_dicts(cp.stdout.splitlines()))) == len(
+        resolve_workspace(load_workspace(Path("fixtures/phase1/diamond")), "dev")
+    )
+
+
+def test_validation_result_roundtrip_through_harness():
+    result = {
+        "validator_version": "1.0",
+        "ok": False,
+        "diagnostics": [{"rule_id": f"R{i}", "message": "m"} for i in range(3)],
+        "fix_actions": [{"op": "add"}],
+        "summary": {"errors": 3},
+    }
+    text = _roundtrip(validation_result_records(result)).read()
+    back = validation_result_from_records(iter_ndjson(text.splitlines()))
+    assert back == result and list(back) == list(result)
+    assert parse_validator_stdout(1, text) == result
+
+
+def test_ndjson_is_detected_whatever_the_header_key_order():
+    result = {"ok": True, "diagnostics": [{"rule_id": "R1"}]}
+    records = list(validation_result_records(result))
+    sorted_keys = "".join(json.dumps(r, sort_keys=True) + "\n" for r in records)
+    assert sorted_keys.startswith('{"fields"')
+    format_first = json.dumps({"format": VALIDATE_FORMAT, **records[0]}) + "\n" + sorted_keys.split("\n", 1)[1]
+    assert format_first.startswith('{"format"')
+    for text in (sorted_keys, format_first):
+        assert is_validate_ndjson(text)
+        assert parse_validator_stdout(1, text) == result
+
+    assert not is_validate_ndjson(json.dumps(result) + "\n")
+    assert not is_validate_ndjson(json.dumps(result, indent=2))
+    assert parse_validator_stdout(1, json.dumps(result, indent=2)) == result
@@ -0,0 +1,198 @@
+"""Batch protocol and concurrent runs for the parity harness, exercised with a fake validator.
+
+The fake validator serves the frozen baseline outputs, either one run per
+process (`validate {root} --mode {mode}`) or as a batch process
+(`validate --batch`). It logs every process start so the tests can count them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from tests.parity_harness import (
+    ValidatorRunner,
+    batch_cmd_from_template,
+    build_config,
+    detect_baseline_version,
+    load_fixtures,
+    repo_root_from_here,
+    run_parity,
+)
+
+
+FAKE_VALIDATOR = r'''
+import json, os, sys, time
+from pathlib import Path
+
+baseline_dir, roots_file, *args = sys.argv[1:]
+roots = json.loads(Path(roots_file).read_text(encoding="utf-8"))
+with open(os.environ["FAKE_VALIDATOR_LOG"], "a", encoding="utf-8") as log:
+    log.write(" ".join(args[:2]) + "\n")
+
+def render(root, mode):
+    if roots[root] == os.environ.get("FAKE_VALIDATOR_SLOW"):
+        time.sleep(1.0)
+    text = (Path(baseline_dir) / roots[root] / f"{mode}.json").read_text(encoding="utf-8")
+    if roots[root] == os.environ.get("FAKE_VALIDATOR_MISMATCH"):
+        result = json.loads(text)
+        result["diagnostics"] = []
+        text = json.dumps(result)
+    return text
+
+if args[:2] == ["validate", "--batch"]:
+    if os.environ.get("FAKE_VALIDATOR_NO_BATCH"):
+        print("error: unknown flag --batch", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps({"protocol": "ptbl-validate-batch/1"}), flush=True)
+    for line in sys.stdin:
+        req = json.loads(line)
+        reply = {"id": req["id"], "exit_code": 1, "stdout": render(req["root"], req["mode"])}
+        if os.environ.get("FAKE_VALIDATOR_STDERR"):
+            reply["stderr"] = f"served {roots[req['root']]}:{req['mode']}\n"
+            sys.stderr.write(reply["stderr"])
+            sys.stderr.flush()
+        print(json.dumps(reply), flush=True)
+else:
+    sys.stdout.write(render(args[1], args[3]))
+    sys.exit(1)
+'''
+
+
+def _setup(tmp_path: Path, **overrides):
+    repo_root = repo_root_from_here()
+    fixtures = load_fixtures(repo_root / "tests" / "parity_baseline" / "fixtures.json")
+    baseline_dir = (
+        repo_root / "tests" / "parity_baseline" / "python"
+        / detect_baseline_version(repo_root / "tests" / "parity_baseline")
+    )
+    roots = {str(repo_root / f["fixture_root"]): f["id"] for f in fixtures}
+    (tmp_path / "roots.json").write_text(json.dumps(roots), encoding="utf-8")
+    script = tmp_path / "fake_validator.py"
+    script.write_text(FAKE_VALIDATOR, encoding="utf-8")
+
+    cmd = [sys.executable, str(script), str(baseline_dir), str(tmp_path / "roots.json"),
+           "validate", "{root}", "--mode", "{mode}"]
+    ns = argparse.Namespace(
+        fixtures=[],
+        modes=["interactive", "commit"],
+        oracle="baseline",
+        schemas_dir="schemas/ptbl/2.6.19",
+        max_diagnostics=200,
+        baseline_version=None,
+        ignore_validator_version=True,
+        check_determinism=True,
+        write_artifacts=False,
+        rust_cmd=json.dumps(cmd),
+        use_python_as_rust=False,
+    )
+    for k, v in overrides.items():
+        setattr(ns, k, v)
+    return fixtures, build_config(ns)
+
+
+def _starts(log: Path):
+    return log.read_text(encoding="utf-8").splitlines()
+
+
+def test_batch_cmd_is_derived_from_template():
+    assert batch_cmd_from_template(["ptbl", "validate", "{root}", "--mode", "{mode}"]) == ["ptbl", "validate", "--batch"]
+    assert batch_cmd_from_template(["{exe}", "validate"]) is None
+    assert batch_cmd_from_template(["ptbl validate {root}"]) is None
+
+
+def test_batch_validator_started_once_for_all_runs(tmp_path, monkeypatch):
+    log = tmp_path / "starts.log"
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(log))
+    fixtures, cfg = _setup(tmp_path)
+
+    rc = run_parity(fixtures=fixtures, fixture_ids=[], modes=["interactive", "commit"], cfg=cfg)
+    assert rc == 0
+    assert _starts(log) == ["validate --batch"]
+
+
+def test_falls_back_to_one_process_per_run_without_batch_support(tmp_path, monkeypatch):
+    log = tmp_path / "starts.log"
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(log))
+    monkeypatch.setenv("FAKE_VALIDATOR_NO_BATCH", "1")
+    fixtures, cfg = _setup(tmp_path)
+    fixture_ids = [fixtures[0]["id"]]
+
+    rc = run_parity(fixtures=fixtures, fixture_ids=fixture_ids, modes=["interactive"], cfg=cfg)
+    assert rc == 0
+    # One rejected batch probe, then one process per run (determinism check runs twice)
+    root = cfg.repo_root / fixtures[0]["fixture_root"]
+    assert _starts(log) == ["validate --batch", f"validate {root}", f"validate {root}"]
+
+
+def test_jobs_keep_output_in_fixture_order(tmp_path, monkeypatch, capsys):
+    log = tmp_path / "starts.log"
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(log))
+
+    fixtures, cfg = _setup(tmp_path)
+    assert run_parity(fixtures=fixtures, fixture_ids=[], modes=["interactive", "commit"], cfg=cfg) == 0
+    sequential = capsys.readouterr().out
+
+    fixtures, cfg = _setup(tmp_path, jobs=4)
+    assert run_parity(fixtures=fixtures, fixture_ids=[], modes=["interactive", "commit"], cfg=cfg) == 0
+    parallel = capsys.readouterr().out
+
+    assert parallel == sequential
+    # One batch process per worker thread at most (plus the one from the sequential run)
+    assert 2 <= len(_starts(log)) <= 5
+
+
+def test_fail_fast_stops_after_first_mismatch(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(tmp_path / "starts.log"))
+    fixtures, cfg = _setup(tmp_path, jobs=2, fail_fast=True, check_determinism=False)
+    bad = fixtures[1]["id"]
+    monkeypatch.setenv("FAKE_VALIDATOR_MISMATCH", bad)
+
+    rc = run_parity(fixtures=fixtures, fixture_ids=[], modes=["interactive"], cfg=cfg)
+    out = capsys.readouterr().out.splitlines()
+
+    assert rc == 1
+    results = [line for line in out if line.endswith(" OK") or " MISMATCH" in line]
+    assert results[0] == f"{fixtures[0]['id']}:interactive OK"
+    assert results[1].startswith(f"{bad}:interactive MISMATCH")
+    assert len(results) == 2
+    assert out[-1].startswith("Fail-fast:")
+
+
+def test_batch_run_reports_only_its_own_stderr(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(tmp_path / "starts.log"))
+    monkeypatch.setenv("FAKE_VALIDATOR_STDERR", "1")
+    fixtures, cfg = _setup(tmp_path)
+    runner = ValidatorRunner(cfg.rust_cmd_template, cwd=cfg.repo_root, schemas_dir=cfg.schemas_dir,
+                             max_diagnostics=cfg.max_diagnostics)
+    try:
+        for fx in fixtures[:3]:
+            _code, _out, err = runner.run_raw(cfg.repo_root / fx["fixture_root"], "interactive")
+            assert err == f"served {fx['id']}:interactive\n"
+        assert runner.batch_active
+    finally:
+        runner.close()
+
+
+def test_fail_fast_with_jobs_does_not_wait_for_earlier_slow_fixtures(tmp_path, monkeypatch, capsys):
+    log = tmp_path / "starts.log"
+    monkeypatch.setenv("FAKE_VALIDATOR_LOG", str(log))
+    monkeypatch.setenv("FAKE_VALIDATOR_NO_BATCH", "1")  # one logged process per validator run
+    fixtures, cfg = _setup(tmp_path, jobs=2, fail_fast=True, check_determinism=False)
+    monkeypatch.setenv("FAKE_VALIDATOR_SLOW", fixtures[0]["id"])
+    monkeypatch.setenv("FAKE_VALIDATOR_MISMATCH", fixtures[1]["id"])
+
+    rc = run_parity(fixtures=fixtures, fixture_ids=[], modes=["interactive"], cfg=cfg)
+    out = capsys.readouterr().out.splitlines()
+
+    assert rc == 1
+    results = [line for line in out if line.endswith(" OK") or " MISMATCH" in line]
+    assert results == [f"{fixtures[0]['id']}:interactive OK", results[1]]
+    assert results[1].startswith(f"{fixtures[1]['id']}:interactive MISMATCH")
+    assert out[-1].startswith("Fail-fast:")
+    # While the slow fixture ran, the other worker stopped after the mismatch instead of
+    # working through the rest of the suite
+    runs = [line for line in _starts(log) if line != "validate --batch"]
+    assert len(runs) <= 3
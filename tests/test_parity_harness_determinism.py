@@ -0,0 +1,128 @@
+"""Determinism checks in the parity harness: raw bytes first, structured fallback, N runs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from itertools import count
+
+import pytest
+
+from ptbl.ndjson import validation_result_records
+import tests.parity_harness as harness
+from tests.parity_harness import (
+    build_config,
+    check_determinism,
+    compare_one,
+    first_byte_divergence,
+    load_fixtures,
+    repo_root_from_here,
+)
+
+
+def test_first_byte_divergence():
+    assert first_byte_divergence(b"abc", b"abc") is None
+    assert first_byte_divergence(b"abc", b"abd") == 2
+    assert first_byte_divergence(b"abc", b"abcd") == 3
+    long = b"x" * 10_000
+    assert first_byte_divergence(long + b"a", long + b"b") == 10_000
+
+
+def test_identical_runs_are_byte_stable():
+    report = check_determinism([(1, '{"a": 1}')] * 4)
+    assert report.byte_stable and report.deterministic
+    assert report.variants == [[1, 2, 3, 4]]
+
+
+def test_key_order_only_difference_falls_back_to_structure():
+    report = check_determinism([(1, '{"a": 1, "b": 2}'), (1, '{"b": 2, "a": 1}')])
+    assert not report.byte_stable
+    assert report.deterministic
+    assert report.divergences[0]["offset"] == 2
+
+
+def test_ndjson_separator_only_difference_falls_back_to_structure():
+    result = {"valid": False, "diagnostics": [{"rule_id": "R1"}, {"rule_id": "R2"}]}
+    records = list(validation_result_records(result))
+    compact = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+    spaced = "".join(json.dumps(r) + "\n" for r in records)
+    report = check_determinism([(1, compact), (1, spaced)])
+    assert not report.byte_stable
+    assert report.deterministic
+    assert report.divergences[0]["first_diff"] is None
+
+
+def test_flaky_runs_are_aggregated():
+    stable = json.dumps({"diagnostics": [{"rule_id": "R1"}, {"rule_id": "R2"}]})
+    flaky = json.dumps({"diagnostics": [{"rule_id": "R2"}, {"rule_id": "R1"}]})
+    report = check_determinism([(1, stable), (1, stable), (1, flaky), (1, stable), (0, stable)])
+    assert not report.deterministic
+    assert report.variants == [[1, 2, 4], [3], [5]]
+    assert [d["run"] for d in report.divergences] == [3, 5]
+    first = report.divergences[0]
+    assert first["first_diff"] == "/diagnostics/0/rule_id"
+    assert stable.encode()[first["offset"]] != flaky.encode()[first["offset"]]
+    assert report.divergences[1]["exit_codes"] == [1, 0]
+    assert "3 distinct output(s) across 5 runs" in report.summary()
+
+
+def _baseline_cfg(**overrides):
+    ns = argparse.Namespace(
+        fixtures=[],
+        modes=["interactive"],
+        oracle="baseline",
+        schemas_dir="schemas/ptbl/2.6.19",
+        max_diagnostics=200,
+        baseline_version=None,
+        ignore_validator_version=True,
+        check_determinism=False,
+        write_artifacts=False,
+        rust_cmd=None,
+        use_python_as_rust=True,
+        determinism_runs=4,
+    )
+    for k, v in overrides.items():
+        setattr(ns, k, v)
+    return build_config(ns)
+
+
+def test_compare_one_runs_candidate_n_times(tmp_path, monkeypatch):
+    repo_root = repo_root_from_here()
+    fixture = load_fixtures(repo_root / "tests" / "parity_baseline" / "fixtures.json")[0]
+    cfg = _baseline_cfg()
+    assert cfg.check_determinism and cfg.determinism_runs == 4
+
+    real = harness.run_rust_candidate_raw
+    calls = count(1)
+
+    def flaky(cfg, fixture_id, fixture_root, mode, *, runner=None):
+        exit_code, stdout, stderr = real(cfg, fixture_id, fixture_root, mode, runner=runner)
+        if next(calls) == 3:
+            data = json.loads(stdout)
+            data["diagnostics"] = list(reversed(data["diagnostics"])) + [{"rule_id": "EXTRA"}]
+            stdout = json.dumps(data)
+        return exit_code, stdout, stderr
+
+    monkeypatch.setattr(harness, "run_rust_candidate_raw", flaky)
+    ok, msg = compare_one(cfg, fixture, "interactive", artifacts_root=tmp_path, emit=lambda _: None)
+    assert not ok
+    assert "not deterministic" in msg and "across 4 runs" in msg and "run 3" in msg
+    report = json.loads((tmp_path / fixture["id"] / "interactive_determinism.json").read_text(encoding="utf-8"))
+    assert report["variants"] == [[1, 2, 4], [3]]
+
+    monkeypatch.setattr(harness, "run_rust_candidate_raw", real)
+    ok, msg = compare_one(cfg, fixture, "interactive", artifacts_root=tmp_path, emit=lambda _: None)
+    assert ok, msg
+
+
+def test_compare_one_reports_stderr_of_the_parsed_run(tmp_path, monkeypatch):
+    repo_root = repo_root_from_here()
+    fixture = load_fixtures(repo_root / "tests" / "parity_baseline" / "fixtures.json")[0]
+    calls = count(1)
+
+    def crashing(cfg, fixture_id, fixture_root, mode, *, runner=None):
+        return 2, "", f"stderr of run {next(calls)}"
+
+    monkeypatch.setattr(harness, "run_rust_candidate_raw", crashing)
+    with pytest.raises(RuntimeError, match="stderr of run 1"):
+        compare_one(_baseline_cfg(), fixture, "interactive", artifacts_root=tmp_path, emit=lambda _: None)
@@ -0,0 +1,78 @@
+"""Fixture content hashing in the parity harness: streaming digest, per-run memo, persistent cache."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import tests.parity_harness as harness
+from tests.parity_harness import FixtureHasher, stable_dir_sha256
+
+
+def _reference_sha256(root: Path) -> str:
+    h = hashlib.sha256()
+    for p in sorted([p for p in root.rglob("*") if p.is_file()], key=lambda x: x.as_posix()):
+        h.update(p.relative_to(root).as_posix().encode("utf-8"))
+        h.update(b"\x00")
+        h.update(p.read_bytes())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _make_tree(root: Path) -> Path:
+    (root / "modules" / "nested").mkdir(parents=True)
+    (root / "app.yaml").write_text("app: demo\n", encoding="utf-8")
+    (root / "modules" / "a.yaml").write_bytes(os.urandom(10_000))
+    (root / "modules" / "nested" / "b.yaml").write_bytes(b"")
+    return root
+
+
+def test_streaming_digest_matches_whole_file_format(tmp_path: Path, monkeypatch):
+    root = _make_tree(tmp_path / "fx")
+    monkeypatch.setattr(harness, "HASH_CHUNK_SIZE", 7)
+    assert stable_dir_sha256(root) == _reference_sha256(root)
+
+
+def test_hasher_memoizes_per_root_across_threads(tmp_path: Path, monkeypatch):
+    root = _make_tree(tmp_path / "fx")
+    calls = []
+    real = harness.stable_dir_sha256
+
+    def counting(r, files=None):
+        calls.append(r)
+        return real(r, files)
+
+    monkeypatch.setattr(harness, "stable_dir_sha256", counting)
+    hasher = FixtureHasher()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(hasher.digest(root))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [_reference_sha256(root)] * 8
+
+
+def test_persistent_cache_skips_reads_until_listing_changes(tmp_path: Path, monkeypatch):
+    root = _make_tree(tmp_path / "fx")
+    cache_path = tmp_path / "out" / "hash_cache.json"
+
+    first = FixtureHasher(cache_path)
+    expected = first.digest(root)
+    first.save()
+    assert cache_path.exists()
+
+    def no_reads(r, files=None):
+        raise AssertionError("cached digest should not rehash")
+
+    monkeypatch.setattr(harness, "stable_dir_sha256", no_reads)
+    assert FixtureHasher(cache_path).digest(root) == expected
+
+    monkeypatch.undo()
+    (root / "modules" / "nested" / "b.yaml").write_text("changed\n", encoding="utf-8")
+    third = FixtureHasher(cache_path)
+    assert third.digest(root) == _reference_sha256(root) != expected
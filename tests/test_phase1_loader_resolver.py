@@ -55,3 +55,9 @@ def test_diamond_dedupes_shared_dependency():
 
     d_entries = [r for r in result if r.key == "module:d"]
     assert len(d_entries) == 1
+
+
+def test_module_index_maps_resolved_paths_to_module_ids():
+    ws = load_workspace(Path("fixtures/phase1/diamond"))
+    assert ws.module_index == {spec.file_path.resolve(): mid for mid, spec in ws.modules.items()}
+    assert ws.module_index[(ws.root / "modules" / "d.ptbl").resolve()] == "d"
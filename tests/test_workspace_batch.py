@@ -0,0 +1,122 @@
+import os
+import pickle
+import shutil
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_CYCLE
+from ptbl.workspace import loader
+from ptbl.workspace.batch import SharedParsePool, resolve_many
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import local_import, registry_import, write_workspace
+
+
+def _single(root, mode):
+    try:
+        return resolve_workspace(load_workspace(root), mode), None
+    except Exception as e:
+        return None, (type(e), str(e))
+
+
+def _roots(tmp_path):
+    """Apps sharing modules by copy and by symlink, plus a cycle and a missing root.
+
+    app2 links to app0's files, outside its own root, which the loader rejects as
+    path traversal; the batch must report the same error.
+    """
+    shared = {
+        "core": [registry_import("pkgA", "1.0")],
+        "util": [local_import("core"), registry_import("pkgB", "2.0")],
+    }
+    lock = {"registry:pkgA": {"pinned_version": "1.0"}, "registry:pkgB": {"pinned_version": "2.0"}}
+    base = write_workspace(tmp_path / "app0", {**shared, "app0": [local_import("util")]},
+                           entry_modules=["app0"], lock_resolved=lock)
+    roots = [base]
+    for i in (1, 2):
+        root = write_workspace(tmp_path / f"app{i}", {f"app{i}": [local_import("util")]},
+                               entry_modules=[f"app{i}"], lock_resolved=lock)
+        for name in shared:
+            src = base / "modules" / f"{name}.ptbl"
+            dst = root / "modules" / f"{name}.ptbl"
+            if i == 1:
+                shutil.copyfile(src, dst)
+            else:
+                os.symlink(src, dst)
+        roots.append(root)
+    roots.append(write_workspace(tmp_path / "cycle", {"a": [local_import("b")], "b": [local_import("a")]},
+                                 entry_modules=["a"], lock_resolved={}))
+    roots.append(tmp_path / "missing")
+    return roots
+
+
+@pytest.mark.parametrize("mode", ["dev", "repro"])
+@pytest.mark.parametrize("workers,executor", [(1, "thread"), (3, "thread"), (2, "process")])
+def test_resolve_many_matches_single_root_calls(tmp_path, mode, workers, executor):
+    roots = _roots(tmp_path)
+    results = resolve_many(roots, mode, workers=workers, executor=executor)
+    assert [r.root for r in results] == roots
+    for root, result in zip(roots, results):
+        items, error = _single(root, mode)
+        assert result.items == items
+        assert (None if result.error is None else (type(result.error), str(result.error))) == error
+
+    assert results[0].ok and not results[3].ok
+    with pytest.raises(ResolverError) as exc:
+        results[3].unwrap()
+    assert exc.value.rule_id == RESOLVE_CYCLE
+
+
+def test_identical_files_are_parsed_once(tmp_path, monkeypatch):
+    roots = _roots(tmp_path)[:2]
+    parsed = []
+    real_read_yaml = loader._read_yaml_source
+
+    def counting_read_yaml(path, loader_cls=None):
+        parsed.append(path)
+        return real_read_yaml(path, loader_cls)
+
+    monkeypatch.setattr(loader, "_read_yaml_source", counting_read_yaml)
+    pool = SharedParsePool()
+    results = resolve_many(roots, "dev", pool=pool)
+    assert all(r.ok for r in results)
+    # lock.ptbl, core and util once; app.ptbl and the entry module differ per app
+    assert len(parsed) == len(pool) == 3 + 2 * 2
+    assert pool.stats.hits == 2 * 5 - len(pool)
+
+
+def test_file_edited_between_lookup_and_parse_is_pooled_under_the_parsed_content(tmp_path, monkeypatch):
+    lock = {"registry:pkg": {"pinned_version": "1.0"}}
+    roots = [write_workspace(tmp_path / f"app{i}", {"app": [registry_import("pkg", "1.0")]},
+                             entry_modules=["app"], lock_resolved=lock) for i in range(2)]
+    edited = roots[0] / "modules" / "app.ptbl"
+    original = edited.read_text(encoding="utf-8")
+    real_read_yaml = loader._read_yaml_source
+
+    def edit_then_read(path, loader_cls=None):
+        if path == edited:
+            path.write_text(original.replace("'1.0'", "'2.0'"), encoding="utf-8")
+        return real_read_yaml(path, loader_cls)
+
+    pool = SharedParsePool()
+    monkeypatch.setattr(loader, "_read_yaml_source", edit_then_read)
+    assert load_workspace(roots[0], cache=pool).modules["app"].imports[0].version == "2.0"
+    monkeypatch.undo()
+
+    # app1 still holds the original bytes, which were never parsed
+    assert load_workspace(roots[1], cache=pool).modules["app"].imports[0].version == "1.0"
+
+
+def test_resolve_many_rejects_bad_options(tmp_path):
+    with pytest.raises(ValueError):
+        resolve_many([tmp_path], "dev", workers=0)
+    with pytest.raises(ValueError):
+        resolve_many([tmp_path], "dev", executor="fiber")
+    with pytest.raises(ValueError):
+        resolve_many([tmp_path], "dev", executor="process", pool=SharedParsePool())
+
+
+def test_resolver_error_pickles():
+    err = pickle.loads(pickle.dumps(ResolverError(RESOLVE_CYCLE, "Cycle detected: a -> a")))
+    assert err.rule_id == RESOLVE_CYCLE
+    assert str(err) == "RESOLVE_CYCLE: Cycle detected: a -> a"
@@ -0,0 +1,47 @@
+"""Slotted specs and resolved items: lazily rebuilt raw/meta, interned identifiers."""
+
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace.loader import _parse_import
+from ptbl.workspace.resolver import ResolvedItem
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"source": "local", "path": "modules/a.ptbl"},
+        {"source": "local", "path": "modules\\a.ptbl", "note": "windows separators"},
+        {"source": "registry", "name": "lib", "version": "1.0.0", "optional": True},
+        {"source": "git", "url": "https://example.com/r.git", "ref": None},
+        {"source": "git", "url": "https://example.com/r.git", "ref": "main", "commit": "abc"},
+        {"source": "url", "url": "https://example.com/x.tgz", "name": "unused"},
+    ],
+)
+def test_import_raw_is_rebuilt_from_fields(tmp_path: Path, obj):
+    spec = _parse_import(dict(obj), tmp_path)
+    assert spec.raw == obj
+    assert not hasattr(spec, "__dict__")
+    assert pickle.loads(pickle.dumps(spec)) == spec
+
+
+def test_identifiers_are_interned(tmp_path: Path):
+    a = _parse_import({"source": "registry", "name": "".join(["li", "b"]), "version": "1.0"}, tmp_path)
+    b = _parse_import({"source": "registry", "name": "".join(["l", "ib"]), "version": "1.0"}, tmp_path)
+    assert a.name is b.name
+
+
+def test_resolved_item_meta_view():
+    item = ResolvedItem(key="registry:lib@1", kind="registry", locked=False, meta={"name": "lib", "version": "1"})
+    other = ResolvedItem(key="registry:lib@2", kind="registry", locked=True, meta={"name": "lib", "version": "2"})
+    assert item.meta == {"name": "lib", "version": "1"}
+    assert item._meta_keys is other._meta_keys
+    item.meta["name"] = "changed"
+    assert item.meta["name"] == "lib"
+    assert "meta={'name': 'lib', 'version': '1'}" in repr(item)
+    assert pickle.loads(pickle.dumps(item)) == item
+    assert not hasattr(item, "__dict__")
@@ -0,0 +1,79 @@
+"""os.scandir directory scans (ptbl/workspace/fs.py) against the glob/rglob walks they replace."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace.fs import scan_dir, scan_dir_stat, scan_tree, scan_tree_stat
+
+
+def _glob_reference(dir_path: Path, pattern: str):
+    if not dir_path.exists():
+        return []
+    return sorted([p for p in dir_path.glob(pattern) if p.is_file()], key=lambda p: str(p).lower())
+
+
+def _rglob_reference(root: Path):
+    return sorted([p for p in root.rglob("*") if p.is_file()], key=lambda x: x.as_posix())
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "tree"
+    d = root / "modules"
+    d.mkdir(parents=True)
+    for name in ["b.ptbl", "A.ptbl", "c.PTBL", ".hidden.ptbl", "z.txt", "a_b.ptbl", "a.b.ptbl", "é.ptbl"]:
+        (d / name).write_text(name, encoding="utf-8")
+    (d / "dir.ptbl").mkdir()
+    (d / "dir.ptbl" / "inner.ptbl").write_text("x", encoding="utf-8")
+    os.symlink(d / "b.ptbl", d / "link.ptbl")
+    os.symlink(d / "missing.ptbl", d / "broken.ptbl")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "o.ptbl").write_text("o", encoding="utf-8")
+    os.symlink(outside, root / "linked_dir")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize("pattern", ["*.ptbl", "*", "?.ptbl", "[ab]*"])
+def test_scan_dir_matches_sorted_glob(tree: Path, pattern: str):
+    d = tree / "modules"
+    assert scan_dir(d, pattern) == _glob_reference(d, pattern)
+    assert [e.path for e in scan_dir_stat(d, pattern)] == _glob_reference(d, pattern)
+
+
+def test_scan_dir_missing_or_not_a_directory(tree: Path):
+    assert scan_dir(tree / "nope", "*.ptbl") == []
+    assert scan_dir(tree / "modules" / "b.ptbl", "*") == []
+    assert scan_dir_stat(tree / "nope") == []
+
+
+def test_scan_dir_orders_case_insensitively_with_a_stable_tiebreak(tmp_path: Path):
+    for name in ["b.ptbl", "B.ptbl", "a.ptbl", "C.ptbl"]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+    assert [p.name for p in scan_dir(tmp_path, "*.ptbl")] == ["a.ptbl", "B.ptbl", "b.ptbl", "C.ptbl"]
+
+
+def test_scan_dir_stat_reports_the_followed_stat(tree: Path):
+    by_name = {e.path.name: e for e in scan_dir_stat(tree / "modules", "*.ptbl")}
+    target = (tree / "modules" / "b.ptbl").stat()
+    for name in ("b.ptbl", "link.ptbl"):
+        e = by_name[name]
+        assert (e.size, e.mtime_ns, e.ino) == (target.st_size, target.st_mtime_ns, target.st_ino)
+
+
+def test_scan_tree_matches_rglob(tree: Path):
+    assert scan_tree(tree) == _rglob_reference(tree)
+    entries = scan_tree_stat(tree)
+    assert [e.path for e in entries] == _rglob_reference(tree)
+    assert all(e.size == e.path.stat().st_size and e.mtime_ns == e.path.stat().st_mtime_ns for e in entries)
+
+
+def test_scan_tree_missing_root_raises(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        scan_tree(tmp_path / "nope")
@@ -0,0 +1,125 @@
+"""Dependency graph from resolve_with_graph(): CSR edges, queries and JSON / DOT export."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_CYCLE
+from ptbl.workspace.graph import DependencyGraph, main
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_with_graph, resolve_workspace
+from tests.bench.synth import WorkspaceShape, generate_workspace
+
+
+PHASE1 = Path("fixtures/phase1")
+
+
+def _direct_imports(ws) -> dict:
+    """Reference edges straight from the module specs: module key -> imported keys."""
+    edges = {}
+    for mid, spec in ws.modules.items():
+        out = set()
+        for imp in spec.imports:
+            if imp.source == "local":
+                out.add("module:" + Path(imp.path).stem)
+            elif imp.source == "registry":
+                out.add(f"registry:{imp.name}@{imp.version}")
+            elif imp.source == "git":
+                out.add(f"git:{imp.url}#{imp.ref or 'unknown'}")
+            else:
+                out.add(f"url:{imp.url}")
+        edges[f"module:{mid}"] = out
+    return edges
+
+
+def test_diamond_graph_queries_and_export():
+    items, graph = resolve_with_graph(load_workspace(PHASE1 / "diamond"), "dev")
+    assert items == resolve_workspace(load_workspace(PHASE1 / "diamond"), "dev")
+    assert graph.keys == tuple(i.key for i in items)
+    assert list(graph.fwd_offsets) == [0, 2, 3, 4, 4]
+
+    assert graph.dependencies("module:a") == ["module:b", "module:c"]
+    assert graph.dependencies("module:a", transitive=True) == ["module:b", "module:c", "module:d"]
+    assert graph.dependents("module:d") == ["module:b", "module:c"]
+    assert graph.dependents("module:d", transitive=True) == ["module:a", "module:b", "module:c"]
+    assert graph.paths_between("module:a", "module:d") == [
+        ["module:a", "module:b", "module:d"],
+        ["module:a", "module:c", "module:d"],
+    ]
+    assert graph.paths_between("module:a", "module:d", limit=1) == [["module:a", "module:b", "module:d"]]
+    assert graph.paths_between("module:d", "module:a") == []
+    assert graph.paths_between("module:b", "module:b") == [["module:b"]]
+
+    doc = graph.to_json()
+    assert doc["entries"] == [0]
+    assert doc["edges"] == [[0, 1], [0, 2], [1, 3], [2, 3]]
+    dot = graph.to_dot()
+    assert 'n0 [label="module:a", shape=box, peripheries=2];' in dot
+    assert "  n2 -> n3;" in dot
+
+    with pytest.raises(KeyError):
+        graph.dependents("module:nope")
+
+
+def test_graph_matches_module_specs_on_generated_workspace(tmp_path: Path):
+    shape = WorkspaceShape(modules=120, depth=5, fan_out=3, diamond_density=0.7, external_deps=2)
+    ws = load_workspace(generate_workspace(tmp_path, shape, seed=5))
+    items, graph = resolve_with_graph(ws, "dev")
+    assert items == resolve_workspace(ws, "dev")
+
+    expected = _direct_imports(ws)
+    visited = {k for k in graph.keys if k.startswith("module:")}
+    for key in graph.keys:
+        assert set(graph.dependencies(key)) == expected.get(key, set())
+        importers = {m for m in visited if key in expected[m]}
+        assert set(graph.dependents(key)) == importers
+    assert graph.edge_count == sum(len(expected[m]) for m in visited)
+
+    # Transitive closure against a naive recursive walk, for a few nodes
+    def pulls_in(key, seen):
+        for dep in expected.get(key, ()):
+            if dep not in seen:
+                seen.add(dep)
+                pulls_in(dep, seen)
+        return seen
+
+    for key in graph.keys[::17]:
+        assert set(graph.dependencies(key, transitive=True)) == pulls_in(key, set())
+
+    package = next(k for k in graph.keys if not k.startswith("module:"))
+    for path in graph.paths_between(graph.keys[graph.entries[0]], package, limit=50):
+        assert all(b in expected[a] for a, b in zip(path, path[1:]))
+
+
+def test_package_edges_collapse_and_errors_still_raise(tmp_path: Path):
+    (tmp_path / "modules").mkdir()
+    (tmp_path / "app.ptbl").write_text("entry_modules: [a]\n", encoding="utf-8")
+    (tmp_path / "modules" / "a.ptbl").write_text(
+        "module_id: a\nimports:\n"
+        "- {source: registry, name: lib, version: '1.0'}\n"
+        "- {source: registry, name: lib, version: '1.0', note: again}\n",
+        encoding="utf-8",
+    )
+    _items, graph = resolve_with_graph(load_workspace(tmp_path), "dev")
+    assert graph.dependencies("module:a") == ["registry:lib@1.0"]
+    assert graph.edge_count == 1
+
+    with pytest.raises(ResolverError) as exc:
+        resolve_with_graph(load_workspace(PHASE1 / "cycle"), "dev")
+    assert exc.value.rule_id == RESOLVE_CYCLE
+
+
+def test_build_from_keys_and_cli(capsys):
+    items = resolve_workspace(load_workspace(PHASE1 / "chain"), "dev")
+    graph = DependencyGraph.build(items, [], [items[0].key])
+    assert len(graph) == len(items) and graph.edge_count == 0
+    assert graph.dependents(items[0].key, transitive=True) == []
+
+    assert main([str(PHASE1 / "chain"), "--format", "json"]) == 0
+    doc = json.loads(capsys.readouterr().out)
+    assert [n["key"] for n in doc["nodes"]] == [i.key for i in items]
+    assert main([str(PHASE1 / "chain"), "--format", "dot"]) == 0
+    assert capsys.readouterr().out.startswith("digraph ptbl {")
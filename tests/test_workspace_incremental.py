@@ -0,0 +1,164 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace.incremental import IncrementalResolver
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import local_import, registry_import, write_workspace
+
+
+def _dump(items):
+    return json.dumps(
+        [{"key": i.key, "kind": i.kind, "locked": i.locked, "meta": i.meta} for i in items], sort_keys=True
+    )
+
+
+def _full(root: Path, mode: str):
+    try:
+        return ("ok", _dump(resolve_workspace(load_workspace(root), mode)))
+    except Exception as e:
+        return ("error", type(e).__name__, str(e))
+
+
+def _incremental(resolver: IncrementalResolver, changed):
+    try:
+        return ("ok", _dump(resolver.update(changed).items))
+    except Exception as e:
+        return ("error", type(e).__name__, str(e))
+
+
+def _random_module_text(rng: random.Random, module_id: str, ids) -> str:
+    # Mostly forward edges (acyclic), occasionally any module (cycles, self-imports)
+    later = ids[ids.index(module_id) + 1:] if module_id in ids else ids
+    pool = ids if rng.random() < 0.1 else later
+    lines = [f"module_id: {module_id}", "imports:"]
+    for target in rng.sample(pool, k=min(len(pool), rng.randint(0, 3))):
+        lines += ["  - source: local", f"    path: modules/{target}.ptbl"]
+    for _ in range(rng.randint(0, 2)):
+        version = "2.0" if rng.random() < 0.05 else "1.0"
+        lines += ["  - source: registry", f"    name: pkg{rng.randint(0, 3)}", f'    version: "{version}"']
+    if len(lines) == 2:
+        lines[-1] = "imports: []"
+    return "\n".join(lines) + "\n"
+
+
+def _healthy(path: Path, module_id: str) -> bool:
+    return path.exists() and f"module_id: {module_id}\n" in path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_matches_full_resolution_after_random_edits(tmp_path, seed):
+    rng = random.Random(seed)
+    ids = [f"m{i}" for i in range(12)]
+    # Start acyclic: module i only imports higher-numbered modules
+    modules = {
+        mid: [local_import(ids[j]) for j in range(i + 1, len(ids)) if rng.random() < 0.25]
+        + [registry_import("pkg0", "1.0")]
+        for i, mid in enumerate(ids)
+    }
+    root = write_workspace(tmp_path, modules, entry_modules=ids[:3], lock_resolved={})
+    resolver = IncrementalResolver(root, "dev")
+    assert ("ok", _dump(resolver.items)) == _full(root, "dev")
+
+    for _ in range(40):
+        op = rng.choices(
+            ["rewrite", "delete", "add", "rename_id", "broken", "app"], weights=[12, 1, 3, 1, 1, 1]
+        )[0]
+        # Pick a broken, duplicated or missing module first so the tree keeps healing
+        unhealthy = [m for m in ids if not _healthy(root / "modules" / f"{m}.ptbl", m)]
+        name = rng.choice(unhealthy) if unhealthy and op in ("rewrite", "add") else rng.choice(ids)
+        path = root / "modules" / f"{name}.ptbl"
+        if op == "rewrite":
+            path.write_text(_random_module_text(rng, name, ids), encoding="utf-8")
+        elif op == "delete":
+            if path.exists():
+                path.unlink()
+        elif op == "add":
+            path.write_text(_random_module_text(rng, name, ids), encoding="utf-8")
+        elif op == "rename_id":
+            path.write_text(_random_module_text(rng, rng.choice(ids), ids), encoding="utf-8")
+        elif op == "broken":
+            path.write_text("module_id: [unclosed\n", encoding="utf-8")
+        else:
+            path = root / "app.ptbl"
+            path.write_text(json.dumps({"entry_modules": rng.sample(ids, 2)}), encoding="utf-8")
+
+        assert _incremental(resolver, [path]) == _full(root, "dev"), op
+
+
+def test_update_reports_added_and_removed_items(tmp_path):
+    root = write_workspace(
+        tmp_path,
+        {"a": [local_import("b")], "b": [registry_import("pkgX", "1.0")]},
+        entry_modules=["a"],
+    )
+    resolver = IncrementalResolver(root, "dev")
+
+    (root / "modules" / "b.ptbl").write_text(
+        "module_id: b\nimports:\n  - source: registry\n    name: pkgY\n    version: '2.0'\n", encoding="utf-8"
+    )
+    delta = resolver.update(["modules/b.ptbl"])
+    assert [i.key for i in delta.added] == ["registry:pkgY@2.0"]
+    assert [i.key for i in delta.removed] == ["registry:pkgX@1.0"]
+
+
+def test_update_recompiles_only_affected_modules(tmp_path):
+    root = write_workspace(
+        tmp_path,
+        {"a": [local_import("b"), local_import("c")], "b": [], "c": [], "d": []},
+        entry_modules=["a", "d"],
+    )
+    resolver = IncrementalResolver(root, "dev")
+    before = dict(resolver._compiled)
+
+    (root / "modules" / "c.ptbl").write_text("module_id: c\nimports: []\n", encoding="utf-8")
+    resolver.update([root / "modules" / "c.ptbl"])
+
+    # c changed and a imports c; b and d keep their compiled steps
+    assert resolver._compiled["b"] is before["b"]
+    assert resolver._compiled["d"] is before["d"]
+    assert resolver._compiled["a"] is not before["a"]
+    assert resolver._compiled["c"] is not before["c"]
+
+
+def test_lock_change_in_repro_mode(tmp_path):
+    root = write_workspace(
+        tmp_path,
+        {"a": [registry_import("pkgX", "1.0")]},
+        entry_modules=["a"],
+        lock_resolved={"registry:pkgX": {"pinned_version": "1.0"}},
+    )
+    resolver = IncrementalResolver(root, "repro")
+    (root / "lock.ptbl").write_text("resolved:\n  registry:pkgX:\n    pinned_version: '2.0'\n", encoding="utf-8")
+    assert _incremental(resolver, ["lock.ptbl"]) == _full(root, "repro")
+
+
+def _traceback_depth(exc: BaseException) -> int:
+    depth, tb = 0, exc.__traceback__
+    while tb is not None:
+        depth, tb = depth + 1, tb.tb_next
+    return depth
+
+
+@pytest.mark.parametrize(
+    "broken",
+    ["module_id: [a\n", "module_id: b\nimports:\n  - source: local\n    path: modules/x.ptbl\n"],
+    ids=["load_error", "resolve_error"],
+)
+def test_repeated_errors_do_not_grow_their_traceback(tmp_path, broken):
+    root = write_workspace(tmp_path, {"a": [local_import("b")], "b": []}, entry_modules=["a"])
+    resolver = IncrementalResolver(root, "dev")
+    (root / "modules" / "b.ptbl").write_text(broken, encoding="utf-8")
+
+    with pytest.raises(Exception):
+        resolver.update(["modules/b.ptbl"])
+    # Later updates leave b alone: its stored error (or compiled error step) is raised again
+    depths = []
+    for _ in range(5):
+        with pytest.raises(Exception) as exc:
+            resolver.update([])
+        depths.append(_traceback_depth(exc.value))
+    assert len(set(depths)) == 1, depths
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import local_import, tree_workspace, write_workspace
+
+
+PHASE1 = Path("fixtures/phase1")
+VALID_FIXTURES = ["chain", "conflict", "cycle", "diamond", "no_lock"]
+
+
+def _outcome(root: Path, mode: str, **kwargs):
+    try:
+        return resolve_workspace(load_workspace(root, **kwargs), mode)
+    except Exception as e:  # compare failures too (cycle, conflict)
+        return (type(e), str(e))
+
+
+@pytest.mark.parametrize("mode", ["dev", "repro"])
+@pytest.mark.parametrize("name", VALID_FIXTURES)
+def test_lazy_resolve_matches_eager(name, mode):
+    assert _outcome(PHASE1 / name, mode, lazy=True) == _outcome(PHASE1 / name, mode)
+
+
+def test_lazy_parses_only_reachable_modules(tmp_path):
+    root = tree_workspace(tmp_path, 63)
+    # Unreachable and unparseable: never touched by a lazy resolve.
+    (root / "modules" / "zz_broken.ptbl").write_text("module_id: [unclosed\n", encoding="utf-8")
+    app = "entry_modules: [m000002]\n"
+    (root / "app.ptbl").write_text(app, encoding="utf-8")
+
+    ws = load_workspace(root, lazy=True)
+    items = resolve_workspace(ws, "dev")
+    assert len(items) == 31  # the subtree under m000002
+    assert ws.modules.parsed_count == 31
+
+    with pytest.raises(Exception):
+        load_workspace(root)
+
+
+def test_lazy_falls_back_when_file_name_does_not_match(tmp_path):
+    write_workspace(tmp_path, {"app": [local_import("other")], "other": []}, entry_modules=["app"])
+    modules_dir = tmp_path / "modules"
+    (modules_dir / "app.ptbl").rename(modules_dir / "entry.ptbl")
+    (modules_dir / "entry.ptbl").write_text(
+        "module_id: app\nimports:\n  - {source: local, path: modules/other.ptbl}\n", encoding="utf-8"
+    )
+    (modules_dir / "other.ptbl").rename(modules_dir / "renamed.ptbl")
+    (modules_dir / "renamed.ptbl").write_text("module_id: other\nimports: []\n", encoding="utf-8")
+    (modules_dir / "other.ptbl").write_text("module_id: not_other\nimports: []\n", encoding="utf-8")
+
+    lazy = load_workspace(tmp_path, lazy=True)
+    eager = load_workspace(tmp_path)
+    assert resolve_workspace(lazy, "dev") == resolve_workspace(eager, "dev")
+    assert lazy.modules["other"].file_path.name == "renamed.ptbl"
+    assert dict(lazy.modules) == eager.modules
+    assert dict(lazy.module_index) == eager.module_index
+
+
+def test_lazy_duplicate_module_id_only_detected_when_strict(tmp_path):
+    write_workspace(tmp_path, {"a": [], "b": []}, entry_modules=["a"])
+    (tmp_path / "modules" / "c.ptbl").write_text("module_id: b\nimports: []\n", encoding="utf-8")
+
+    assert [i.key for i in resolve_workspace(load_workspace(tmp_path, lazy=True), "dev")] == ["module:a"]
+
+    with pytest.raises(ValueError) as eager:
+        load_workspace(tmp_path)
+    with pytest.raises(ValueError) as strict:
+        load_workspace(tmp_path, lazy=True, strict=True)
+    assert str(strict.value) == str(eager.value)
+
+
+def test_lazy_full_scan_reports_duplicates(tmp_path):
+    write_workspace(tmp_path, {"a": [], "b": []}, entry_modules=["a"])
+    (tmp_path / "modules" / "c.ptbl").write_text("module_id: b\nimports: []\n", encoding="utf-8")
+    ws = load_workspace(tmp_path, lazy=True)
+    assert "a" in ws.modules  # convention hit, no scan
+    with pytest.raises(ValueError, match="Duplicate module_id 'b'"):
+        len(ws.modules)
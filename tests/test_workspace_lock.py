@@ -0,0 +1,109 @@
+"""CompiledLock: upfront validation of lock.ptbl, O(1) per-import checks, unused-entry report."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import (
+    ResolverError,
+    RESOLVE_CONFLICT,
+    RESOLVE_LOCK_INVALID,
+    RESOLVE_UNRESOLVED_IMPORT,
+)
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.lock import CompiledLock, main
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import registry_import, write_workspace
+
+LOCK = {
+    "registry:good": {"pinned_version": "1.0"},
+    "registry:float": {"pinned_version": 1.0},
+    "registry:notmap": "1.0",
+    "git:https://example.com/ok.git": {"commit": "abc"},
+    "git:https://example.com/nocommit.git": {"ref": "main"},
+    "url:https://example.com/x.tgz": {"sha256": ""},
+    "bogus": {},
+}
+
+
+def _err(fn, *args):
+    with pytest.raises(ResolverError) as exc:
+        fn(*args)
+    return exc.value.rule_id, str(exc.value)
+
+
+def test_all_malformed_entries_reported_at_once():
+    lock = CompiledLock(LOCK)
+    assert [i.lock_key for i in lock.issues] == [
+        "registry:float",
+        "registry:notmap",
+        "git:https://example.com/nocommit.git",
+        "url:https://example.com/x.tgz",
+        "bogus",
+    ]
+    rule_id, message = _err(lock.validate)
+    assert rule_id == RESOLVE_LOCK_INVALID and message.count(";") == 4
+
+
+def test_lookups_raise_the_per_import_errors():
+    lock = CompiledLock(LOCK)
+    lock.check_registry("good", "1.0")
+    lock.check_git("https://example.com/ok.git")
+    assert _err(lock.check_registry, "good", "2.0") == (
+        RESOLVE_CONFLICT, f"{RESOLVE_CONFLICT}: Registry version mismatch for good: requested 2.0 but lock has 1.0"
+    )
+    assert _err(lock.check_registry, "float", "1.0")[0] == RESOLVE_CONFLICT
+    assert _err(lock.check_registry, "notmap", "1.0") == (
+        RESOLVE_UNRESOLVED_IMPORT, f"{RESOLVE_UNRESOLVED_IMPORT}: Missing lock entry for registry:notmap"
+    )
+    assert _err(lock.check_git, "https://example.com/nocommit.git")[1].endswith(
+        "Lock entry missing commit for git:https://example.com/nocommit.git"
+    )
+    assert _err(lock.check_url, "https://example.com/x.tgz")[1].endswith(
+        "Lock entry missing sha256 for url:https://example.com/x.tgz"
+    )
+    assert _err(lock.check_url, "https://example.com/other")[1].endswith(
+        "Missing lock entry for url:https://example.com/other"
+    )
+
+
+def test_from_lock_rejects_non_mapping_resolved():
+    with pytest.raises(ValueError):
+        CompiledLock.from_lock({"resolved": ["registry:x"]})
+    assert CompiledLock.from_lock(None).keys == []
+
+
+def test_repro_resolve_and_unused_report(tmp_path: Path):
+    root = write_workspace(
+        tmp_path,
+        {"app": [registry_import("good", "1.0")]},
+        entry_modules=["app"],
+        lock_resolved={"registry:good": {"pinned_version": "1.0"}, "registry:stale": {"pinned_version": "0.1"}},
+    )
+    ws = load_workspace(root)
+    items = resolve_workspace(ws, mode="repro")
+    lock = CompiledLock.from_lock(ws.lock)
+    assert lock.report(items) == {"entries": 2, "issues": [], "unused": ["registry:stale"]}
+
+
+def test_strict_lock_and_cli_report_every_malformed_entry(tmp_path: Path, capsys):
+    root = write_workspace(tmp_path, {"app": [registry_import("good", "1.0")]}, entry_modules=["app"],
+                           lock_resolved=LOCK)
+    ws = load_workspace(root)
+    # Only imported entries are checked by default; strict_lock checks them all up front
+    assert [i.key for i in resolve_workspace(ws, "repro")] == ["module:app", "registry:good@1.0"]
+    with pytest.raises(ResolverError) as exc:
+        resolve_workspace(ws, "repro", strict_lock=True)
+    assert exc.value.rule_id == RESOLVE_LOCK_INVALID and str(exc.value).count(";") == 4
+
+    assert main([str(root), "--mode", "repro"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["entries"] == len(LOCK) and len(report["issues"]) == 5
+    assert "registry:good" not in report["unused"] and "bogus" in report["unused"]
+
+    (root / "lock.ptbl").write_text("resolved:\n  registry:good: {pinned_version: '1.0'}\n", encoding="utf-8")
+    assert main([str(root), "--mode", "repro"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"entries": 1, "issues": [], "unused": []}
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_PATH_TRAVERSAL
+from ptbl.workspace.loader import load_workspace
+from tests.bench.synth import flat_workspace, write_workspace
+
+
+PHASE1 = Path("fixtures/phase1")
+VALID_FIXTURES = ["chain", "conflict", "cycle", "diamond", "no_lock"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("name", VALID_FIXTURES)
+def test_parallel_load_matches_sequential(name, executor):
+    expected = load_workspace(PHASE1 / name)
+    got = load_workspace(PHASE1 / name, workers=4, executor=executor)
+    assert got == expected
+    assert got.module_paths == expected.module_paths
+
+
+def test_parallel_load_keeps_error_of_first_bad_file():
+    with pytest.raises(ResolverError) as exc:
+        load_workspace(PHASE1 / "path_traversal", workers=4)
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_load_duplicate_module_id_reports_first_conflict(tmp_path, executor):
+    root = flat_workspace(tmp_path, 40, registry_deps=1)
+    modules_dir = root / "modules"
+    # Two later files reuse earlier ids; the first in sorted order must be reported.
+    (modules_dir / "m000030.ptbl").write_text("module_id: m000003\nimports: []\n", encoding="utf-8")
+    (modules_dir / "m000035.ptbl").write_text("module_id: m000001\nimports: []\n", encoding="utf-8")
+
+    with pytest.raises(ValueError) as seq:
+        load_workspace(root)
+    with pytest.raises(ValueError) as par:
+        load_workspace(root, workers=4, executor=executor)
+    assert str(par.value) == str(seq.value)
+    assert "m000030.ptbl" in str(par.value)
+
+
+def test_parallel_load_rejects_bad_options(tmp_path):
+    write_workspace(tmp_path, {"a": []}, entry_modules=["a"])
+    with pytest.raises(ValueError):
+        load_workspace(tmp_path, workers=0)
+    with pytest.raises(ValueError):
+        load_workspace(tmp_path, workers=2, executor="fiber")
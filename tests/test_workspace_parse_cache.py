@@ -0,0 +1,148 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace import cache as cache_module
+from ptbl.workspace import loader
+from ptbl.workspace.cache import ParseCache
+from ptbl.workspace.loader import load_workspace
+from tests.bench.synth import flat_workspace
+
+
+def _no_parse(*_args, **_kwargs):
+    raise AssertionError("unexpected YAML parse on a warm cache")
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+def test_warm_load_skips_parsing_and_matches_cold(tmp_path, monkeypatch):
+    root = flat_workspace(tmp_path / "ws", 12, registry_deps=2)
+    cold_cache = ParseCache(tmp_path / "cache")
+    cold = load_workspace(root, cache=cold_cache)
+    assert cold_cache.stats.misses == 14  # app + lock + 12 modules
+    assert cold_cache.stats.stores == 14
+
+    warm_cache = ParseCache(tmp_path / "cache")
+    monkeypatch.setattr(loader, "_read_yaml_source", _no_parse)
+    warm = load_workspace(root, cache=warm_cache)
+    assert warm == cold
+    assert warm_cache.stats.hits == 14
+    assert warm_cache.stats.misses == 0
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    root = flat_workspace(tmp_path / "ws", 4, registry_deps=1)
+    load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+
+    target = root / "modules" / "m000002.ptbl"
+    target.write_text("module_id: m000002\nimports: []\n", encoding="utf-8")
+    _bump_mtime(target)
+
+    cache = ParseCache(tmp_path / "cache")
+    ws = load_workspace(root, cache=cache)
+    assert ws.modules["m000002"].imports == ()
+    assert cache.stats.misses == 1
+
+
+def test_touched_but_unchanged_file_hits_via_sha256(tmp_path):
+    root = flat_workspace(tmp_path / "ws", 3, registry_deps=1)
+    load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+    _bump_mtime(root / "modules" / "m000001.ptbl")
+
+    cache = ParseCache(tmp_path / "cache")
+    load_workspace(root, cache=cache)
+    assert cache.stats.misses == 0
+    assert cache.stats.hash_hits >= 1
+
+
+def test_racy_entry_is_restamped_once_its_window_has_passed(tmp_path, monkeypatch):
+    path = tmp_path / "a.ptbl"
+    path.write_text("module_id: a\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 10_000_000_000))
+
+    cache = ParseCache(tmp_path / "cache")
+    real_time_ns = cache_module.time.time_ns
+    # Stored within the racy window of the file's mtime
+    monkeypatch.setattr(cache_module.time, "time_ns", lambda: path.stat().st_mtime_ns + 1_000_000_000)
+    assert cache.store(path, path.stat(), {"module_id": "a"}, hashlib.sha256(path.read_bytes()).hexdigest())
+    monkeypatch.setattr(cache_module.time, "time_ns", real_time_ns)
+
+    hashed = []
+    real_sha256 = cache_module._file_sha256
+    monkeypatch.setattr(cache_module, "_file_sha256", lambda p: hashed.append(p) or real_sha256(p))
+    for _ in range(3):
+        data, _st = cache.lookup(path)
+        assert data == {"module_id": "a"}
+    assert len(hashed) == 1  # verified once, then trusted by stat
+    assert cache.stats.hash_hits == 1 and cache.stats.hits == 3
+
+
+def test_same_size_edit_between_parse_and_store_is_not_cached_as_the_new_version(tmp_path, monkeypatch):
+    root = flat_workspace(tmp_path / "ws", 2, registry_deps=1)
+    target = root / "modules" / "m000001.ptbl"
+    real_read = loader._read_yaml_source
+
+    def read_then_edit(path, loader_cls=None):
+        result = real_read(path, loader_cls)
+        if path == target:
+            target.write_text(target.read_text(encoding="utf-8").replace("'1.0'", "'2.0'"), encoding="utf-8")
+            _bump_mtime(target)
+        return result
+
+    monkeypatch.setattr(loader, "_read_yaml_source", read_then_edit)
+    first = load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+    assert first.modules["m000001"].imports[0].version == "1.0"
+    monkeypatch.undo()
+
+    cache = ParseCache(tmp_path / "cache")
+    again = load_workspace(root, cache=cache)
+    assert again.modules["m000001"].imports[0].version == "2.0"
+    assert again == load_workspace(root)
+    assert cache.stats.misses == 1
+
+
+def test_non_json_documents_are_not_cached(tmp_path):
+    root = flat_workspace(tmp_path / "ws", 1, registry_deps=1)
+    (root / "integrations").mkdir()
+    (root / "integrations" / "dated.ptbl").write_text("released: 2024-01-01\n", encoding="utf-8")
+
+    cache = ParseCache(tmp_path / "cache")
+    ws = load_workspace(root, cache=cache)
+    assert cache.stats.stores == 3  # app, lock, module; the date-valued integration is skipped
+
+    again = load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+    assert again.integrations == ws.integrations
+
+
+def test_entries_are_versioned_by_loader_code(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.entries_dir.name == f"v{cache.version}"
+    assert len(cache.version) == 16
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    root = flat_workspace(tmp_path / "ws", 6, registry_deps=1)
+    cache = ParseCache(tmp_path / "cache")
+    load_workspace(root, cache=cache)
+
+    entries = sorted(cache.entries_dir.glob("*.json"))
+    for i, p in enumerate(entries):
+        os.utime(p, ns=(1_000_000_000 * (i + 1), 1_000_000_000 * (i + 1)))
+    newest = entries[-1]
+
+    cache.max_bytes = newest.stat().st_size
+    evicted = cache.prune()
+    assert evicted == len(entries) - 1
+    assert list(cache.entries_dir.glob("*.json")) == [newest]
+    assert cache.stats.evictions == evicted
+
+
+def test_negative_max_bytes_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ParseCache(tmp_path, max_bytes=-1)
@@ -0,0 +1,156 @@
+"""Memoized local import path checks (ptbl/workspace/paths.py), including symlink swaps after a check."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_PATH_TRAVERSAL
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.paths import LocalPathCache, resolve_local_path, validate_local_relpath
+from ptbl.workspace.resolver import resolve_workspace
+
+
+RAW_PATHS = [
+    "modules/b.ptbl",
+    "  modules/b.ptbl ",
+    "./modules//b.ptbl",
+    "modules\\b.ptbl",
+    "modules/b",
+    "modules/missing.ptbl",
+    "modules/sub/deep.ptbl",
+    "modules/inner.ptbl",
+    "modules/escape.ptbl",
+    "modules/../modules/b.ptbl",
+    "../outside/secret.ptbl",
+    "/etc/passwd",
+    "C:\\Windows\\system32",
+    "c:/windows",
+    "\\\\server\\share\\x.ptbl",
+    "",
+    "   ",
+]
+
+
+def _outcome(fn, *args):
+    try:
+        return ("ok", fn(*args))
+    except (ResolverError, ValueError) as e:
+        return (type(e), getattr(e, "rule_id", None), str(e))
+
+
+@pytest.fixture
+def ws(tmp_path: Path) -> Path:
+    root = tmp_path / "ws"
+    (root / "modules").mkdir(parents=True)
+    (root / "modules" / "b.ptbl").write_text("module_id: b\n", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.ptbl").write_text("module_id: secret\n", encoding="utf-8")
+    (outside / "b.ptbl").write_text("module_id: b\n", encoding="utf-8")
+    os.symlink(root / "modules" / "b.ptbl", root / "modules" / "inner.ptbl")
+    os.symlink(outside / "secret.ptbl", root / "modules" / "escape.ptbl")
+    return root
+
+
+@pytest.mark.parametrize("raw", RAW_PATHS)
+def test_cache_matches_uncached_checks(ws: Path, raw: str):
+    paths = LocalPathCache(ws)
+    for _ in range(2):  # miss, then hit
+        assert _outcome(paths.validate, raw) == _outcome(validate_local_relpath, ws, raw)
+        assert _outcome(paths.resolve, raw) == _outcome(resolve_local_path, ws, raw)
+
+
+def test_loader_checks_are_reused_by_the_resolver(ws: Path):
+    paths = LocalPathCache(ws)
+    assert paths.validate("modules/b.ptbl") == "modules/b.ptbl"
+    misses = paths.misses
+    assert paths.resolve("modules/b.ptbl") == (ws / "modules" / "b.ptbl").resolve()
+    assert paths.misses == misses and paths.hits == 1
+
+    with pytest.raises(ResolverError):
+        paths.validate("../x")
+    with pytest.raises(ResolverError):
+        paths.validate("../x")
+    assert paths.hits == 2
+
+
+def test_symlink_swapped_in_after_check_is_rejected(ws: Path, tmp_path: Path):
+    paths = LocalPathCache(ws)
+    target = ws / "modules" / "b.ptbl"
+    assert paths.validate("modules/b.ptbl") == "modules/b.ptbl"
+    assert paths.resolve("modules/b.ptbl") == target.resolve()
+
+    target.unlink()
+    os.symlink(tmp_path / "outside" / "secret.ptbl", target)
+
+    with pytest.raises(ResolverError) as exc:
+        paths.validate("modules/b.ptbl")
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+    assert str(exc.value) == str(pytest.raises(ResolverError, validate_local_relpath, ws, "modules/b.ptbl").value)
+    with pytest.raises(ResolverError) as exc:
+        paths.resolve("modules/b.ptbl")
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+    assert paths.rechecks >= 2
+    # Still rejected on later calls: the stale entry is gone, not re-trusted
+    with pytest.raises(ResolverError):
+        paths.resolve("modules/b.ptbl")
+
+
+def test_directory_swapped_for_symlink_is_rejected(ws: Path, tmp_path: Path):
+    paths = LocalPathCache(ws)
+    paths.validate("modules/b.ptbl")
+    paths.resolve("modules/sub/deep.ptbl")  # missing at check time
+
+    (ws / "modules").rename(ws / "old_modules")
+    os.symlink(tmp_path / "outside", ws / "modules")
+    with pytest.raises(ResolverError) as exc:
+        paths.validate("modules/b.ptbl")
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+
+    (ws / "modules").unlink()
+    (ws / "modules").mkdir()
+    os.symlink(tmp_path / "outside", ws / "modules" / "sub")
+    with pytest.raises(ResolverError) as exc:
+        paths.resolve("modules/sub/deep.ptbl")
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+
+
+def test_internal_symlinks_are_allowed_but_not_memoized(ws: Path):
+    paths = LocalPathCache(ws)
+    assert paths.resolve("modules/inner.ptbl") == (ws / "modules" / "b.ptbl").resolve()
+    assert paths.resolve("modules/inner.ptbl") == (ws / "modules" / "b.ptbl").resolve()
+    assert paths.hits == 0 and paths.misses == 2
+
+
+def test_resolve_after_load_sees_swapped_module(tmp_path: Path):
+    root = tmp_path / "ws"
+    (root / "modules").mkdir(parents=True)
+    (root / "app.ptbl").write_text("entry_modules: [a]\n", encoding="utf-8")
+    (root / "modules" / "a.ptbl").write_text(
+        "module_id: a\nimports:\n- source: local\n  path: modules/b.ptbl\n", encoding="utf-8"
+    )
+    (root / "modules" / "b.ptbl").write_text("module_id: b\n", encoding="utf-8")
+    (tmp_path / "secret.ptbl").write_text("module_id: b\n", encoding="utf-8")
+
+    ws = load_workspace(root)
+    assert ws.path_cache is not None and len(ws.path_cache) > 0
+    (root / "modules" / "b.ptbl").unlink()
+    os.symlink(tmp_path / "secret.ptbl", root / "modules" / "b.ptbl")
+    with pytest.raises(ResolverError) as exc:
+        resolve_workspace(ws, "dev")
+    assert exc.value.rule_id == RESOLVE_PATH_TRAVERSAL
+
+
+def test_workspace_with_cache_pickles_and_compares(ws: Path):
+    (ws / "app.ptbl").write_text("entry_modules: [b]\n", encoding="utf-8")
+    (ws / "modules" / "inner.ptbl").unlink()
+    (ws / "modules" / "escape.ptbl").unlink()
+    loaded = load_workspace(ws)
+    copy = pickle.loads(pickle.dumps(loaded))
+    assert copy == loaded
+    assert copy.path_cache is not None and len(copy.path_cache) == 0
+    assert resolve_workspace(copy, "dev") == resolve_workspace(loaded, "dev")
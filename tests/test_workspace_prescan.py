@@ -0,0 +1,178 @@
+"""Restricted module prescan: differential against the YAML loader, plus fuzzing."""
+
+from __future__ import annotations
+
+import math
+import random
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ptbl.workspace import prescan
+from ptbl.workspace.loader import _module_from_data, _parse_module, load_workspace
+from ptbl.workspace.prescan import scan_document
+from ptbl.workspace.resolver import resolve_workspace
+
+
+FIXTURE_MODULES = sorted(Path("fixtures").rglob("modules/*.ptbl"))
+
+
+def _same(a, b) -> bool:
+    """Equality that also requires equal types (1 vs 1.0 vs True) and treats NaN as equal."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+def _safe_load(text: str):
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        return ("error", str(e))
+    return {} if data is None else data
+
+
+def _module_outcome(path: Path, data, root: Path):
+    try:
+        return _module_from_data(path, data, root)
+    except Exception as e:
+        return (type(e), str(e))
+
+
+@pytest.mark.parametrize("path", FIXTURE_MODULES, ids=str)
+def test_prescan_matches_parse_module_on_fixtures(path: Path):
+    root = path.parent.parent
+    data = scan_document(path.read_text(encoding="utf-8"))
+    assert data is not None, "fixture module files should not need the YAML fallback"
+    try:
+        expected = _parse_module(path, root)
+    except Exception as e:
+        expected = (type(e), str(e))
+    assert _module_outcome(path, data, root) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "module_id: &id a\nimports: []\n",
+        "module_id: a\nalias: *id\n",
+        "module_id: !!str 1\n",
+        "module_id: a\nimports: [{source: local, path: modules/b.ptbl}]\n",
+        "{module_id: a}\n",
+        "---\nmodule_id: a\n",
+        "module_id: a\n---\nmodule_id: b\n",
+        "%YAML 1.1\n---\nmodule_id: a\n",
+        "module_id: |\n  a\n",
+        "module_id: a\n  continued\n",
+        "module_id: \"a\\tb\"\n",
+        "module_id: a\nmeta:\n  owner: x\n",
+        "module_id: a\nimports:\n  -\n    source: local\n",
+        "module_id: a\nimports:\n\t- source: local\n",
+        "module_id: a\nmodule_id: b\n",
+        "<<: {module_id: a}\n",
+        "- a\n- b\n",
+    ],
+)
+def test_prescan_bails_on_unsupported_yaml(text: str):
+    assert scan_document(text) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "# only a comment\n",
+        "\ufeffmodule_id: a\r\nimports: []\r\n",
+        "module_id: a # trailing\nimports:\n- source: registry\n  name: 'it''s'\n  version: \"1.0\"\n",
+        "module_id: 1.0\n",
+        "module_id: yes\nimports:\n",
+        "module_id: ~\nimports: local\n",
+        "module_id: a\nimports:\n  - plain\n  - 2020-01-01\n  - source: git\n    url: https://example.com/r.git#frag\n    ref:\n",
+    ],
+)
+def test_prescan_matches_safe_load(text: str):
+    got = scan_document(text)
+    assert got is not None
+    assert _same(got, _safe_load(text))
+
+
+# ---- fuzzing -----------------------------------------------------------------
+
+_KEYS = ["module_id", "imports", "source", "name", "version", "url", "path", "yes", "1", "null", "a.b", "<<", "'q'"]
+_ATOMS = [
+    "a", "local", "1.0", "-1", "0o7", "0x1F", "1_000", "1:30", ".inf", ".NaN", "~", "Yes", "off", "2020-01-01",
+    "", " ", "#", " #c", "a #b", "a#b", "a: b", "a:", ":a", "-", "- a", "-a", "---", "'", "''", "'x''y'",
+    '"x"', '"x\\n"', "&a x", "*a", "!!str 1", "[]", "[a]", "{}", "|", ">", "%x", "@x", "?", "=", "a b",
+    "é", "\t", ",a", "[", "}",
+]
+
+
+def _fuzz_scalar(r: random.Random) -> str:
+    return "".join(r.choice(_ATOMS) for _ in range(r.randint(1, 2)))
+
+
+def _fuzz_document(r: random.Random) -> str:
+    lines = []
+    for _ in range(r.randint(0, 4)):
+        key = r.choice(_KEYS)
+        if r.random() < 0.5:
+            lines.append(key + r.choice([": ", ":", " : ", ":  "]) + _fuzz_scalar(r))
+        else:
+            lines.append(key + r.choice([":", ": # c", ": x"]))
+            indent = r.choice([0, 1, 2, 2, 4])
+            for _ in range(r.randint(0, 3)):
+                dash = r.choice(["- ", "-", "-  "])
+                if r.random() < 0.3:
+                    lines.append(" " * indent + dash + _fuzz_scalar(r))
+                    continue
+                lines.append(" " * indent + dash + r.choice(_KEYS) + r.choice([": ", ":"]) + _fuzz_scalar(r))
+                for _ in range(r.randint(0, 3)):
+                    sub = max(0, indent + len(dash) + r.choice([0, 0, 0, 1, -1, 2]))
+                    lines.append(" " * sub + r.choice(_KEYS) + r.choice([": ", ":"]) + _fuzz_scalar(r))
+        if r.random() < 0.1:
+            lines.append(r.choice(["", "# c", "  # c", "  x", "---", "- q"]))
+    text = r.choice(["\n", "\n", "\r\n"]).join(lines) + r.choice(["", "\n"])
+    return ("\ufeff" + text) if r.random() < 0.1 else text
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_prescan_fuzz_agrees_with_safe_load(seed: int):
+    r = random.Random(seed)
+    accepted = 0
+    for _ in range(2500):
+        text = _fuzz_document(r)
+        got = scan_document(text)
+        if got is None:
+            continue
+        accepted += 1
+        assert _same(got, _safe_load(text)), repr(text)
+    assert accepted > 250  # the generator must keep exercising the fast path
+
+
+def test_lazy_load_falls_back_for_unsupported_module_yaml(tmp_path: Path):
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (tmp_path / "app.ptbl").write_text("entry_modules: [a]\n", encoding="utf-8")
+    (modules / "a.ptbl").write_text(
+        "module_id: a\nimports: [{source: local, path: modules/b.ptbl}]\n", encoding="utf-8"
+    )
+    (modules / "b.ptbl").write_text("module_id: &id b\nimports:\n", encoding="utf-8")
+
+    lazy = load_workspace(tmp_path, lazy=True, strict=True)
+    assert resolve_workspace(lazy, "dev") == resolve_workspace(load_workspace(tmp_path), "dev")
+
+
+def test_scalar_constructor_does_not_keep_what_it_built():
+    before = len(prescan._constructor.constructed_objects)
+    for i in range(5000):
+        assert scan_document(f"module_id: m\nsize: {i}\nratio: {i}.5\n") == {
+            "module_id": "m", "size": i, "ratio": i + 0.5,
+        }
+    assert len(prescan._constructor.constructed_objects) == before == 0
@@ -0,0 +1,128 @@
+"""Stress shapes for the resolver walk: very deep chains and very wide fan-out.
+
+Workspaces are built in memory (no YAML) so 10k-module graphs stay fast;
+tests/bench/synth.py writes the same shapes to disk for benchmarks.
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from ptbl.errors import ResolverError, RESOLVE_CYCLE
+from ptbl.workspace.loader import ImportSpec, ModuleSpec, Workspace, build_module_index
+from ptbl.workspace.resolver import ResolvedItem, _CompiledModule, _walk, resolve_workspace
+
+
+def _memory_workspace(root: Path, graph: Dict[str, List[str]], entry: List[str]) -> Workspace:
+    modules = {
+        mid: ModuleSpec(
+            module_id=mid,
+            file_path=root / "modules" / f"{mid}.ptbl",
+            imports=tuple(ImportSpec(source="local", path=f"modules/{t}.ptbl") for t in targets),
+        )
+        for mid, targets in graph.items()
+    }
+    return Workspace(
+        root=root,
+        app_path=root / "app.ptbl",
+        lock_path=None,
+        module_paths=tuple(s.file_path for s in modules.values()),
+        integration_paths=(),
+        app={"entry_modules": entry},
+        lock=None,
+        modules=modules,
+        integrations={},
+        module_index=build_module_index(modules),
+    )
+
+
+def _name(i: int) -> str:
+    return f"m{i:06d}"
+
+
+def test_10k_deep_chain_resolves_past_recursion_limit(tmp_path):
+    n = 10_000
+    assert n > sys.getrecursionlimit()
+    graph = {_name(i): ([_name(i + 1)] if i + 1 < n else []) for i in range(n)}
+    ws = _memory_workspace(tmp_path, graph, [_name(0)])
+
+    items = resolve_workspace(ws, mode="dev")
+    assert [i.key for i in items] == [f"module:{_name(i)}" for i in range(n)]
+
+
+def test_10k_deep_cycle_reports_full_path(tmp_path):
+    n = 10_000
+    graph = {_name(i): [_name((i + 1) % n)] for i in range(n)}
+    ws = _memory_workspace(tmp_path, graph, [_name(0)])
+
+    with pytest.raises(ResolverError) as exc:
+        resolve_workspace(ws, mode="dev")
+    assert exc.value.rule_id == RESOLVE_CYCLE
+    expected = " -> ".join([_name(i) for i in range(n)] + [_name(0)])
+    assert str(exc.value) == f"{RESOLVE_CYCLE}: Cycle detected: {expected}"
+
+
+def test_wide_fanout(tmp_path):
+    width = 10_000
+    graph = {_name(0): [_name(i) for i in range(1, width + 1)]}
+    graph.update({_name(i): [] for i in range(1, width + 1)})
+    ws = _memory_workspace(tmp_path, graph, [_name(0)])
+
+    items = resolve_workspace(ws, mode="dev")
+    assert len(items) == width + 1
+
+
+def _recursive_reference(entry: List[str], graph: Dict[str, List[str]]) -> List[str]:
+    out: List[str] = []
+    visited = set()
+    stack: List[str] = []
+
+    def dfs(mid: str) -> None:
+        if mid in stack:
+            raise ValueError(" -> ".join(stack + [mid]))
+        if mid in visited:
+            return
+        stack.append(mid)
+        for t in graph[mid]:
+            dfs(t)
+        out.append(mid)
+        stack.pop()
+        visited.add(mid)
+
+    for mid in entry:
+        dfs(mid)
+    return out
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_walk_matches_recursive_post_order(seed):
+    rng = random.Random(seed)
+    ids = [f"n{i}" for i in range(30)]
+    graph = {mid: rng.sample(ids, rng.randint(0, 4)) for mid in ids}
+    entry = sorted(rng.sample(ids, 5))
+
+    compiled = {
+        mid: _CompiledModule(
+            module_id=mid,
+            steps=tuple(("module", t) for t in targets)
+            + (("item", ResolvedItem(key=f"module:{mid}", kind="module", locked=False, meta={})),),
+            local_paths=(),
+        )
+        for mid, targets in graph.items()
+    }
+
+    try:
+        expected = ("ok", _recursive_reference(entry, graph))
+    except ValueError as e:
+        expected = ("cycle", f"{RESOLVE_CYCLE}: Cycle detected: {e}")
+
+    try:
+        items, _requested = _walk(entry, compiled.get)
+        got = ("ok", [item.key.split(":", 1)[1] for item in items.values()])
+    except ResolverError as e:
+        got = ("cycle", str(e))
+
+    assert got == expected
@@ -0,0 +1,137 @@
+"""Binary workspace snapshots: round trip, lazy access, staleness and fallback."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ptbl.errors import RESOLVE_LOCK_MISSING, ResolverError
+from ptbl.workspace import snapshot as snapshot_mod
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from ptbl.workspace.snapshot import WorkspaceSnapshot, open_or_build, tree_sha256
+from tests.bench.synth import local_import, registry_import, write_workspace
+
+
+def _workspace(root: Path) -> Path:
+    write_workspace(
+        root,
+        {
+            "app": [local_import("lib"), registry_import("pkg", "1.0"),
+                    {"source": "git", "url": "https://example.com/r.git", "ref": None, "note": ["x"]}],
+            "lib": [{"source": "url", "url": "https://example.com/ünï.tgz"}],
+        },
+        entry_modules=["app"],
+        lock_resolved={"registry:pkg": {"pinned_version": "1.0"}},
+    )
+    (root / "integrations").mkdir()
+    (root / "integrations" / "ci.ptbl").write_text("steps: [lint]\n", encoding="utf-8")
+    return root
+
+
+def test_round_trip_matches_fresh_load(tmp_path: Path):
+    root = _workspace(tmp_path / "ws")
+    with open_or_build(root, tmp_path / "ws.snap") as snap:
+        ws = load_workspace(root)
+        assert snap.workspace() == ws
+        assert snap.resolved("dev") == resolve_workspace(ws, "dev")
+        with pytest.raises(ResolverError) as exc:
+            snap.resolved("repro")
+        assert str(exc.value).startswith("RESOLVE_UNRESOLVED_IMPORT: Missing lock entry for git:")
+        assert snap.module("lib") == ws.modules["lib"]
+        assert snap.module("missing") is None
+        assert list(snap.module_ids()) == list(ws.modules)
+
+
+def test_snapshot_is_reused_until_tree_changes(tmp_path: Path, monkeypatch):
+    root = _workspace(tmp_path / "ws")
+    snap_path = tmp_path / "ws.snap"
+    open_or_build(root, snap_path).close()
+
+    def no_load(*a, **k):
+        raise AssertionError("current snapshot should be reused")
+
+    monkeypatch.setattr(snapshot_mod, "load_workspace", no_load)
+    with open_or_build(root, snap_path) as snap:
+        assert snap.tree_sha256 == tree_sha256(root)
+    monkeypatch.undo()
+
+    (root / "lock.ptbl").unlink()
+    with open_or_build(root, snap_path) as snap:
+        assert snap.is_current(tree_sha256(root))
+        with pytest.raises(ResolverError) as exc:
+            snap.resolved("repro")
+        assert exc.value.rule_id == RESOLVE_LOCK_MISSING
+
+
+def test_snapshot_is_relocatable_and_corrupt_files_rebuild(tmp_path: Path):
+    root = _workspace(tmp_path / "ws")
+    snap_path = tmp_path / "ws.snap"
+    open_or_build(root, snap_path).close()
+
+    moved = tmp_path / "checkout2"
+    shutil.copytree(root, moved)
+    with WorkspaceSnapshot.open(snap_path, moved) as snap:
+        assert snap.is_current(tree_sha256(moved))
+        assert snap.resolved("dev") == resolve_workspace(load_workspace(moved), "dev")
+
+    snap_path.write_bytes(b"garbage")
+    with open_or_build(root, snap_path) as snap:
+        assert snap.module_count == 2
+
+
+def test_tree_edited_during_load_is_loaded_again_and_never_stored_stale(tmp_path: Path, monkeypatch):
+    root = _workspace(tmp_path / "ws")
+    snap_path = tmp_path / "ws.snap"
+    real_load = snapshot_mod.load_workspace
+    loads, edits = [], []
+
+    def load_then_edit(*a, **k):
+        ws = real_load(*a, **k)
+        loads.append(ws)
+        if len(loads) <= max_edits:
+            edits.append(1)
+            (root / "integrations" / "ci.ptbl").write_text(f"steps: [lint, n{len(edits)}]\n", encoding="utf-8")
+        return ws
+
+    monkeypatch.setattr(snapshot_mod, "load_workspace", load_then_edit)
+    max_edits = 1
+    with open_or_build(root, snap_path) as snap:
+        assert len(loads) == 2
+        assert snap.is_current(tree_sha256(root))
+        assert snap.workspace() == real_load(root)
+
+    # A tree that never settles: the last load is served but nothing is written
+    snap_path.unlink()
+    loads.clear()
+    max_edits = snapshot_mod._LOAD_ATTEMPTS
+    with open_or_build(root, snap_path) as snap:
+        assert len(loads) == snapshot_mod._LOAD_ATTEMPTS
+        assert snap.workspace() == loads[-1]
+    assert not snap_path.exists()
+
+
+def test_editing_any_workspace_or_errors_source_invalidates_snapshots(tmp_path: Path, monkeypatch):
+    sources = snapshot_mod._code_version_sources()
+    names = [p.name for p in sources]
+    assert {"paths.py", "fs.py", "prescan.py", "cache.py", "loader.py", "errors.py"} <= set(names)
+
+    copies = tmp_path / "src"
+    copies.mkdir()
+    for src in sources:
+        shutil.copyfile(src, copies / src.name)
+    monkeypatch.setattr(snapshot_mod, "_code_version_sources", lambda: [copies / n for n in names])
+
+    root = _workspace(tmp_path / "ws")
+    snap_path = tmp_path / "ws.snap"
+    open_or_build(root, snap_path).close()
+    for name in ("paths.py", "errors.py"):
+        with WorkspaceSnapshot.open(snap_path, root) as snap:
+            assert snap.is_current(tree_sha256(root))
+        with open(copies / name, "a", encoding="utf-8") as f:
+            f.write("# changed\n")
+        with WorkspaceSnapshot.open(snap_path, root) as snap:
+            assert not snap.is_current(tree_sha256(root))
+        open_or_build(root, snap_path).close()
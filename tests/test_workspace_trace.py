@@ -0,0 +1,97 @@
+import json
+import sys
+from pathlib import Path
+
+from ptbl.workspace import trace
+from ptbl.workspace.cache import ParseCache
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace
+from tests.bench.synth import flat_workspace
+from tests.parity_harness import TRACE_ENV, run_validator_cmd_raw
+
+
+PHASE1 = Path("fixtures/phase1")
+
+
+def test_disabled_tracing_records_nothing():
+    assert trace.active is None
+    tracer = trace.Tracer()
+    resolve_workspace(load_workspace(PHASE1 / "diamond"), "repro")
+    assert not tracer.events and not tracer.counters and not tracer.timers
+
+
+def test_tracing_records_phases_files_and_counters():
+    with trace.tracing() as tracer:
+        items = resolve_workspace(load_workspace(PHASE1 / "diamond"), "repro")
+    assert trace.active is None
+
+    summary = tracer.to_json()
+    for phase in ("load_workspace", "discover", "parse_files", "module_index", "compile_lock", "walk", "finalize"):
+        assert summary["phases"][phase]["count"] == 1, phase
+    assert {"validate_local_relpath", "import_sort", "compile_module"} <= set(summary["timers"])
+    assert summary["counters"]["modules"] == 4
+    assert summary["counters"]["imports"] == 4
+    assert summary["counters"]["resolved_items"] == len(items)
+    assert {Path(f["path"]).name for f in summary["files"]} >= {"a.ptbl", "d.ptbl", "app.ptbl", "lock.ptbl"}
+    assert all(f["read_ms"] >= 0 and f["yaml_parse_ms"] >= 0 for f in summary["files"])
+
+
+def test_tracing_counts_cache_hits(tmp_path):
+    root = flat_workspace(tmp_path / "ws", 5, registry_deps=1)
+    load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+    with trace.tracing() as tracer:
+        load_workspace(root, cache=ParseCache(tmp_path / "cache"))
+    assert tracer.counters["cache_hits"] == 7  # app + lock + 5 modules
+    assert "cache_misses" not in tracer.counters or tracer.counters["cache_misses"] == 0
+    assert "files_parsed" not in tracer.counters
+
+
+def test_chrome_trace_format():
+    with trace.tracing() as tracer:
+        with trace.span("outer", label="x"):
+            tracer.count("things", 3)
+    doc = json.loads(json.dumps(tracer.to_chrome_trace()))
+    complete = [e for e in doc["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["outer"]
+    assert complete[0]["args"] == {"label": "x"} and complete[0]["dur"] >= 0
+    assert {e["ph"] for e in doc["traceEvents"]} == {"X", "C"}
+    assert doc["summary"]["counters"] == {"things": 3}
+
+
+def test_nested_tracing_restores_outer_tracer():
+    with trace.tracing() as outer:
+        with trace.tracing() as inner:
+            assert trace.active is inner
+        assert trace.active is outer
+    assert trace.active is None
+
+
+def test_tracing_from_env_writes_trace(tmp_path, monkeypatch):
+    target = tmp_path / "out" / "run.trace.json"
+    monkeypatch.setenv(trace.TRACE_ENV, str(target))
+    with trace.tracing_from_env() as tracer:
+        assert tracer is not None
+        load_workspace(PHASE1 / "chain")
+    assert "load_workspace" in json.loads(target.read_text(encoding="utf-8"))["summary"]["phases"]
+
+    monkeypatch.delenv(trace.TRACE_ENV)
+    with trace.tracing_from_env() as tracer:
+        assert tracer is None
+
+
+def test_harness_passes_trace_path_to_validator(tmp_path):
+    assert TRACE_ENV == trace.TRACE_ENV
+    target = tmp_path / "oracle.trace.json"
+    # Braces are doubled: command templates go through str.format
+    script = "import os; open(os.environ['PTBL_TRACE'], 'w').write('{{}}'); print('{{}}')"
+    exit_code, stdout, _ = run_validator_cmd_raw(
+        [sys.executable, "-c", script],
+        root=tmp_path,
+        mode="interactive",
+        schemas_dir=tmp_path,
+        max_diagnostics=1,
+        cwd=tmp_path,
+        trace_path=target,
+    )
+    assert exit_code == 0 and stdout.strip() == "{}"
+    assert target.exists()
@@ -0,0 +1,129 @@
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from ptbl.workspace.loader import load_workspace
+from ptbl.workspace.resolver import resolve_workspace, resolved_item_to_dict
+from ptbl.workspace.watch import InotifyWatcher, WarmWorkspace, WatchServer, query
+from tests.bench.synth import local_import, registry_import, write_workspace
+
+
+def _workspace(root: Path) -> Path:
+    return write_workspace(
+        root,
+        {"a": [local_import("b")], "b": [registry_import("pkgX", "1.0")]},
+        entry_modules=["a"],
+        lock_resolved={},
+    )
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for watch server")
+        time.sleep(0.02)
+
+
+def test_warm_workspace_applies_changes_and_keeps_errors(tmp_path):
+    root = _workspace(tmp_path)
+    warm = WarmWorkspace(root, modes=["dev"])
+    b = root / "modules" / "b.ptbl"
+
+    b.write_text("module_id: b\nimports:\n  - source: local\n    path: modules/a.ptbl\n", encoding="utf-8")
+    [event] = warm.apply({b})
+    assert event["ok"] is False
+    assert event["error"]["rule_id"] == "RESOLVE_CYCLE"
+    assert warm.result("dev")["ok"] is False
+
+    b.write_text("module_id: b\nimports: []\n", encoding="utf-8")
+    [event] = warm.apply({b})
+    assert event["ok"] is True
+    assert warm.generation == 2 and warm.result("dev")["generation"] == 2
+    assert event["removed"] == ["registry:pkgX@1.0"]
+    expected = [resolved_item_to_dict(i) for i in resolve_workspace(load_workspace(root), "dev")]
+    assert warm.result("dev")["items"] == expected
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_watch_server_serves_fresh_results_over_socket(tmp_path):
+    root = _workspace(tmp_path / "ws")
+    # Keep the socket path short (AF_UNIX path limit)
+    sock_dir = Path(tempfile.mkdtemp(prefix="ptblw"))
+    sock = sock_dir / "s"
+    server = WatchServer(root, socket_path=sock, force_polling=True, poll_interval=0.02)
+    server.start()
+    try:
+        assert query(sock, {"op": "ping"})["ok"] is True
+        before = query(sock, {"op": "resolve", "mode": "dev"})
+        assert [i["key"] for i in before["items"]] == ["module:a", "module:b", "registry:pkgX@1.0"]
+
+        (root / "modules" / "b.ptbl").write_text(
+            "module_id: b\nimports:\n  - source: url\n    url: https://x/y\n", encoding="utf-8"
+        )
+        _wait_for(lambda: server.generation > before["generation"])
+
+        after = query(sock, {"op": "resolve", "mode": "dev"})
+        expected = [resolved_item_to_dict(i) for i in resolve_workspace(load_workspace(root), "dev")]
+        assert after["items"] == expected
+
+        assert query(sock, {"op": "nope"})["ok"] is False
+    finally:
+        server.stop()
+    assert not sock.exists()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_watch_server_only_replaces_stale_sockets(tmp_path):
+    root = _workspace(tmp_path / "ws")
+    sock_dir = Path(tempfile.mkdtemp(prefix="ptblw"))
+    sock = sock_dir / "s"
+
+    sock.write_text("not a socket", encoding="utf-8")
+    with pytest.raises(OSError, match="already in use"):
+        WatchServer(root, socket_path=sock, force_polling=True).start()
+    assert sock.read_text(encoding="utf-8") == "not a socket"
+    sock.unlink()
+
+    # A socket left behind by a server that died is taken over
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(sock))
+    stale.close()
+    first = WatchServer(root, socket_path=sock, force_polling=True)
+    first.start()
+    try:
+        second = WatchServer(root, socket_path=sock, force_polling=True)
+        with pytest.raises(OSError, match="already in use"):
+            second.start()
+        second.stop()
+        assert query(sock, {"op": "ping"})["ok"] is True
+
+        # Stopping must not unlink a socket another server bound at the same path since
+        sock.unlink()
+        successor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        successor.bind(str(sock))
+    finally:
+        first.stop()
+    assert sock.exists()
+    successor.close()
+    sock.unlink()
+
+
+def test_inotify_watcher_reports_relevant_paths(tmp_path):
+    root = _workspace(tmp_path)
+    try:
+        watcher = InotifyWatcher(root)
+    except OSError:
+        pytest.skip("inotify unavailable")
+    try:
+        (root / "modules" / "c.ptbl").write_text("module_id: c\n", encoding="utf-8")
+        (root / "notes.txt").write_text("ignored", encoding="utf-8")
+        changed, rescan = watcher.poll(2.0)
+        assert root / "modules" / "c.ptbl" in changed
+        assert root / "notes.txt" not in changed
+        assert rescan is False
+    finally:
+        watcher.close()
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ptbl.errors import ResolverError
+from ptbl.workspace.loader import YAML_LOADER_ENV, load_workspace, yaml_loader_class
+
+
+PHASE1 = Path("fixtures/phase1")
+ALL_FIXTURES = sorted(p.name for p in PHASE1.iterdir() if p.is_dir())
+
+requires_libyaml = pytest.mark.skipif(
+    getattr(yaml, "CSafeLoader", None) is None, reason="PyYAML built without libyaml"
+)
+
+
+def _load_or_error(root: Path, yaml_loader: str):
+    try:
+        return load_workspace(root, yaml_loader=yaml_loader)
+    except ResolverError as e:
+        return ("error", e.rule_id, str(e))
+
+
+@requires_libyaml
+@pytest.mark.parametrize("name", ALL_FIXTURES)
+def test_c_and_pure_loaders_produce_identical_workspaces(name):
+    assert _load_or_error(PHASE1 / name, "c") == _load_or_error(PHASE1 / name, "pure")
+
+
+@requires_libyaml
+def test_auto_prefers_libyaml():
+    assert yaml_loader_class("auto") is yaml.CSafeLoader
+
+
+def test_env_switch_forces_pure_python(monkeypatch):
+    monkeypatch.setenv(YAML_LOADER_ENV, "pure")
+    assert yaml_loader_class() is yaml.SafeLoader
+
+
+def test_unknown_loader_rejected():
+    with pytest.raises(ValueError):
+        yaml_loader_class("fast")